@@ -0,0 +1,133 @@
+"""
+본문 캐시(services/content_cache.py) 메모리 벤치마크.
+
+게시물 N개(긴 기사 본문)가 한꺼번에 올라온 백필 상황을 흉내 내어,
+본문을 받은 순서대로 캐시에 넣고(put) 요약할 때처럼 다시 순서대로 꺼내는(get) 동안의 최대 메모리를 tracemalloc 으로 잰다.
+비교용으로 같은 본문을 상한 없는 dict 에 모았을 때의 최대 메모리도 보고한다.
+
+- 캐시 최대 메모리가 게시물 수와 관계없이 --max-bytes 근처에 머무는지 (가장 큰 N 에서 상한 + 여유를 넘으면 종료 코드 1)
+- 압축률, 버린 항목 수, put/get 한 번의 평균 시간
+
+사용 예:
+    python benchmarks/content_cache.py
+    python benchmarks/content_cache.py --posts 100 1000 5000 --content-chars 20000 --max-bytes 16777216
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from services import metrics  # noqa: E402
+from services.content_cache import ContentCache  # noqa: E402
+from tools import make_parser_fixtures as fixtures  # noqa: E402
+
+# 상한 외에 허용하는 여유 (방금 넣은/꺼낸 항목, 압축 버퍼, OrderedDict 등)
+SLACK_BYTES = 2 * 1024 * 1024
+
+
+# 고유명사/숫자처럼 반복되지 않는 부분을 흉내 낼 음절
+_SYLLABLES = [chr(0xAC00 + i * 7) for i in range(400)]
+
+
+def make_contents(count: int, chars: int, seed: int) -> List[str]:
+    """
+    에이블뉴스 장문 기사 정도의 본문 count 개.
+    픽스처 문장 조합만으로는 실제 기사보다 훨씬 잘 압축되므로 문단마다 임의 음절 단어를 섞는다.
+    """
+    rng = random.Random(seed)
+    contents = []
+    for _ in range(count):
+        parts = []
+        size = 0
+        while size < chars:
+            for paragraph in fixtures._paragraphs(rng, 4):
+                words = " ".join("".join(rng.choices(_SYLLABLES, k=rng.randint(2, 4))) for _ in range(12))
+                parts.append(f"{paragraph} {words} {rng.randint(1, 99999)}")
+                size += len(parts[-1]) + 1
+        contents.append("\n".join(parts)[:chars])
+    return contents
+
+
+def _received(text: str) -> str:
+    """받은 본문처럼 새 문자열 (미리 만든 문자열을 그대로 넣으면 tracemalloc 에 잡히지 않는다)"""
+    return text.encode("utf-8").decode("utf-8")
+
+
+def run_cache(contents: List[str], max_bytes: int, hot_bytes: int) -> Dict:
+    metrics.reset()
+    cache = ContentCache(max_bytes=max_bytes, hot_bytes=hot_bytes)
+    tracemalloc.start()
+    started = time.perf_counter()
+    for i, text in enumerate(contents):
+        cache.put(f"post/{i}", _received(text))
+    put_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    found = sum(1 for i in range(len(contents)) if cache.get(f"post/{i}") is not None)
+    get_seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    counters = {name: entry["total"] for name, entry in metrics.report()["counters"].items()}
+    raw = sum(len(text.encode("utf-8")) for text in contents)
+    compressed = counters.get("content_cache_compressed_bytes", 0)
+    compressions = counters.get("content_cache_compressions", 0)
+    return {
+        "peak": peak,
+        "found": found,
+        "evictions": int(counters.get("content_cache_evictions", 0)),
+        # 압축한 항목의 평균 압축률 (UTF-8 원문 / 압축)
+        "ratio": (raw / len(contents)) / (compressed / compressions) if compressions else 0.0,
+        "put_us": put_seconds * 1e6 / len(contents),
+        "get_us": get_seconds * 1e6 / len(contents),
+    }
+
+
+def run_dict(contents: List[str]) -> int:
+    tracemalloc.start()
+    kept = {}
+    for i, text in enumerate(contents):
+        kept[f"post/{i}"] = _received(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="content cache memory benchmark")
+    parser.add_argument("--posts", type=int, nargs="+", default=[100, 1000, 3000])
+    parser.add_argument("--content-chars", type=int, default=20000)
+    parser.add_argument("--max-bytes", type=int, default=16 * 1024 * 1024)
+    parser.add_argument("--hot-bytes", type=int, default=2 * 1024 * 1024)
+    parser.add_argument("--seed", type=int, default=20251114)
+    args = parser.parse_args(argv)
+
+    mib = 1024 * 1024
+    print(f"[content_cache] content_chars={args.content_chars} max={args.max_bytes / mib:.0f}MiB "
+          f"hot={args.hot_bytes / mib:.0f}MiB")
+    print(f"{'posts':>8}{'dict_MiB':>10}{'cache_MiB':>11}{'found':>8}{'evicted':>9}{'ratio':>7}"
+          f"{'put_us':>9}{'get_us':>9}")
+
+    budget = args.max_bytes + SLACK_BYTES
+    failed = False
+    for count in args.posts:
+        contents = make_contents(count, args.content_chars, args.seed)
+        # 본문을 만든 메모리는 재지 않도록 tracemalloc 은 각 실행 안에서 켠다
+        dict_peak = run_dict(contents)
+        r = run_cache(contents, args.max_bytes, args.hot_bytes)
+        print(f"{count:>8,}{dict_peak / mib:>10.1f}{r['peak'] / mib:>11.1f}{r['found']:>8,}{r['evictions']:>9,}"
+              f"{r['ratio']:>7.1f}{r['put_us']:>9.1f}{r['get_us']:>9.1f}")
+        if count == max(args.posts) and r["peak"] > budget:
+            print(f"[content_cache] ❌ 게시물 {count}개: 최대 {r['peak'] / mib:.1f}MiB > 상한+여유 {budget / mib:.1f}MiB")
+            failed = True
+    if not failed:
+        print(f"[content_cache] ✅ 게시물 수와 관계없이 최대 메모리가 상한+여유 이내 (<= {budget / mib:.1f}MiB)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,185 @@
+"""
+게시판 하나 × 구독자 N명 fan-out 벤치마크.
+
+한 게시판을 N명이 구독하고 새 글이 P개 올라온 상황에서 main.process_site_group() 을 실행해
+- 그룹 처리 시간과 구독자당 비용(us/sub)
+- 본문 요청/요약 호출 수 (구독자 수와 무관하게 게시물 수만큼이어야 함)
+을 구독자 수별로 보고한다. 가장 큰 구독자 수에서 구독자당 비용이 --budget-us 를 넘거나,
+본문 요청/요약이 게시물 수보다 많이 일어나면 종료 코드 1 로 실패한다.
+
+네트워크/요약 비용을 빼고 크롤러 쪽 처리 비용만 보기 위해
+목록/본문은 메모리의 가짜 크롤러가, 요약은 앞부분 자르기가, 전송은 건수만 세는 delivery 가 대신한다.
+
+사용 예:
+    python benchmarks/fanout.py
+    python benchmarks/fanout.py --subscribers 100 1000 10000 --posts 5
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import main  # noqa: E402
+from services import content_cache  # noqa: E402
+from sites.post import Post, site_key  # noqa: E402
+
+SITE_URL = "https://www.ablenews.co.kr/news/articleList.html"
+DEFAULT_BUDGET_US = 50.0
+
+_PARAGRAPH = (
+    "장애인 고용 촉진을 위한 지원 사업 참여 기관을 모집합니다. 신청 기간은 다음 달 말까지이며, "
+    "자세한 내용은 첨부된 공고문을 확인해 주시기 바랍니다. 문의 사항은 담당 부서로 연락 주십시오. "
+)
+_KEYWORDS = ["장학", "채용", "모집", "지원", "교육", "행사", "공모", "복지", "고용", "신청"]
+
+
+class FakeCrawler:
+    """메모리의 게시물 목록/본문을 돌려주는 크롤러. 본문 요청 수를 센다."""
+
+    def __init__(self, posts: List[Dict], content: str):
+        self.posts = posts
+        self.content = content
+        self.content_requests = 0
+
+    def fetch_post_list(self, list_url: str) -> List[Dict]:
+        return self.posts
+
+    def fetch_post_content(self, post_url: str) -> str:
+        self.content_requests += 1
+        return self.content
+
+
+class CountingDelivery:
+    """알림/커서 건수만 세는 전송 단계"""
+
+    def __init__(self):
+        self.alerts = 0
+        self.cursors = 0
+
+    def pending_cursor(self, subscription_id: int) -> Optional[str]:
+        return None
+
+    def submit(self, subscription_id: int, alerts: List[Dict], last_seen_post_id: Optional[str], site_key: str = ""):
+        self.alerts += len(alerts)
+        if last_seen_post_id is not None:
+            self.cursors += 1
+
+
+def build_board(page_size: int, new_posts: int):
+    latest = 1000 + page_size
+    site = site_key(SITE_URL)
+    posts = [
+        Post(
+            str(latest - i),
+            f"{SITE_URL.rsplit('/', 1)[0]}/articleView.html?idxno={latest - i}",
+            f"2025년 {_KEYWORDS[i % len(_KEYWORDS)]} 지원 사업 공고 {latest - i}",
+            "2025-11-14",
+            site,
+        )
+        for i in range(page_size)
+    ]
+    # 대부분은 직전 폴링 위치, 일부는 더 오래된 위치/첫 실행
+    cursors = [posts[new_posts].id, posts[min(new_posts + 2, page_size - 1)].id, None]
+    return posts, cursors
+
+
+def build_subscribers(count: int, cursors: List[Optional[str]]) -> List[Dict]:
+    subs = []
+    for sub_id in range(1, count + 1):
+        if sub_id % 20 == 0:
+            last_seen = cursors[2]
+        elif sub_id % 10 == 0:
+            last_seen = cursors[1]
+        else:
+            last_seen = cursors[0]
+        subs.append({
+            "id": sub_id,
+            "user_id": sub_id,
+            "site_url": SITE_URL,
+            "site_alias": "에이블뉴스",
+            "keyword": _KEYWORDS[sub_id % len(_KEYWORDS)] if sub_id % 4 else None,
+            "last_seen_post_id": last_seen,
+        })
+    return subs
+
+
+def run_case(subscribers: int, page_size: int, new_posts: int, content_chars: int) -> Dict:
+    posts, cursors = build_board(page_size, new_posts)
+    content = (_PARAGRAPH * (content_chars // len(_PARAGRAPH) + 1))[:content_chars]
+    crawler = FakeCrawler(posts, content)
+    delivery = CountingDelivery()
+    subs = build_subscribers(subscribers, cursors)
+
+    summarize_calls = 0
+
+    def fake_summarize(text: str, max_chars: int = 300) -> str:
+        nonlocal summarize_calls
+        summarize_calls += 1
+        return text[:max_chars]
+
+    main.get_crawler_for_subscription = lambda sub: crawler
+    main.summarize = fake_summarize
+    # 케이스마다 같은 게시물 URL 을 쓰므로 이전 케이스에서 받은 본문을 비우고 시작한다
+    content_cache.clear()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        main.process_site_group(SITE_URL, subs, delivery)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "subscribers": subscribers,
+        "elapsed_ms": elapsed * 1000,
+        "us_per_sub": elapsed * 1e6 / subscribers,
+        "content_requests": crawler.content_requests,
+        "summarize_calls": summarize_calls,
+        "alerts": delivery.alerts,
+        "cursors": delivery.cursors,
+    }
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="site group fan-out benchmark")
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--posts", type=int, default=3, help="직전 폴링 이후 새 게시물 수")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--content-chars", type=int, default=3000)
+    parser.add_argument("--budget-us", type=float,
+                        default=float(os.environ.get("FANOUT_BUDGET_US", DEFAULT_BUDGET_US)))
+    args = parser.parse_args(argv)
+
+    # 오래된 커서(+2)까지 포함한 새 게시물 합집합 크기
+    unique_posts = min(args.posts + 2, args.page_size)
+    print(f"[fanout] posts={args.posts} (합집합 {unique_posts}개) page_size={args.page_size} "
+          f"content_chars={args.content_chars}")
+    print(f"{'subscribers':>12}{'elapsed_ms':>12}{'us/sub':>10}{'fetches':>9}{'summaries':>11}{'alerts':>9}")
+
+    failed = False
+    for count in args.subscribers:
+        r = run_case(count, args.page_size, args.posts, args.content_chars)
+        print(f"{r['subscribers']:>12,}{r['elapsed_ms']:>12.1f}{r['us_per_sub']:>10.1f}"
+              f"{r['content_requests']:>9}{r['summarize_calls']:>11}{r['alerts']:>9,}")
+        if r["content_requests"] > unique_posts or r["summarize_calls"] > unique_posts:
+            print(f"[fanout] ❌ 구독자 {count}명: 본문 요청/요약이 게시물 수({unique_posts})보다 많습니다")
+            failed = True
+        if r["cursors"] != count:
+            print(f"[fanout] ❌ 구독자 {count}명: 커서 수 불일치 {r['cursors']}")
+            failed = True
+        # 구독자가 적을 때는 그룹 고정 비용(목록/본문/요약)이 섞이므로 가장 큰 경우만 예산과 비교
+        if count == max(args.subscribers) and r["us_per_sub"] > args.budget_us:
+            print(f"[fanout] ❌ 구독자 {count}명: 구독자당 {r['us_per_sub']:.1f}us > 예산 {args.budget_us:.0f}us")
+            failed = True
+    if not failed:
+        print(f"[fanout] ✅ 구독자당 비용 예산 이내 (<= {args.budget_us:.0f}us)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,311 @@
+"""
+종단간(end-to-end) 부하 테스트. 운영 백엔드/사이트/Gemini 없이 main() 전체를 구독 수만 건 규모로 실행한다.
+
+로컬 대역 서버 세 개를 띄우고, 크롤러(main.main)를 별도 프로세스로 --runs 번 실행한다.
+- tools/fake_backend.py : /internal/subscriptions, /internal/alerts(/bulk), last_seen 갱신
+- tools/fake_gemini.py  : generateContent (응답 지연, 429 주입, 분당 한도)
+- tools/fake_boards.py  : 사이트 7곳 × --boards-per-site 개 게시판. 실행마다 새 글을 올린다.
+크롤러 프로세스는 requests 세션에서 사이트 호스트로 가는 요청만 게시판 서버 주소로 바꿔 보낸다.
+(크롤러 코드와 sites.cassette 녹화에는 원래 사이트 URL 이 그대로 보인다)
+(그 밖의 코드는 운영과 같다: 파싱 풀, outbox, site lock, 실행 리포트 포함)
+
+구독은 게시판에 인기 순(1/순위 가중치)으로 나눠 붙이고, 시작 커서는 각 게시판의 현재 최신 글이다.
+실행마다 보고하는 값
+- 처리량: 구독/s, 알림/s, 게시물(본문+요약)/s — 크롤러 프로세스 시작부터 끝까지의 시간 기준
+- 지연: 단계별 p50/p95/p99/max (크롤러의 실행 리포트 services.metrics)
+- 요청 수: 게시판(목록/본문), Gemini(성공/429), 백엔드(메서드·경로별)
+- 최대 메모리: 크롤러 프로세스와 자식 프로세스(파싱 풀)의 최대 RSS
+- 정확도: 알림 수가 새 글 × 구독 수와 같은지, 모든 구독의 커서가 게시판 최신 글까지 갔는지
+정확도가 틀리거나 크롤러 프로세스가 실패하면 종료 코드 1.
+
+Gemini SDK(google-generativeai)가 설치되어 있어야 요약을 가짜 Gemini 로 보낸다.
+--no-gemini 이면 API 키를 비워 폴백 요약을 쓴다. (요약 단계 없이 크롤링/전송만 측정)
+
+사용 예:
+    python benchmarks/loadtest.py
+    python benchmarks/loadtest.py --subscriptions 10000 --boards-per-site 20 --runs 3 --posts 3
+    python benchmarks/loadtest.py --gemini-latency 1.5 --gemini-429 0.1 --json loadtest.json
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from tools.fake_backend import FakeBackend  # noqa: E402
+from tools.fake_boards import SITES, FakeBoards, local_url  # noqa: E402
+from tools.fake_gemini import FakeGemini  # noqa: E402
+
+_KEYWORDS = ["장학금", "채용", "모집", "지원 사업", "교육", "행사", "공모전", "복지", "고용", "설명회"]
+_ID_RE = re.compile(r"/\d+(?=/|$)")
+# 표에 먼저 보여줄 단계 (나머지는 총 소요 시간 순)
+_KEY_STAGES = ("site_group", "fetch_post_list", "fetch_post_content", "summarize", "gemini_request")
+
+
+def build_subscriptions(boards: FakeBoards, count: int) -> List[Dict]:
+    """게시판 인기도가 1/순위 에 비례하도록 구독을 나눠 붙인다. (몇몇 게시판에 구독이 몰리는 실제 분포 흉내)"""
+    weights = [1 / (rank + 1) for rank in range(len(boards.boards))]
+    total = sum(weights)
+    shares = [int(count * weight / total) for weight in weights]
+    # 나누고 남은 구독은 가장 인기 있는 게시판에 붙인다
+    shares[0] += count - sum(shares)
+    subs = []
+    sub_id = 1
+    for board, share in zip(boards.boards, shares):
+        latest = boards.latest_post_id(board)
+        for _ in range(share):
+            subs.append({
+                "id": sub_id,
+                "user_id": sub_id,
+                "site_url": board.list_url,
+                "site_alias": f"{board.site_type} {board.index}",
+                "keyword": _KEYWORDS[sub_id % len(_KEYWORDS)] if sub_id % 3 else None,
+                "last_seen_post_id": latest,
+            })
+            sub_id += 1
+    return subs
+
+
+def child_env(args, workdir: Path, run: int, backend, gemini, boards) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "BACKEND_BASE_URL": backend.url,
+        "OUTBOX_PATH": str(workdir / "outbox.sqlite3"),
+        "SITE_LOCK_PATH": str(workdir / "site_locks.sqlite3"),
+        "SUBSCRIPTION_SNAPSHOT_PATH": "",
+        "METRICS_REPORT_PATH": str(workdir / f"run_report_{run}.json"),
+        "METRICS_PROM_PATH": "",
+        "PROFILE_DIR": "",
+        "LOADTEST_BOARDS_URL": boards.url,
+        "LOADTEST_STATS_PATH": str(workdir / f"stats_{run}.json"),
+        "PYTHONUNBUFFERED": "1",
+    })
+    if args.no_gemini:
+        # 빈 값이면 .env 의 키도 쓰지 않는다 (load_dotenv 는 이미 있는 환경 변수를 덮어쓰지 않음)
+        env["GEMINI_API_KEY"] = ""
+    else:
+        env.update({
+            "GEMINI_API_KEY": "loadtest",
+            "GEMINI_API_ENDPOINT": gemini.url,
+            "GEMINI_MIN_INTERVAL": str(args.gemini_min_interval),
+            "GEMINI_RETRY_BASE_DELAY": str(args.gemini_retry_delay),
+        })
+    return env
+
+
+def run_child() -> int:
+    """크롤러 프로세스: 사이트 요청을 게시판 서버로 돌린 뒤 main.main() 실행"""
+    import resource
+    from urllib.parse import urlsplit
+
+    import requests
+
+    boards_url = os.environ["LOADTEST_BOARDS_URL"]
+    site_hosts = {urlsplit(spec.list_url).hostname for spec in SITES.values()}
+    original_request = requests.Session.request
+
+    def routed_request(self, method, url, *args, **kwargs):
+        # 백엔드/Gemini 요청은 그대로 두고 사이트 요청만 바꾼다
+        if urlsplit(url).hostname in site_hosts:
+            url = local_url(boards_url, url)
+        return original_request(self, method, url, *args, **kwargs)
+
+    requests.Session.request = routed_request
+
+    import main
+
+    try:
+        main.main()
+    finally:
+        stats = {
+            "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            "children_peak_rss_kib": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        }
+        Path(os.environ["LOADTEST_STATS_PATH"]).write_text(json.dumps(stats), encoding="utf-8")
+    return 0
+
+
+def backend_requests(backend: FakeBackend, since: int) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    with backend.lock:
+        requests = backend.requests[since:]
+    for method, path, _ in requests:
+        key = f"{method} {_ID_RE.sub('/{id}', path.split('?', 1)[0])}"
+        counts[key] = counts.get(key, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def stage_rows(report: Dict, limit: int) -> List[tuple]:
+    stages = report.get("stages", {})
+    names = [name for name in _KEY_STAGES if name in stages]
+    names += sorted((name for name in stages if name not in names),
+                    key=lambda name: -stages[name]["all"]["sum"])
+    rows = []
+    for name in names[:limit]:
+        s = stages[name]["all"]
+        rows.append((name, s["count"], s["errors"], s["p50"], s["p95"], s["p99"], s["max"]))
+    return rows
+
+
+def counter(report: Dict, name: str) -> float:
+    return report.get("counters", {}).get(name, {}).get("total", 0)
+
+
+def run_once(args, workdir: Path, run: int, backend, gemini, boards, subs) -> Dict:
+    before_alerts = len(backend.alerts)
+    before_requests = len(backend.requests)
+    before_gemini = (gemini.requests, gemini.rate_limited)
+    before_boards = (boards.request_count("list"), boards.request_count("content"))
+
+    new_posts = {board.list_url: board.published for board in boards.boards}
+    touched = boards.publish(args.posts, args.active_ratio)
+    new_posts = {board.list_url: board.published - new_posts[board.list_url] for board in boards.boards}
+    expected_alerts = sum(new_posts[sub["site_url"]] for sub in subs)
+
+    log_path = workdir / f"crawler_{run}.log"
+    started = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), "--child"],
+            env=child_env(args, workdir, run, backend, gemini, boards),
+            cwd=str(workdir), stdout=log, stderr=subprocess.STDOUT,
+        )
+    elapsed = time.perf_counter() - started
+
+    report_path = workdir / f"run_report_{run}.json"
+    report = json.loads(report_path.read_text(encoding="utf-8")) if report_path.exists() else {}
+    stats_path = workdir / f"stats_{run}.json"
+    stats = json.loads(stats_path.read_text(encoding="utf-8")) if stats_path.exists() else {}
+
+    latest = {board.list_url: boards.latest_post_id(board) for board in boards.boards}
+    with backend.lock:
+        cursors_behind = sum(
+            1 for sub in subs if backend.last_seen.get(sub["id"], sub["last_seen_post_id"]) != latest[sub["site_url"]]
+        )
+    alerts = len(backend.alerts) - before_alerts
+    posts_enriched = counter(report, "posts_enriched")
+    return {
+        "run": run,
+        "exit_code": proc.returncode,
+        "log": str(log_path),
+        "elapsed_seconds": round(elapsed, 3),
+        "boards_with_new_posts": touched,
+        "alerts": alerts,
+        "expected_alerts": expected_alerts,
+        "cursors_behind": cursors_behind,
+        "throughput": {
+            "subscriptions_per_sec": round(len(subs) / elapsed, 1),
+            "alerts_per_sec": round(alerts / elapsed, 1),
+            "posts_per_sec": round(posts_enriched / elapsed, 2),
+        },
+        "requests": {
+            "board_list": boards.request_count("list") - before_boards[0],
+            "board_content": boards.request_count("content") - before_boards[1],
+            "gemini": gemini.requests - before_gemini[0],
+            "gemini_429": gemini.rate_limited - before_gemini[1],
+            "backend": backend_requests(backend, before_requests),
+        },
+        "peak_rss_mib": round(stats.get("peak_rss_kib", 0) / 1024, 1),
+        "parse_pool_peak_rss_mib": round(stats.get("children_peak_rss_kib", 0) / 1024, 1),
+        "posts_enriched": posts_enriched,
+        "summaries_fallback": counter(report, "summaries_fallback"),
+        "stages": stage_rows(report, args.stages),
+    }
+
+
+def print_run(r: Dict) -> None:
+    t = r["throughput"]
+    q = r["requests"]
+    print(f"\n[loadtest] run {r['run']}: {r['elapsed_seconds']:.1f}s, exit={r['exit_code']}, "
+          f"새 글 있는 게시판 {r['boards_with_new_posts']}개 (log: {r['log']})")
+    print(f"  처리량   구독 {t['subscriptions_per_sec']:,.0f}/s, 알림 {t['alerts_per_sec']:,.0f}/s, "
+          f"게시물 {t['posts_per_sec']:.1f}/s (본문+요약 {r['posts_enriched']:.0f}개, 폴백 요약 {r['summaries_fallback']:.0f})")
+    print(f"  알림     {r['alerts']:,} (기대 {r['expected_alerts']:,}), 커서가 뒤처진 구독 {r['cursors_behind']}")
+    print(f"  요청     게시판 목록 {q['board_list']} / 본문 {q['board_content']}, "
+          f"Gemini {q['gemini']} (429 {q['gemini_429']})")
+    print("  백엔드   " + ", ".join(f"{k} ×{v}" for k, v in q["backend"].items()))
+    print(f"  메모리   크롤러 최대 RSS {r['peak_rss_mib']:.1f} MiB, 파싱 풀 프로세스 최대 {r['parse_pool_peak_rss_mib']:.1f} MiB")
+    print(f"  {'stage':<36}{'count':>7}{'err':>5}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for name, count, errors, p50, p95, p99, peak in r["stages"]:
+        print(f"  {name:<36}{count:>7}{errors:>5}{p50 * 1000:>8.1f}ms{p95 * 1000:>7.1f}ms"
+              f"{p99 * 1000:>7.1f}ms{peak * 1000:>7.1f}ms")
+
+
+def main_cli(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="end-to-end crawler load test with local stand-ins")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--subscriptions", type=int, default=10000)
+    parser.add_argument("--boards-per-site", type=int, default=10, help="사이트당 게시판 수 (사이트 그룹 = 7 × 이 값)")
+    parser.add_argument("--runs", type=int, default=2)
+    parser.add_argument("--posts", type=int, default=3, help="실행마다 게시판에 올라올 새 글 수")
+    parser.add_argument("--active-ratio", type=float, default=0.5, help="실행마다 새 글이 올라올 게시판 비율")
+    parser.add_argument("--board-latency", type=float, default=0.02, help="게시판 응답 지연(초)")
+    parser.add_argument("--gemini-latency", type=float, default=0.5, help="Gemini 응답 지연(초)")
+    parser.add_argument("--gemini-jitter", type=float, default=0.2)
+    parser.add_argument("--gemini-429", type=float, default=0.02, help="Gemini 429 비율 (0~1)")
+    parser.add_argument("--gemini-rpm", type=int, default=0, help="Gemini 분당 요청 한도 (0 이면 없음)")
+    parser.add_argument("--gemini-min-interval", type=float, default=0.0,
+                        help="크롤러의 Gemini 요청 전 대기 (GEMINI_MIN_INTERVAL, 운영 기본 6초)")
+    parser.add_argument("--gemini-retry-delay", type=float, default=1.0,
+                        help="크롤러의 429 재시도 대기 기준 (GEMINI_RETRY_BASE_DELAY, 운영 기본 30초)")
+    parser.add_argument("--no-gemini", action="store_true", help="Gemini 대신 폴백 요약 사용")
+    parser.add_argument("--stages", type=int, default=12, help="표에 보여줄 단계 수")
+    parser.add_argument("--workdir", help="outbox/리포트/로그를 남길 디렉토리 (기본: 임시 디렉토리)")
+    parser.add_argument("--json", help="결과를 JSON 으로 저장할 경로")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return run_child()
+
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="crawler-loadtest-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    boards = FakeBoards(boards_per_site=args.boards_per_site, latency=args.board_latency)
+    gemini = FakeGemini(latency=args.gemini_latency, jitter=args.gemini_jitter,
+                        rate_limit_ratio=args.gemini_429, rpm=args.gemini_rpm, seed=20251114)
+    subs = build_subscriptions(boards, args.subscriptions)
+    backend = FakeBackend(subscriptions=subs)
+
+    print(f"[loadtest] 구독 {len(subs):,}개, 게시판 {len(boards.boards)}개, 실행 {args.runs}회, "
+          f"새 글 {args.posts}개 × 게시판 {args.active_ratio:.0%}, workdir={workdir}")
+    print(f"[loadtest] Gemini: " + ("폴백 요약 (--no-gemini)" if args.no_gemini else
+          f"지연 {args.gemini_latency}s±{args.gemini_jitter}s, 429 {args.gemini_429:.0%}, rpm {args.gemini_rpm or '-'}"))
+
+    results = []
+    with boards, gemini, backend:
+        for run in range(1, args.runs + 1):
+            r = run_once(args, workdir, run, backend, gemini, boards, subs)
+            print_run(r)
+            results.append(r)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "runs": results}, ensure_ascii=False, indent=1),
+                                   encoding="utf-8")
+        print(f"\n[loadtest] 결과 저장: {args.json}")
+
+    failed = False
+    for r in results:
+        if r["exit_code"] != 0:
+            print(f"[loadtest] ❌ run {r['run']}: 크롤러 종료 코드 {r['exit_code']} ({r['log']})")
+            failed = True
+        if r["alerts"] != r["expected_alerts"]:
+            print(f"[loadtest] ❌ run {r['run']}: 알림 {r['alerts']} != 기대 {r['expected_alerts']}")
+            failed = True
+        if r["cursors_behind"]:
+            print(f"[loadtest] ❌ run {r['run']}: 커서가 최신 글까지 가지 않은 구독 {r['cursors_behind']}개")
+            failed = True
+    if not failed:
+        print("[loadtest] ✅ 모든 실행에서 알림/커서가 기대와 같습니다")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,86 @@
+"""
+파서 메모리 벤치마크 (페이지 하나를 파싱하는 동안의 최대 메모리와 파싱 뒤에 남는 메모리).
+
+benchmarks/parsers.py 와 같은 픽스처를 같은 경로(decode_html → BeautifulSoup → 추출)로 파싱하면서 tracemalloc 으로
+- peak: 파싱하는 동안 새로 잡은 메모리의 최댓값 (페이지 바이트 대비 배수도 보고)
+- retained: 결과를 버린 뒤에도 남아 있는 메모리. 순환 GC 를 끈 상태로 재므로,
+  파스 트리를 decompose() 하지 않고 참조만 놓으면 (bs4 트리는 부모/형제 참조가 순환) 다음 GC 까지 트리 전체가 여기에 잡힌다.
+를 잰다. 케이스마다 peak 가 --budget-ratio × 페이지 크기 + --budget-base 를 넘거나
+retained 가 --retained-budget 을 넘으면 종료 코드 1 로 실패한다.
+
+사용 예:
+    python benchmarks/parse_memory.py
+    python benchmarks/parse_memory.py --case large --budget-ratio 30
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.parsers import load_cases, make_crawler, run_once  # noqa: E402
+
+# html.parser 로 만든 트리는 페이지 바이트의 15~35배 (태그가 많은 목록 페이지일수록 큼)
+DEFAULT_BUDGET_RATIO = 40.0
+DEFAULT_BUDGET_BASE_KIB = 256
+# 트리를 해제하면 urljoin/인코딩 추정 캐시 정도만 남는다 (해제하지 않으면 페이지 크기의 15배 이상)
+DEFAULT_RETAINED_BUDGET_KIB = 128
+
+
+def measure(case: Dict) -> Dict:
+    crawler = make_crawler(case)
+    # 인코딩 추정기 import, 정규식 컴파일 등 처음 한 번만 잡히는 메모리는 빼고 잰다
+    run_once(crawler, case)
+    gc.collect()
+    gc.disable()
+    try:
+        tracemalloc.start()
+        result = run_once(crawler, case)
+        _, peak = tracemalloc.get_traced_memory()
+        del result
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        gc.enable()
+    return {"peak": peak, "retained": retained, "ratio": peak / len(case["content"])}
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="parser memory benchmark")
+    parser.add_argument("--case", help="이름에 이 문자열이 들어간 케이스만")
+    parser.add_argument("--budget-ratio", type=float, default=DEFAULT_BUDGET_RATIO,
+                        help="페이지 바이트 대비 허용 최대 메모리 배수")
+    parser.add_argument("--budget-base", type=int, default=DEFAULT_BUDGET_BASE_KIB, help="배수 외에 허용하는 KiB")
+    parser.add_argument("--retained-budget", type=int, default=DEFAULT_RETAINED_BUDGET_KIB,
+                        help="파싱 뒤 남아도 되는 KiB (GC 없이)")
+    args = parser.parse_args(argv)
+
+    cases = load_cases(args.case)
+    print(f"{'case':<24}{'KiB':>6}{'peak_KiB':>10}{'x page':>8}{'retained_KiB':>14}  result")
+    failed = 0
+    for case in cases:
+        r = measure(case)
+        page_kib = len(case["content"]) / 1024
+        budget = args.budget_ratio * len(case["content"]) + args.budget_base * 1024
+        errors = []
+        if r["peak"] > budget:
+            errors.append(f"최대 {r['peak'] / 1024:.0f}KiB > 예산 {budget / 1024:.0f}KiB")
+        if r["retained"] > args.retained_budget * 1024:
+            errors.append(f"파싱 뒤 {r['retained'] / 1024:.0f}KiB 남음 (파스 트리 해제 안 됨?)")
+        print(f"{case['name']:<24}{page_kib:>6.0f}{r['peak'] / 1024:>10.0f}{r['ratio']:>8.1f}"
+              f"{r['retained'] / 1024:>14.1f}  {'; '.join(errors) or 'OK'}")
+        failed += bool(errors)
+    if failed:
+        print(f"[parse_memory] ❌ {failed}개 케이스가 메모리 예산을 넘었습니다")
+        return 1
+    print(f"[parse_memory] ✅ 모든 케이스가 예산 이내 (페이지 × {args.budget_ratio:g} + {args.budget_base}KiB, "
+          f"파싱 뒤 <= {args.retained_budget}KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
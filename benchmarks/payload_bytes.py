@@ -0,0 +1,113 @@
+"""
+알림 전송량 벤치마크 (실행 1회당 백엔드로 보내는 바이트 수).
+
+한 게시판을 N명이 구독하고 새 글이 P개 올라온 상황을 만들어
+tools/fake_backend 로컬 서버에 아래 설정으로 각각 전송한 뒤 비교한다.
+- full        : 알림마다 본문/요약 포함, 압축 없음 (기존 방식)
+- full+gzip   : 알림마다 본문/요약 포함, 큰 본문 gzip
+- ref+gzip    : 게시물 본문은 한 번만 업로드, 알림은 post_key 참조 + gzip
+
+사용 예:
+    python benchmarks/payload_bytes.py --subscribers 200 --posts 3
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from tools.fake_backend import FakeBackend  # noqa: E402
+
+SITE_URL = "https://www.ablenews.co.kr/news/articleList.html?view_type=sm"
+
+# 실제 기사 본문 길이와 비슷한 한국어 텍스트
+_PARAGRAPH = (
+    "장애인 고용 촉진을 위한 지원 사업 참여 기관을 모집합니다. 신청 기간은 다음 달 말까지이며, "
+    "자세한 내용은 첨부된 공고문을 확인해 주시기 바랍니다. 문의 사항은 담당 부서로 연락 주십시오. "
+)
+
+
+def build_alerts(subscribers: int, posts: int, content_chars: int):
+    content = (_PARAGRAPH * (content_chars // len(_PARAGRAPH) + 1))[:content_chars]
+    summary = content[:300]
+    per_sub = []
+    for sub_id in range(1, subscribers + 1):
+        alerts = []
+        for post_no in range(posts):
+            post_id = str(100000 + post_no)
+            alerts.append({
+                "user_id": sub_id,
+                "subscription_id": sub_id,
+                "site_alias": "에이블뉴스",
+                "site_post_id": post_id,
+                "title": f"2025년 장애인 고용 지원 사업 공고 {post_no}",
+                "url": f"https://www.ablenews.co.kr/news/articleView.html?idxno={post_id}",
+                "published_at": "2025-11-14",
+                "content_raw": content,
+                "content_summary": summary,
+                "keyword_matched": sub_id % 3 == 0,
+            })
+        per_sub.append((sub_id, alerts, str(100000 + posts - 1)))
+    return per_sub
+
+
+def run_case(name: str, payload_mode: str, gzip_min_bytes: int, per_sub) -> dict:
+    from services import notification_client as nc
+
+    nc.BACKEND_GZIP_MIN_BYTES = gzip_min_bytes
+    nc._bulk_supported = nc._bulk_last_seen_supported = nc._bulk_posts_supported = True
+    nc._gzip_supported = True
+    for key in nc.transfer_stats:
+        nc.transfer_stats[key] = 0
+
+    with FakeBackend() as backend:
+        nc.BACKEND_BASE_URL = backend.url
+        delivery = nc.BatchedDelivery(payload_mode=payload_mode)
+        for sub_id, alerts, last_seen in per_sub:
+            delivery.submit(sub_id, alerts, last_seen, site_key=SITE_URL)
+        delivery.close()
+
+        return {
+            "case": name,
+            "requests": len(backend.requests),
+            "bytes_sent": backend.bytes_received(),
+            "bytes_raw": nc.transfer_stats["bytes_raw"],
+            "alerts": len(backend.alerts),
+        }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="alert payload bytes benchmark")
+    parser.add_argument("--subscribers", type=int, default=200)
+    parser.add_argument("--posts", type=int, default=3)
+    parser.add_argument("--content-chars", type=int, default=3000)
+    args = parser.parse_args(argv)
+
+    # 배치 크기/대기 시간은 기본값을 사용하되, 타이머 플러시 때문에 결과가 흔들리지 않게 한다
+    os.environ.setdefault("ALERT_BATCH_MAX_DELAY", "0")
+    per_sub = build_alerts(args.subscribers, args.posts, args.content_chars)
+
+    results = [
+        run_case("full", "full", 0, per_sub),
+        run_case("full+gzip", "full", 1024, per_sub),
+        run_case("ref+gzip", "ref", 1024, per_sub),
+    ]
+
+    baseline = results[0]["bytes_sent"]
+    print(f"[payload_bytes] subscribers={args.subscribers} posts={args.posts} "
+          f"content_chars={args.content_chars}")
+    print(f"{'case':<12}{'requests':>10}{'bytes_raw':>14}{'bytes_sent':>14}{'vs full':>10}")
+    for r in results:
+        ratio = r["bytes_sent"] / baseline if baseline else 0
+        print(f"{r['case']:<12}{r['requests']:>10}{r['bytes_raw']:>14,}{r['bytes_sent']:>14,}"
+              f"{ratio:>9.1%}")
+        if r["alerts"] != args.subscribers * args.posts:
+            print(f"[payload_bytes] ❌ {r['case']}: 알림 수 불일치 {r['alerts']}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+크롤러 콜드 스타트(import 시간) 벤치마크.
+
+`python -X importtime -c "import main"` 을 별도 프로세스로 실행해서
+- 최상위 import 들의 누적 시간 합계
+- 가장 무거운 모듈 목록
+- 시작 시점에 import 되면 안 되는 모듈(Gemini SDK, dotenv)의 로드 여부
+를 보고하고, 목표 예산(--budget-ms)을 넘으면 종료 코드 1 로 실패한다.
+
+사용 예:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --budget-ms 400 --runs 5
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# 요약 요청이 없는 실행에서는 로드되면 안 되는 무거운 모듈들
+FORBIDDEN_AT_STARTUP = ("google.generativeai", "google.api_core", "dotenv")
+
+DEFAULT_BUDGET_MS = 300.0
+
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_importtime(target: str = "main") -> Tuple[Dict[str, int], int]:
+    """
+    -X importtime 결과를 파싱한다.
+    return: ({모듈명: 누적 us}, 최상위 import 누적 합계 us)
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {target} 실패:\n{proc.stderr[-2000:]}")
+
+    cumulative: Dict[str, int] = {}
+    top_level_total = 0
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if not m:
+            continue
+        cum_us = int(m.group(2))
+        indent = len(m.group(3)) - 1
+        name = m.group(4)
+        cumulative[name] = cum_us
+        # 들여쓰기가 없는 줄이 최상위 import (하위 import 시간은 누적값에 포함됨)
+        if indent == 0:
+            top_level_total += cum_us
+    return cumulative, top_level_total
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="crawler import-time benchmark")
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.environ.get("STARTUP_BUDGET_MS", DEFAULT_BUDGET_MS)))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--target", default="main")
+    args = parser.parse_args(argv)
+
+    totals = []
+    cumulative: Dict[str, int] = {}
+    for _ in range(args.runs):
+        cumulative, total_us = run_importtime(args.target)
+        totals.append(total_us / 1000)
+
+    median_ms = statistics.median(totals)
+    print(f"[startup] import {args.target}: median={median_ms:.1f}ms "
+          f"min={min(totals):.1f}ms max={max(totals):.1f}ms (runs={args.runs})")
+
+    print(f"[startup] 가장 무거운 모듈 상위 {args.top}개 (누적):")
+    heaviest = sorted(cumulative.items(), key=lambda kv: kv[1], reverse=True)[: args.top]
+    for name, cum_us in heaviest:
+        print(f"  {cum_us / 1000:8.1f}ms  {name}")
+
+    failed = False
+    loaded = [name for name in FORBIDDEN_AT_STARTUP if name in cumulative]
+    if loaded:
+        print(f"[startup] ❌ 시작 시점에 로드되면 안 되는 모듈이 import 됨: {loaded}")
+        failed = True
+
+    if median_ms > args.budget_ms:
+        print(f"[startup] ❌ 예산 초과: {median_ms:.1f}ms > {args.budget_ms:.1f}ms")
+        failed = True
+    else:
+        print(f"[startup] ✅ 예산 이내: {median_ms:.1f}ms <= {args.budget_ms:.1f}ms")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+상시 실행(데몬) 모드 진입점.
+
+main.py 는 실행할 때마다 인터프리터 기동/import/커넥션 생성 비용을 내고 모든 사이트를 같은 주기로 돈다.
+이 모듈은 프로세스를 계속 띄워 둔 채로
+- 구독 스냅샷(SubscriptionSnapshot)을 메모리에 유지하면서 DAEMON_SUBSCRIPTION_REFRESH 마다 변경분만 동기화하고,
+- 사이트별 다음 폴링 시각을 SiteScheduler(힙)로 관리해서 due 가 된 사이트만 처리하고,
+- 사이트별 게시 빈도를 PollRateTracker 로 학습해서 다음 폴링 주기를 정하고,
+- 알림/커서 전송 단계(outbox 또는 배치 전송)와 HTTP 커넥션 풀을 재사용한다.
+- 샤딩 설정(SHARD_INDEX/SHARD_COUNT 또는 SHARD_COORDINATOR_URL)이 있으면 자기 샤드의 사이트만 스케줄한다.
+- 단계별 계측값(services.metrics)은 시작 이후 누적되며, 구독 동기화 주기마다와 종료 시 리포트/textfile 로 쓴다.
+
+SIGTERM/SIGINT 를 받으면 처리 중인 사이트까지만 마치고, 남은 알림/커서를 전송한 뒤 종료한다.
+
+사용 예:
+    python daemon.py
+"""
+import os
+import signal
+import threading
+import time
+from typing import Dict, List, Optional
+
+from main import OUTBOX_DRAIN_TIMEOUT, count_merged_urls, filter_new_posts, open_delivery, process_site_group
+from services import deadline, log, metrics
+from services.poll_rate import PollRateTracker
+from services.scheduler import SiteScheduler
+from services.sharding import CoordinatorLease, ShardAssignment, shard_from_env
+from services.site_lock import SiteLocker, open_site_locker
+from services.subscription_client import SUBSCRIPTION_SNAPSHOT_PATH, SubscriptionSnapshot
+from sites import registry
+
+# 학습 이력이 없는 사이트의 기본 폴링 주기(초)
+DAEMON_POLL_INTERVAL = float(os.environ.get("DAEMON_POLL_INTERVAL", "300"))
+# urgent 구독이 하나라도 있는 사이트의 폴링 주기(초)
+DAEMON_URGENT_POLL_INTERVAL = float(os.environ.get("DAEMON_URGENT_POLL_INTERVAL", "60"))
+# 구독 목록 변경분 동기화 주기(초)
+DAEMON_SUBSCRIPTION_REFRESH = float(os.environ.get("DAEMON_SUBSCRIPTION_REFRESH", "300"))
+
+
+def poll_interval(site_url: str, site_subs: List[Dict], tracker: PollRateTracker) -> float:
+    """
+    사이트의 다음 폴링까지 기다릴 시간(초).
+    학습된 게시 빈도로 정하되, urgent 구독이 있는 사이트는 DAEMON_URGENT_POLL_INTERVAL 보다 길어지지 않게 한다.
+    """
+    interval = tracker.next_interval(site_url, DAEMON_POLL_INTERVAL)
+    if any(sub.get("urgent") for sub in site_subs):
+        return min(interval, DAEMON_URGENT_POLL_INTERVAL)
+    return interval
+
+
+class CrawlerDaemon:
+    def __init__(
+        self,
+        snapshot: SubscriptionSnapshot,
+        scheduler: SiteScheduler = None,
+        tracker: PollRateTracker = None,
+        shard: ShardAssignment = None,
+        lease: CoordinatorLease = None,
+        site_locker: SiteLocker = None,
+    ):
+        self.snapshot = snapshot
+        self.scheduler = scheduler or SiteScheduler()
+        self.tracker = tracker or PollRateTracker()
+        self.shard = shard or ShardAssignment(0, 1)
+        self.lease = lease
+        self.site_locker = site_locker or open_site_locker()
+        # 스냅샷이 마지막으로 백엔드와 맞춰진 시각 (이후에 다른 실행이 처리한 사이트는 건너뜀)
+        self._synced_at: Optional[float] = None
+        self.stop_event = threading.Event()
+        self.delivery = None
+        self._next_refresh = 0.0
+
+    def request_stop(self, signum=None, frame=None) -> None:
+        if not self.stop_event.is_set():
+            log.info("daemon.stopping", "종료 요청 수신 (signal=%s), 처리 중인 사이트까지 마치고 종료합니다", signum)
+        self.stop_event.set()
+
+    def refresh_subscriptions(self) -> None:
+        synced_at = time.time()
+        try:
+            self.snapshot.sync()
+            self._synced_at = synced_at
+        except Exception as e:
+            # 백엔드가 잠시 죽어도 기존 스냅샷으로 계속 폴링한다
+            log.error("daemon.sync_failed", "구독 동기화 실패, 기존 스냅샷으로 계속합니다: %s", e)
+        else:
+            self.snapshot.save()
+            merged = sum(1 for group in self.snapshot.groups.values() if count_merged_urls(list(group.values())))
+            if merged:
+                log.info("daemon.merged", "URL 정규화로 합친 사이트 그룹 %d개", merged)
+        self._sync_schedule()
+        self.tracker.prune(self.snapshot.groups)
+        self.tracker.save()
+        metrics.write_outputs()
+        self._next_refresh = time.monotonic() + DAEMON_SUBSCRIPTION_REFRESH
+
+    def _owned_sites(self) -> List[str]:
+        if self.lease is not None and self.lease.assignment is None:
+            return []
+        return [site_url for site_url in self.snapshot.groups if self.shard.owns(site_url)]
+
+    def _sync_schedule(self) -> None:
+        self.scheduler.sync_sites(self._owned_sites())
+
+    def _check_lease(self) -> None:
+        """코디네이터 임대를 갱신하고, 맡은 샤드가 바뀌었으면 스케줄을 다시 맞춘다."""
+        if self.lease is None or not self.lease.ensure():
+            return
+        if self.lease.assignment is not None:
+            self.shard = self.lease.assignment
+        log.info("shard.changed", "샤드 변경: %s", self.lease.assignment)
+        self._sync_schedule()
+
+    def run_once(self) -> bool:
+        """
+        due 가 된 사이트 하나를 처리한다.
+        return: 처리했으면 True, due 인 사이트가 없으면 False
+        """
+        site_url = self.scheduler.pop_due()
+        if site_url is None:
+            return False
+        site_subs = list(self.snapshot.groups.get(site_url, {}).values())
+        if not site_subs:
+            return True
+        new_count = 0
+        try:
+            with self.site_locker.hold(site_url, fresh_since=self._synced_at) as held:
+                if not held:
+                    log.info("site.locked", "다른 실행이 처리 중이거나 방금 처리한 사이트라 건너뜁니다: %s", site_url)
+                    # 다른 실행이 옮긴 커서를 받아 온 뒤에 다시 처리하도록 바로 동기화한다
+                    self._next_refresh = 0.0
+                else:
+                    try:
+                        posts = process_site_group(site_url, site_subs, self.delivery)
+                    except deadline.DeadlineExceeded as e:
+                        # 이미 넘긴 구독은 전송하고, 끝내지 못한 구독은 다음 폴링에서 같은 커서부터 다시 처리한다
+                        log.warning("site.cut_off", "시간 예산을 넘겨 중단합니다 (남은 구독의 커서는 유지): site_url=%s (%s)",
+                                    site_url, e)
+                        metrics.add("site_groups_cut_off")
+                        posts = None
+                    except registry.UnknownSiteError as e:
+                        log.warning("site.unknown", "%s (구독 %d개, 건너뜀)", e, len(site_subs))
+                        metrics.add("site_groups_unknown")
+                        posts = None
+                    self.delivery.flush()
+                    if posts is not None:
+                        new_count = self.tracker.observe(site_url, posts, filter_new_posts)
+        except Exception as e:
+            log.error("site.error", "site_url=%s 처리 중 오류: %s", site_url, e)
+            new_count = 0
+        finally:
+            interval = poll_interval(site_url, site_subs, self.tracker)
+            self.scheduler.reschedule(site_url, interval)
+        log.info("site.polled", "site_url=%s 새 게시물 %d개, 다음 폴링 %.0fs 후", site_url, new_count, interval)
+        return True
+
+    def run(self) -> None:
+        self.delivery = open_delivery(self.snapshot.update_last_seen)
+        try:
+            while not self.stop_event.is_set():
+                self._check_lease()
+                if time.monotonic() >= self._next_refresh:
+                    self.refresh_subscriptions()
+                if self.run_once():
+                    continue
+                wait = self._next_refresh - time.monotonic()
+                if self.lease is not None:
+                    wait = min(wait, self.lease.ttl / 3)
+                until_due = self.scheduler.seconds_until_due()
+                if until_due is not None:
+                    wait = min(wait, until_due)
+                self.stop_event.wait(timeout=max(0.0, wait))
+        finally:
+            self.delivery.close(timeout=OUTBOX_DRAIN_TIMEOUT)
+            self.snapshot.save()
+            self.tracker.save()
+            self.site_locker.close()
+            if self.lease is not None:
+                self.lease.release()
+            metrics.print_summary()
+            metrics.write_outputs()
+            log.info("daemon.stopped", "종료")
+
+
+def main():
+    shard, lease = shard_from_env()
+    daemon = CrawlerDaemon(
+        SubscriptionSnapshot.load(SUBSCRIPTION_SNAPSHOT_PATH), shard=shard, lease=lease
+    )
+    signal.signal(signal.SIGTERM, daemon.request_stop)
+    signal.signal(signal.SIGINT, daemon.request_stop)
+    log.info("daemon.started", "시작 (기본 주기 %.0fs, urgent %.0fs)", DAEMON_POLL_INTERVAL, DAEMON_URGENT_POLL_INTERVAL)
+    daemon.run()
+
+
+if __name__ == "__main__":
+    main()
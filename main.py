@@ -1,23 +1,34 @@
+import collections
 import os
-from typing import List, Dict, Optional
-from urllib.parse import urlparse
-
-from sites.dongguk_sw_board import DonggukSwBoardCrawler
-from sites.dongguk_cse_notice import DonggukCseNoticeCrawler
-from sites.kbuwel_notice import KbuwelNoticeCrawler
-from sites.ablenews import AbleNewsCrawler
-from sites.kead_notice import KeadNoticeCrawler
-from sites.silwel_notice import SilwelNoticeCrawler
-from sites.koddi_notice import KoddiNoticeCrawler
-from services.subscription_client import fetch_subscriptions
-from services.notification_client import create_alert, update_subscription_last_seen
+import time
+from typing import Iterable, Iterator, List, Dict, NamedTuple, Optional, Set, Tuple
+
+from services import content_cache, deadline, log, metrics, profiling
+from services.subscription_client import (
+    SUBSCRIPTION_SNAPSHOT_PATH,
+    SubscriptionSnapshot,
+    iter_subscriptions,
+)
+from services.notification_client import BatchedDelivery
+from services.outbox import OUTBOX_PATH, Outbox
+from services.sharding import shard_from_env
+from services.site_lock import SITE_LOCK_TTL, open_site_locker
 from services.summarizer import summarize
+from sites import registry
+from sites.canonical import canonical_url
+from sites.base import SiteCrawler
+from sites.post import Post
 
 
-def filter_new_posts(posts: List[Dict], last_seen_post_id: Optional[str]) -> List[Dict]:
+# 실행 시작/종료 시 outbox 에 남은 항목을 전송하며 기다리는 최대 시간(초)
+OUTBOX_DRAIN_TIMEOUT = float(os.environ.get("OUTBOX_DRAIN_TIMEOUT", "30"))
+
+
+def filter_new_posts(posts: List[Post], last_seen_post_id: Optional[str], quiet: bool = False) -> List[Post]:
     """
     posts: 최신→오래된 순
     last_seen_post_id: None이면 '새로 본 게 없다'고 가정하고, 이번에는 새 알림 안 만듦.
+    quiet: True 이면 디버깅 로그(debug 수준)를 남기지 않는다. (본문 미리 받기 등 같은 판단을 한 번 더 할 때)
     return: 지난번 이후 새로 올라온 게시물들 (오래된→최신 순)
     
     안전 장치:
@@ -31,51 +42,57 @@ def filter_new_posts(posts: List[Dict], last_seen_post_id: Optional[str]) -> Lis
     if not posts:
         return []
 
-    # 디버깅: 현재 페이지의 모든 게시글 ID 출력
-    post_ids = [p["id"] for p in posts]
-    print(f"[filter_new_posts] 🔍 현재 페이지 게시글 ID: {post_ids[:5]}{'...' if len(post_ids) > 5 else ''}")
-    print(f"[filter_new_posts] 🔍 찾고 있는 last_seen_post_id: {last_seen_post_id}")
+    # 디버깅 로그 (기본 LOG_LEVEL=info 에서는 메시지를 만들지 않음. LOG_DEBUG_SITES 로 사이트별로 켬)
+    verbose = not quiet and log.enabled(log.DEBUG, "filter_new_posts")
+    if verbose:
+        log.debug("filter_new_posts", "🔍 현재 페이지 게시글 ID / 찾고 있는 last_seen_post_id",
+                  post_ids=[p.id for p in posts[:5]], post_count=len(posts), last_seen_post_id=last_seen_post_id)
 
     new_posts = []
     found = False
     
     for post in posts:
-        if post["id"] == last_seen_post_id:
+        if post.id == last_seen_post_id:
             found = True
-            print(f"[filter_new_posts] ✅ last_seen_post_id를 찾았습니다!")
+            if verbose:
+                log.debug("filter_new_posts", "✅ last_seen_post_id를 찾았습니다!", new_count=len(new_posts))
             break
         new_posts.append(post)
     
     # last_seen_post_id를 찾지 못한 경우
     if not found:
-        print(f"[filter_new_posts] ⚠️ last_seen_post_id={last_seen_post_id}를 찾지 못했습니다.")
+        if verbose:
+            log.debug("filter_new_posts", "⚠️ last_seen_post_id=%s를 찾지 못했습니다.", last_seen_post_id)
         
         # ID 비교를 통한 판단 (숫자 ID인 경우에만)
         try:
             last_id_num = int(last_seen_post_id)
-            latest_id_num = int(posts[0]["id"])
-            oldest_id_num = int(posts[-1]["id"])
+            latest_id_num = int(posts[0].id)
+            oldest_id_num = int(posts[-1].id)
             
             # last_seen_id가 현재 페이지의 최신 게시글보다 크거나 같음
             # → 게시글이 삭제되었거나 공지로 전환됨
             # → 새 게시글 없음!
             if last_id_num >= latest_id_num:
-                print(f"[filter_new_posts] 🔍 last_seen_id({last_id_num}) >= latest_id({latest_id_num})")
-                print(f"[filter_new_posts] ✅ 게시글이 삭제되었거나 공지로 전환됨. 새 게시글 없음!")
+                if verbose:
+                    log.debug("filter_new_posts", "✅ last_seen_id(%d) >= latest_id(%d): 게시글이 삭제되었거나 공지로 전환됨. "
+                              "새 게시글 없음!", last_id_num, latest_id_num)
                 return []
             
             # last_seen_id가 현재 페이지의 가장 오래된 게시글보다 작음
             # → 두 번째 페이지로 넘어감
             # → 안전 장치: 최신 3개만 반환
             elif last_id_num < oldest_id_num:
-                print(f"[filter_new_posts] 🔍 last_seen_id({last_id_num}) < oldest_id({oldest_id_num})")
-                print(f"[filter_new_posts] ⚠️ 게시글이 많이 올라와 페이지가 넘어감. 최신 3개만 반환")
+                if verbose:
+                    log.debug("filter_new_posts", "⚠️ last_seen_id(%d) < oldest_id(%d): 게시글이 많이 올라와 페이지가 넘어감. "
+                              "최신 3개만 반환", last_id_num, oldest_id_num)
                 new_posts = new_posts[:3]
             
         except (ValueError, TypeError):
             # ID가 숫자가 아닌 경우 (URL 등)
             # 보수적으로 최신 3개만 반환
-            print(f"[filter_new_posts] ⚠️ ID가 숫자가 아님. 보수적으로 최신 3개만 반환")
+            if verbose:
+                log.debug("filter_new_posts", "⚠️ ID가 숫자가 아님. 보수적으로 최신 3개만 반환")
             if len(new_posts) > 3:
                 new_posts = new_posts[:3]
 
@@ -94,9 +111,9 @@ def keyword_match(keyword: Optional[str], text: str) -> bool:
     return keyword in text  # 간단한 포함 여부 (나중에 개선 가능)
 
 
-def get_crawler_for_subscription(sub: Dict):
+def get_crawler_for_subscription(sub: Dict) -> SiteCrawler:
     """
-    구독의 site_url(또는 site_type)을 보고 어떤 크롤러를 쓸지 결정.
+    구독의 site_type(없으면 site_url 호스트)에 맞는 크롤러 인스턴스. (sites/registry.py 에 등록된 크롤러)
     - sw.dongguk.edu        → DonggukSwBoardCrawler
     - cse.dongguk.edu       → DonggukCseNoticeCrawler
     - web.kbuwel.or.kr      → KbuwelNoticeCrawler
@@ -104,231 +121,459 @@ def get_crawler_for_subscription(sub: Dict):
     - www.kead.or.kr       → KeadNoticeCrawler
     - www.silwel.or.kr     → SilwelNoticeCrawler
     - www.koddi.or.kr      → KoddiNoticeCrawler
+    인스턴스는 사이트별로 재사용된다. 맞는 크롤러가 없으면 UnknownSiteError (요청을 보내지 않음)
     """
-    site_type = sub.get("site_type")
-    if site_type == "DONGGUK_SW":
-        return DonggukSwBoardCrawler()
-    if site_type == "DONGGUK_CSE":
-        return DonggukCseNoticeCrawler()
-    if site_type == "KBUWEL":
-        return KbuwelNoticeCrawler()
-    if site_type == "ABLE_NEWS":
-        return AbleNewsCrawler()
-    if site_type == "KEAD":
-        return KeadNoticeCrawler()
-    if site_type == "SILWEL":
-        return SilwelNoticeCrawler()
-    if site_type == "KODDI":
-        return KoddiNoticeCrawler()
-
-    # site_type 이 없으면 URL 도메인으로 추론
-    url = sub.get("site_url", "")
-    host = urlparse(url).netloc
-    if "cse.dongguk.edu" in host:
-        return DonggukCseNoticeCrawler()
-    if "sw.dongguk.edu" in host:
-        return DonggukSwBoardCrawler()
-    if "web.kbuwel.or.kr" in host:
-        return KbuwelNoticeCrawler()
-    if "ablenews.co.kr" in host:
-        return AbleNewsCrawler()
-    if "kead.or.kr" in host:
-        return KeadNoticeCrawler()
-    if "silwel.or.kr" in host:
-        return SilwelNoticeCrawler()
-    if "koddi.or.kr" in host:
-        return KoddiNoticeCrawler()
-
-    # 기본값: 동국대 크롤러
-    return DonggukSwBoardCrawler()
-
-
-# “구독 하나에 대해 ‘이번 턴에 새로 생긴 알림’을 DB에 쌓는 단위 작업”
-def process_subscription(
-    sub: Dict,
-    crawler,
-    posts: List[Dict],
-    content_cache: Dict[str, str],
-    summary_cache: Dict[str, str],
-):
-    # 이미 site_url 단위로 크롤링된 posts/ crawler 를 재사용
-    print(f"[Sub {sub['id']}] site_url={sub['site_url']}")
-    print(f"[Sub {sub['id']}] crawler={type(crawler).__name__}")
+    return registry.crawler_for(sub)
 
-    if not posts:
-        return
 
-    last_seen_id = sub.get("last_seen_post_id")
-    latest_id = posts[0]["id"]
-    
-    # 디버깅: last_seen_id 확인
-    print(f"[Sub {sub['id']}] 🔍 last_seen_id={last_seen_id}, latest_id={latest_id}")
+class EnrichedPost(NamedTuple):
+    """
+    본문/요약까지 채운 게시물. 그룹 안에서 게시물당 한 번만 만들고 모든 구독이 공유한다.
+    payload 는 알림 payload 중 구독과 무관한 부분 (구독별 필드만 덧붙여 알림을 만든다)
+    """
+    post: Post
+    payload: Dict
 
-    # 첫 실행: 가장 최신 게시글 1개를 바로 요약·알림으로 보내고, 그 게시글을 기준점으로 설정.
+
+def plan_subscription(sub: Dict, posts: List[Post]) -> Tuple[List[Post], Optional[str]]:
+    """
+    구독 하나가 이번에 알림을 받을 게시물(오래된→최신)과 갱신할 last_seen_post_id.
+    - 첫 실행(last_seen 없음): 가장 최신 게시글 1개를 보내고, 그 게시글을 기준점으로 설정
+    - 그 외: filter_new_posts() 로 고른 새 게시물. 없으면 ([], None)
+    """
+    if not posts:
+        return [], None
+    last_seen_id = sub.get("last_seen_post_id")
     if last_seen_id is None:
-        latest_post = posts[0]
-        print(f"[Sub {sub['id']}] 첫 실행 - 최신 게시글 1개를 요약 및 알림 생성 (post_id={latest_id})")
-
-        cache_key = latest_post.get("id") or latest_post["url"]
-        if not cache_key:
-            print(f"[Sub {sub['id']}] 캐시 키가 없어 스킵합니다")
-            update_subscription_last_seen(sub["id"], latest_id)
-            return
-        if cache_key in content_cache:
-            content_raw = content_cache[cache_key]
-        else:
-            content_raw = crawler.fetch_post_content(latest_post["url"])
-            content_cache[cache_key] = content_raw
-
-        # 본문이 비어있으면 스킵 (크롤러가 본문 영역을 찾지 못한 경우)
-        if not content_raw.strip():
-            print(f"[Sub {sub['id']}] 본문이 비어있어 스킵합니다: {latest_post['url']}")
-            update_subscription_last_seen(sub["id"], latest_id)
-            return
-
-        # 키워드 매칭 여부 (있으면 포함 여부, 없으면 False)
-        matched = keyword_match(sub.get("keyword"),
-                                latest_post["title"] + " " + content_raw)
-
-        # 새 글이면 요약은 항상 수행 (동일 게시글에 대해서는 summary_cache 로 재사용)
-        if cache_key in summary_cache:
-            summary = summary_cache[cache_key]
-            print(f"[Sub {sub['id']}] 요약 캐시 히트: {cache_key}")
-        else:
-            summary = summarize(content_raw)
-            # 요약 실패 표시가 없는 경우에만 캐시 (실패 시 다음 subscription에서 재시도)
-            if "[요약 생성 실패]" not in summary:
-                summary_cache[cache_key] = summary
-                print(f"[Sub {sub['id']}] 요약 캐시 저장: {cache_key}")
-            else:
-                print(f"[Sub {sub['id']}] 요약 실패, 캐시 안함: {cache_key}")
-
-        # 어떤 글이 어떤 요약으로 DB에 들어가는지 눈으로 확인할 수 있게 로그 출력
-        print(f"\n[Sub {sub['id']}] 요약 대상 게시글: {latest_post['title']}")
-        print(f"[Sub {sub['id']}] 요약 본문 (앞 300자): {summary[:300]}")
-
-        # 알림 생성 요청 데이터 생성 (메타데이터를 모두 포함)
-        alert_payload = {
-            "user_id": sub["user_id"],
-            "subscription_id": sub["id"],
-            "site_alias": sub.get("site_alias"),
-            "site_post_id": latest_post["id"],
-            "title": latest_post["title"],
-            "url": latest_post["url"],
-            "published_at": latest_post.get("date"),
-            "content_raw": content_raw,     # 원문 전체 텍스트
-            "content_summary": summary,     # 요약 텍스트
-            "keyword_matched": matched,
-        }
+        return [posts[0]], posts[0].id
+    new_posts = filter_new_posts(posts, last_seen_id)
+    if not new_posts:
+        return [], None
+    return new_posts, posts[0].id
 
-        create_alert(alert_payload)
-        update_subscription_last_seen(sub["id"], latest_id)
-        return
 
-    new_posts = filter_new_posts(posts, last_seen_id)
+def fetch_contents(crawler, posts: List[Post]) -> Set[str]:
+    """
+    게시물 본문을 받아 본문 캐시(services.content_cache)에 넣고, 본문이 준비된 게시물의 Post.key 를 반환한다.
+    이미 캐시에 있는 게시물은 요청하지 않는다. 요청에 실패한 게시물은 결과에 없다.
+    SiteCrawler 는 본문 요청(I/O)을 순서대로 보내되, 받은 페이지를 바로 파싱 풀(services.parse_pool)에 넘겨
+    다음 요청을 받는 동안 다른 코어에서 파싱되게 한다.
+    """
+    ready = {post.key for post in posts if content_cache.contains(post.key)}
+    metrics.cache("content", hits=len(ready), misses=len(posts) - len(ready))
+    posts = [post for post in posts if post.key not in ready]
+    if not isinstance(crawler, SiteCrawler):
+        for post in posts:
+            try:
+                with metrics.timed("fetch_post_content"):
+                    content_cache.put(post.key, crawler.fetch_post_content(post.url))
+                ready.add(post.key)
+            except deadline.DeadlineExceeded:
+                raise
+            except Exception as e:
+                log.warning("post.fetch_failed", "본문 요청 실패: %s (%s)", post.url, e)
+        return ready
 
-    if not new_posts: 
-        print(f"[Sub {sub['id']}] 새 게시물 없음")
-        return
+    from services import parse_pool
 
-    print(f"[Sub {sub['id']}] 새 게시물 {len(new_posts)}개")
-    # 디버깅: 새 게시물 ID 목록 출력
-    new_post_ids = [p["id"] for p in new_posts]
-    print(f"[Sub {sub['id']}] 🔍 새 게시물 ID: {new_post_ids}")
+    parse_fn = type(crawler).parse_post_content
+    pending = []
+    try:
+        for post in posts:
+            try:
+                with metrics.timed("fetch_post_content"):
+                    page = crawler.fetch_content_page(post.url)
+            except deadline.DeadlineExceeded:
+                raise
+            except Exception as e:
+                log.warning("post.fetch_failed", "본문 요청 실패: %s (%s)", post.url, e)
+                continue
+            if page is None:
+                content_cache.put(post.key, "")
+                ready.add(post.key)
+                continue
+            pending.append((post.key, page, parse_pool.submit(parse_fn, page)))
+    finally:
+        # 중간에 예산이 끝나도 이미 받은 페이지는 파싱해서 돌려준다
+        for cache_key, page, future in pending:
+            try:
+                content_cache.put(cache_key, parse_pool.result(future, parse_fn, page))
+                ready.add(cache_key)
+            except Exception as e:
+                log.warning("post.parse_failed", "본문 파싱 실패: %s (%s)", page.url, e)
+    return ready
 
-    for post in new_posts:  # 새로 올라온 게시물들(여러 개일 수도 있음)을 하나씩 순회.
-        cache_key = post.get("id") or post["url"]
-        if not cache_key:
-            print(f"[Sub {sub['id']}] 캐시 키가 없어 스킵합니다: {post['url']}")
-            continue
-        if cache_key in content_cache:
-            content_raw = content_cache[cache_key]
-        else:
-            content_raw = crawler.fetch_post_content(post["url"])
-            content_cache[cache_key] = content_raw
 
-        # 본문이 비어있으면 이 게시글은 스킵 (하지만 last_seen_id는 업데이트)
-        if not content_raw.strip():
-            print(f"[Sub {sub['id']}] 본문이 비어있어 스킵합니다: {post['url']}")
-            continue
+def enrich_post(post: Post, content_raw: str) -> Optional[EnrichedPost]:
+    """본문을 요약해서 EnrichedPost 를 만든다. 본문이 비어 있으면 None (크롤러가 본문 영역을 찾지 못한 경우)"""
+    if not content_raw.strip():
+        log.info("post.empty", "본문이 비어있어 스킵합니다: %s", post.url)
+        return None
 
-        # 키워드 매칭 여부 (있으면 포함 여부, 없으면 False)
-        matched = keyword_match(sub.get("keyword"), post["title"] + " " + content_raw)
+    with metrics.timed("summarize"):
+        summary = summarize(content_raw)
 
-        # 새 글이면 요약은 항상 수행 (동일 게시글에 대해서는 summary_cache 로 재사용)
-        if cache_key in summary_cache:
-            summary = summary_cache[cache_key]
-            print(f"[Sub {sub['id']}] 요약 캐시 히트: {cache_key}")
+    # 어떤 글이 어떤 요약으로 DB에 들어가는지 확인할 수 있게 로그 출력 (요약 미리보기는 debug 수준)
+    log.info("post.summarized", "요약 대상 게시글: %s", post.title, url=post.url, summary_chars=len(summary))
+    log.debug("post.summary_preview", "요약 본문 (앞 300자): %.300s", summary, url=post.url)
+
+    payload = {
+        "site_post_id": post.id,
+        "title": post.title,
+        "url": post.url,
+        "published_at": post.date,
+        "content_raw": content_raw,     # 원문 전체 텍스트
+        "content_summary": summary,     # 요약 텍스트
+    }
+    return EnrichedPost(post, payload)
+
+
+def enrich_posts(
+    crawler, posts: List[Post]
+) -> Tuple[Dict[str, Optional[EnrichedPost]], Optional[deadline.DeadlineExceeded]]:
+    """
+    게시물마다 본문/요약을 한 번만 준비한다.
+    return: ({Post.key: EnrichedPost 또는 None(본문 없음 → 알림 없이 건너뜀)}, 도중에 난 DeadlineExceeded)
+    본문 요청에 실패했거나 예산이 끝나 준비하지 못한 게시물은 결과에 없다.
+    """
+    enriched: Dict[str, Optional[EnrichedPost]] = {}
+    try:
+        ready = fetch_contents(crawler, posts)
+        for post in posts:
+            if post.key not in ready:
+                continue
+            # 본문은 게시물마다 캐시에서 꺼낸다 (그룹의 본문 전체를 따로 들고 있지 않음)
+            content_raw = content_cache.get(post.key)
+            if content_raw is None:
+                # 그룹의 본문이 캐시 상한보다 커서 요약하기 전에 밀려난 경우 다시 받는다
+                metrics.add("content_cache_refetches")
+                if post.key in fetch_contents(crawler, [post]):
+                    content_raw = content_cache.get(post.key)
+            if content_raw is not None:
+                item = enrich_post(post, content_raw)
+                # 예산이 끝난 뒤의 요약은 타임아웃/폴백일 수 있으므로 쓰지 않는다
+                deadline.check(post.url)
+                enriched[post.key] = item
+    except deadline.DeadlineExceeded as e:
+        return enriched, e
+    return enriched, None
+
+
+def build_alerts(sub: Dict, targets: List[EnrichedPost], match_cache: Dict[Tuple[str, str], bool]) -> List[Dict]:
+    """
+    구독 하나의 알림 payload 목록. 게시물 쪽 데이터는 EnrichedPost 를 그대로 공유하고
+    구독별 필드(user_id, subscription_id, site_alias, keyword_matched)만 덧붙인다.
+    키워드 매칭 결과는 (키워드, 게시물) 단위로 match_cache 에 재사용한다.
+    키워드 유무/매칭과 상관없이 항상 알림을 만든다. (keyword_matched 는 서버/프론트에서 필터링·우선순위용)
+    """
+    keyword = sub.get("keyword")
+    alerts = []
+    for item in targets:
+        if keyword:
+            match_key = (keyword, item.post.key)
+            matched = match_cache.get(match_key)
+            if matched is None:
+                matched = match_cache[match_key] = keyword_match(
+                    keyword, item.post.title + " " + item.payload["content_raw"])
         else:
-            summary = summarize(content_raw)
-            # 요약 실패 표시가 없는 경우에만 캐시 (실패 시 다음 subscription에서 재시도)
-            if "[요약 생성 실패]" not in summary:
-                summary_cache[cache_key] = summary
-                print(f"[Sub {sub['id']}] 요약 캐시 저장: {cache_key}")
-            else:
-                print(f"[Sub {sub['id']}] 요약 실패, 캐시 안함: {cache_key}")
-
-        # 어떤 글이 어떤 요약으로 DB에 들어가는지 눈으로 확인할 수 있게 로그 출력
-        print(f"\n[Sub {sub['id']}] 요약 대상 게시글: {post['title']}")
-        print(f"[Sub {sub['id']}] 요약 본문 (앞 300자): {summary[:300]}")
-
-        # 알림 생성 요청 데이터 생성 (메타데이터를 모두 포함)
-        alert_payload = {
+            matched = False
+        alerts.append({
             "user_id": sub["user_id"],
             "subscription_id": sub["id"],
             "site_alias": sub.get("site_alias"),
-            "site_post_id": post["id"],
-            "title": post["title"],
-            "url": post["url"],
-            "published_at": post.get("date"),
-            "content_raw": content_raw,     # 원문 전체 텍스트
-            "content_summary": summary,     # 요약 텍스트
+            **item.payload,
             "keyword_matched": matched,
-        }
+        })
+    return alerts
 
-        # 키워드 유무/매칭과 상관없이 항상 요약 + 알림 생성
-        # (keyword_matched 플래그는 서버/프론트에서 필터링·우선순위용으로 사용 가능)
-        create_alert(alert_payload)
 
-    # 마지막으로 last_seen_post_id 갱신
-    update_subscription_last_seen(sub["id"], latest_id)
+def process_site_group(site_url: str, site_subs: List[Dict], delivery) -> List[Post]:
+    """
+    같은 site_url 을 구독하는 구독들을 한 번에 처리한다.
+    site_url 은 정규화한 그룹 키(sites/canonical.py)이고, 목록 요청은 대표 구독에 적힌 원래 URL 로 보낸다.
+    게시물 중심으로 처리한다.
+      1) 구독별로 받을 게시물을 정하고 (같은 커서는 한 번만 계산)
+      2) 그 합집합의 게시물마다 본문/요약을 한 번만 준비한 뒤 (enrich_posts)
+      3) 구독마다 준비된 게시물 데이터에 구독 필드만 붙여 delivery(Outbox 또는 BatchedDelivery)에 넘긴다.
+    return: 크롤링한 게시글 목록 (최신→과거, 데몬의 게시 빈도 학습에 사용)
+
+    사이트 하나는 SITE_BUDGET_SECONDS(와 남은 실행 시간) 안에서만 처리한다.
+    예산을 넘기면 준비를 마친 게시물만 받는 구독까지 넘긴 뒤 DeadlineExceeded 를 던진다.
+    나머지 구독의 알림/커서는 넘기지 않으므로 다음 실행에서 같은 커서부터 다시 처리한다.
+    지원하지 않는 사이트면 요청 없이 registry.UnknownSiteError 를 던진다.
+
+    그룹 안의 로그(services.log)에는 site 필드가 붙는다. (LOG_DEBUG_SITES 로 이 사이트만 debug 로그를 켤 수 있음)
+    단계별 소요 시간/캐시 적중/전송 바이트는 site_url 라벨로 services.metrics 에 기록된다.
+    PROFILE_DIR 가 설정되어 있으면 샘플링된 그룹을 cProfile(+tracemalloc)로 프로파일링한다. (services.profiling)
+    """
+    with log.context(site=site_url), metrics.site(site_url), profiling.profile_group(site_url), \
+            metrics.timed("site_group"), deadline.budget(deadline.SITE_BUDGET_SECONDS):
+        return _process_site_group(site_url, site_subs, delivery)
 
 
-def main():
-    subs = fetch_subscriptions()
-    print(f"총 구독 수: {len(subs)}")
+def _process_site_group(site_url: str, site_subs: List[Dict], delivery) -> List[Post]:
+    # 대표 구독 하나를 기준으로 어떤 크롤러를 쓸지 결정
+    rep_sub = site_subs[0]
+    crawler = get_crawler_for_subscription(rep_sub)
 
-    # site_url 기준으로 구독들을 그룹화해서
-    # 같은 사이트는 목록 크롤링을 한 번만 수행하고 결과를 공유한다.
-    groups: Dict[str, List[Dict]] = {}
-    for sub in subs:
-        site_url = sub["site_url"]
-        groups.setdefault(site_url, []).append(sub)
+    list_url = rep_sub["site_url"]
 
-    for site_url, site_subs in groups.items():
-        # 대표 구독 하나를 기준으로 어떤 크롤러를 쓸지 결정
-        rep_sub = site_subs[0]
-        crawler = get_crawler_for_subscription(rep_sub)
+    log.info("site.start", "site_url=%s, crawler=%s, subs=%d", site_url, type(crawler).__name__, len(site_subs))
+    if list_url != site_url:
+        log.info("site.list_url", "목록 요청 URL: %s", list_url)
 
-        print(f"\n[Site] site_url={site_url}, crawler={type(crawler).__name__}, subs={len(site_subs)}")
+    # 해당 사이트에 대한 게시글 목록은 한 번만 크롤링
+    with metrics.timed("fetch_post_list"):
+        posts = crawler.fetch_post_list(list_url)
+    # 목록 요청이 예산 때문에 잘렸으면 "게시글 없음"이 아니라 중단으로 보고한다
+    deadline.check(site_url)
+    if not posts:
+        log.info("site.empty", "site_url=%s 에서 게시글이 없습니다.", site_url)
+        return []
 
-        # 해당 사이트에 대한 게시글 목록은 한 번만 크롤링
-        posts = crawler.fetch_post_list(site_url)
-        if not posts:
-            print(f"[Site] site_url={site_url} 에서 게시글이 없습니다.")
+    # outbox 에 아직 전달 중인 커서가 있으면 그 지점부터 처리한다.
+    # (그 커서까지의 알림은 이미 outbox 에 있으므로 다시 요약하지 않음)
+    # 같은 커서를 가진 구독은 같은 게시물을 받으므로 커서별로 한 번만 계산한다.
+    plans: List[Tuple[Dict, List[Post], Optional[str]]] = []
+    plan_cache: Dict[Optional[str], Tuple[List[Post], Optional[str]]] = {}
+    needed: Dict[str, Post] = {}
+    for sub in site_subs:
+        pending = delivery.pending_cursor(sub["id"])
+        if pending is not None:
+            sub = dict(sub, last_seen_post_id=pending)
+        last_seen_id = sub.get("last_seen_post_id")
+        plan = plan_cache.get(last_seen_id)
+        if plan is None:
+            plan = plan_cache[last_seen_id] = plan_subscription(sub, posts)
+            for post in plan[0]:
+                needed.setdefault(post.key, post)
+        plans.append((sub, plan[0], plan[1]))
+
+    # 새 게시물의 합집합에 대해서만 본문/요약을 한 번씩 준비한다
+    needed_count, plan_count = len(needed), len(plan_cache)
+    metrics.cache("plan", hits=len(site_subs) - plan_count, misses=plan_count)
+    enriched, cut_off = enrich_posts(crawler, list(needed.values()))
+    del needed, plan_cache
+    enriched_count = len(enriched)
+    log.info("site.enriched", "새 게시물 %d개 준비 완료 %d개, 커서 종류 %d개", needed_count, enriched_count, plan_count)
+
+    # 게시물마다 아직 처리하지 않은 구독 중 몇 개가 참조하는지. 0 이 되면 요약 데이터를 바로 놓아서
+    # 그룹이 끝날 때까지 모든 게시물의 payload 를 들고 있지 않는다
+    refs = collections.Counter(
+        post.key for _, new_posts, last_seen in plans if last_seen is not None for post in new_posts
+    )
+
+    # 구독별로는 미리 만든 게시물 데이터에 구독 필드만 붙여서 넘긴다
+    match_cache: Dict[Tuple[str, str], bool] = {}
+    submitted = 0
+    alert_count = 0
+    keyword_lookups = 0
+    unfinished = 0
+    plans.reverse()
+    while plans:
+        sub, new_posts, last_seen = plans.pop()
+        if last_seen is None:
+            continue
+        keys = [post.key for post in new_posts]
+        # 본문 요청 실패/예산 초과로 준비하지 못한 게시물이 있으면 커서를 옮기지 않고 다음에 다시 처리
+        ready = all(key in enriched for key in keys)
+        targets = [enriched[key] for key in keys if enriched[key] is not None] if ready else []
+        for key in keys:
+            refs[key] -= 1
+            if not refs[key]:
+                enriched.pop(key, None)
+        if not ready:
+            unfinished += 1
             continue
+        try:
+            alerts = build_alerts(sub, targets, match_cache)
+            delivery.submit(sub["id"], alerts, last_seen, site_key=site_url)
+        except Exception as e:
+            log.error("subscription.error", "처리 중 오류: %s", e, subscription_id=sub["id"])
+            continue
+        submitted += 1
+        alert_count += len(alerts)
+        if sub.get("keyword"):
+            keyword_lookups += len(alerts)
+
+    # 키워드 매칭은 (키워드, 게시물)마다 처음 한 번만 계산된다 (match_cache 항목 수 = 미스)
+    metrics.cache("keyword_match", hits=keyword_lookups - len(match_cache), misses=len(match_cache))
+    metrics.add("posts_enriched", enriched_count)
+    metrics.add("alerts", alert_count)
+    metrics.add("subscriptions_submitted", submitted)
+    metrics.add("subscriptions_unfinished", unfinished)
+    log.info("site.done", "site_url=%s 구독 %d개에 알림 %d개 전달%s", site_url, submitted, alert_count,
+             f", 다음에 다시 처리할 구독 {unfinished}개" if unfinished else "")
+    if cut_off is not None:
+        raise cut_off
+    return posts
+
+
+def iter_site_groups(subs: Iterable[Dict]) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    site_url 순으로 정렬된 구독 스트림을 (정규화한 site_url, 구독 목록) 그룹으로 묶어서 바로바로 내보낸다.
+    같은 사이트는 목록 크롤링을 한 번만 수행하고 결과를 공유한다.
 
-        # 상세 본문/요약도 여러 구독에서 공유할 수 있도록 캐시
-        content_cache: Dict[str, str] = {}
-        summary_cache: Dict[str, str] = {}
+    정규화한 site_url 이 바뀌는 순간 이전 그룹을 내보내므로, 전체 구독 목록이 도착하기 전에
+    첫 사이트 처리를 시작할 수 있고 메모리에는 한 그룹만 유지된다.
+    (백엔드가 정렬을 지원하지 않거나, 표기가 다른 URL 이 정렬상 떨어져 있으면(http/https 등)
+     같은 사이트가 여러 그룹으로 나뉠 수 있지만, 결과는 동일하다. 스냅샷 모드는 항상 한 그룹으로 합친다)
+    """
+    current_key: Optional[str] = None
+    current: List[Dict] = []
+    for sub in subs:
+        site_key = canonical_url(sub["site_url"])
+        if site_key != current_key and current:
+            yield current_key, current
+            current = []
+        current_key = site_key
+        current.append(sub)
+    if current:
+        yield current_key, current
+
+
+def count_merged_urls(site_subs: List[Dict]) -> int:
+    """그룹 안에서 정규화로 합쳐진 (표기가 다른) site_url 수. 모두 같은 표기면 0"""
+    return len({sub["site_url"] for sub in site_subs}) - 1
+
+
+def open_delivery(on_cursor_committed=None):
+    """
+    알림/커서 전송 단계를 만든다.
+    - OUTBOX_PATH 가 설정되어 있으면(기본값) 로컬 durable outbox + 백그라운드 flusher
+    - OUTBOX_PATH="" 이면 메모리 내 배치 전송
+    on_cursor_committed(subscription_id, last_seen_post_id) 는 커서가 백엔드에 반영될 때 호출된다.
+    """
+    if OUTBOX_PATH:
+        outbox = Outbox(OUTBOX_PATH, on_cursor_committed=on_cursor_committed).start()
+        # 이전 실행에서 남은 알림/커서를 먼저 보내서 백엔드의 last_seen 을 최신으로 맞춘다.
+        outbox.drain(timeout=deadline.cap(OUTBOX_DRAIN_TIMEOUT))
+        return outbox
+    return BatchedDelivery(on_cursor_committed=on_cursor_committed)
+
+
+def iter_groups(snapshot: Optional[SubscriptionSnapshot]) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    처리할 사이트 그룹을 반환한다.
+    - 스냅샷이 있으면 변경분만 동기화한 뒤, 스냅샷이 유지하는 그룹 인덱스를 그대로 사용
+    - 없으면 구독 목록을 페이지 단위로 스트리밍하며 그룹이 완성되는 대로 반환
+    """
+    if snapshot is not None:
+        snapshot.sync()
+        return snapshot.iter_groups()
+    return iter_site_groups(iter_subscriptions())
+
+
+def check_run_deadline() -> None:
+    """실행 마감이 스케줄 간격/사이트 임대 TTL 과 맞지 않으면 경고한다. (겹치는 실행, 처리 중 임대 만료)"""
+    run_deadline = deadline.RUN_DEADLINE_SECONDS
+    if run_deadline <= 0:
+        log.warning("config.run_deadline", "RUN_DEADLINE_SECONDS=0 (제한 없음): 느린 사이트가 다음 실행과 겹칠 수 있습니다")
+        return
+    if run_deadline >= deadline.SCHEDULE_INTERVAL_SECONDS:
+        log.warning("config.run_deadline", "RUN_DEADLINE_SECONDS(%g) 가 스케줄 간격(%g)보다 짧지 않습니다",
+                    run_deadline, deadline.SCHEDULE_INTERVAL_SECONDS)
+    if SITE_LOCK_TTL < run_deadline:
+        log.warning("config.run_deadline", "SITE_LOCK_TTL(%g) 이 RUN_DEADLINE_SECONDS(%g) 보다 짧습니다 "
+                    "(갱신이 밀리면 처리 중에 임대가 풀릴 수 있음)", SITE_LOCK_TTL, run_deadline)
+
+
+def main():
+    check_run_deadline()
+    # 실행 전체를 RUN_DEADLINE_SECONDS 안에 끝낸다. (스케줄러의 다음 실행과 겹치지 않도록)
+    with deadline.budget(deadline.RUN_DEADLINE_SECONDS):
+        run()
+
+
+def run():
+    # 여러 워커로 나눠 돌릴 때는 consistent hash 로 자기 샤드의 사이트 그룹만 처리한다
+    shard, lease = shard_from_env()
+    if shard is None:
+        log.warning("shard.none", "맡을 샤드가 없어 종료합니다")
+        return
+
+    snapshot = None
+    if SUBSCRIPTION_SNAPSHOT_PATH:
+        snapshot = SubscriptionSnapshot.load(SUBSCRIPTION_SNAPSHOT_PATH)
+
+    # 실행이 임대 TTL 보다 길어져도 같은 샤드 번호가 다른 워커에게 넘어가지 않도록 실행 내내 임대를 갱신한다
+    lease_changed = lease.start_heartbeat() if lease is not None else None
+    delivery = open_delivery(snapshot.update_last_seen if snapshot else None)
+    # 이전 실행이 아직 처리 중인(또는 구독 목록을 받은 뒤에 처리를 끝낸) 사이트 그룹은 건너뛴다
+    site_locker = open_site_locker()
+    run_started = time.time()
+
+    try:
+        total_subs = 0
+        total_groups = 0
+        skipped_groups = 0
+        unknown_groups = 0
+        merged_groups = 0
+        merged_urls = 0
+        cut_off: List[str] = []
+        failed: List[str] = []
+        # 마지막 outbox 전송에 쓸 시간을 남겨 두고 사이트 처리를 멈춘다
+        with deadline.reserve(OUTBOX_DRAIN_TIMEOUT):
+            for site_url, site_subs in shard.filter_groups(iter_groups(snapshot)):
+                if deadline.expired():
+                    log.warning("run.deadline", "실행 마감 시간이 되어 남은 사이트 그룹은 다음 실행에서 처리합니다")
+                    break
+                if lease_changed is not None and lease_changed.is_set():
+                    # 샤드가 바뀌었으면 남은 그룹은 이제 다른 워커의 몫이다 (이미 처리한 그룹의 전달은 마저 끝낸다)
+                    log.warning("shard.lost", "샤드 임대를 잃거나 샤드가 바뀌어 남은 사이트 그룹을 처리하지 않습니다: %s",
+                                lease.assignment)
+                    break
+                # 임대는 커서가 전달된 뒤(delivery.close 이후)에 한꺼번에 놓는다
+                if not site_locker.acquire(site_url, fresh_since=run_started):
+                    log.info("site.locked", "다른 실행이 처리 중이거나 방금 처리한 사이트라 건너뜁니다: %s", site_url)
+                    skipped_groups += 1
+                    continue
+                total_subs += len(site_subs)
+                total_groups += 1
+                merged = count_merged_urls(site_subs)
+                if merged:
+                    merged_groups += 1
+                    merged_urls += merged
+                    variants = sorted({sub["site_url"] for sub in site_subs})
+                    log.info("site.merged", "표기가 다른 URL %d개를 한 그룹으로 처리합니다: %s ← %s",
+                             len(variants), site_url, variants)
+                try:
+                    process_site_group(site_url, site_subs, delivery)
+                except registry.UnknownSiteError as e:
+                    log.warning("site.unknown", "%s (구독 %d개, 건너뜀)", e, len(site_subs))
+                    unknown_groups += 1
+                    metrics.add("site_groups_unknown")
+                except deadline.DeadlineExceeded as e:
+                    log.warning("site.cut_off", "시간 예산을 넘겨 중단합니다 (남은 구독의 커서는 유지): site_url=%s (%s)",
+                                site_url, e)
+                    cut_off.append(site_url)
+                    metrics.add("site_groups_cut_off")
+                except Exception as e:
+                    # 사이트 하나의 오류(HTTPError, 파서 예외 등)로 남은 그룹을 건너뛰지 않는다.
+                    # 잘린 그룹처럼 끝내지 못한 구독의 커서는 옮기지 않으므로 다음 실행에서 다시 처리한다
+                    log.error("site.error", "사이트 그룹 처리 중 오류 (남은 구독의 커서는 유지): site_url=%s (%s: %s)",
+                              site_url, type(e).__name__, e, exc_info=True)
+                    failed.append(site_url)
+                    metrics.add("site_groups_failed")
+        log.info("run.summary", "총 구독 수: %d (사이트 그룹 %d개, 건너뜀 %d개, 지원하지 않는 사이트 %d개, 샤드 %d/%d)",
+                 total_subs, total_groups, skipped_groups, unknown_groups, shard.index, shard.count)
+        if merged_groups:
+            log.info("run.merged", "URL 정규화로 합친 그룹 %d개 (목록 크롤링 %d회 절약)", merged_groups, merged_urls)
+        if cut_off:
+            log.warning("run.cut_off", "시간 예산 초과로 중단된 사이트 그룹 %d개: %s", len(cut_off), cut_off)
+        if failed:
+            log.error("run.failed", "오류로 중단된 사이트 그룹 %d개: %s", len(failed), failed)
+    finally:
+        delivery.close(timeout=deadline.cap(OUTBOX_DRAIN_TIMEOUT))
+        site_locker.close()
+        if snapshot is not None:
+            snapshot.save()
+        if lease is not None:
+            lease.release()
+        # 백엔드 전송(close)까지 끝난 뒤의 값으로 실행 리포트를 남긴다
+        metrics.print_summary()
+        metrics.write_outputs()
 
-        for sub in site_subs:
-            try:
-                process_subscription(sub, crawler, posts, content_cache, summary_cache)
-            except Exception as e:
-                sub_id = sub.get('id', 'unknown') if 'sub' in locals() else 'unknown'
-                print(f"[Sub {sub_id}] 처리 중 오류: {e}")
 
 if __name__ == "__main__":
     main()
-
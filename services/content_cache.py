@@ -0,0 +1,155 @@
+"""
+게시물 본문 캐시 (프로세스 안, 크기 상한 + LRU + 압축).
+
+본문(파싱한 텍스트)은 받자마자 여기에 넣고, 요약/알림을 만들 때 게시물마다 꺼내 쓴다.
+그룹의 본문 전체를 dict 로 들고 있지 않으므로 게시물이 한꺼번에 많이 올라와도(백필) 메모리가 상한을 넘지 않고,
+같은 프로세스에서 같은 게시물을 다시 처리할 때(데몬의 다음 폴링, 예산 초과로 중단된 그룹 재처리 등) 본문을 다시 받지 않는다.
+
+- 최근에 쓴 항목은 str 그대로 두고(hot), CONTENT_CACHE_HOT_BYTES 를 넘는 오래된 항목은 zlib 으로 압축해 둔다(cold).
+  cold 항목을 꺼내면 압축을 풀어 다시 hot 으로 올린다.
+- 전체(hot + cold)가 CONTENT_CACHE_MAX_BYTES 를 넘으면 가장 오래 안 쓴 항목부터 버린다.
+  크기는 sys.getsizeof 기준(실제 차지하는 메모리)이다.
+- 버림/압축 횟수와 바이트는 content_cache_* 카운터로 남는다.
+  적중/미스(metrics.cache("content"))는 본문 요청을 건너뛰었는지 기준으로 호출하는 쪽(main.fetch_contents)에서 센다.
+
+환경 변수
+- CONTENT_CACHE_MAX_BYTES: 전체 상한 (기본 64 MiB)
+- CONTENT_CACHE_HOT_BYTES: 압축하지 않고 둘 최근 항목 크기 (기본 8 MiB)
+- CONTENT_CACHE_COMPRESS_LEVEL: zlib 압축 수준 1~9 (기본 1, 본문 텍스트는 1 로도 3~4배 줄어든다)
+"""
+import collections
+import os
+import sys
+import threading
+import zlib
+from typing import Dict, Optional
+
+from services import metrics
+
+CONTENT_CACHE_MAX_BYTES = int(os.environ.get("CONTENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CONTENT_CACHE_HOT_BYTES = int(os.environ.get("CONTENT_CACHE_HOT_BYTES", str(8 * 1024 * 1024)))
+CONTENT_CACHE_COMPRESS_LEVEL = int(os.environ.get("CONTENT_CACHE_COMPRESS_LEVEL", "1"))
+
+
+class ContentCache:
+    """키(Post.key) → 본문 텍스트. 스레드 안전"""
+
+    def __init__(
+        self,
+        max_bytes: int = CONTENT_CACHE_MAX_BYTES,
+        hot_bytes: int = CONTENT_CACHE_HOT_BYTES,
+        level: int = CONTENT_CACHE_COMPRESS_LEVEL,
+    ):
+        self.max_bytes = max_bytes
+        self.hot_bytes = min(hot_bytes, max_bytes)
+        self.level = level
+        # 둘 다 앞쪽이 오래된 항목. hot 의 가장 오래된 항목이 cold 의 가장 최근 항목보다 최근이다
+        self._hot: "collections.OrderedDict[str, str]" = collections.OrderedDict()
+        self._cold: "collections.OrderedDict[str, bytes]" = collections.OrderedDict()
+        self._hot_size = 0
+        self._cold_size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._hot) + len(self._cold)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._hot or key in self._cold
+
+    @property
+    def size(self) -> int:
+        return self._hot_size + self._cold_size
+
+    def get(self, key: str) -> Optional[str]:
+        """본문. 없으면 None"""
+        with self._lock:
+            text = self._hot.get(key)
+            if text is not None:
+                self._hot.move_to_end(key)
+            else:
+                data = self._cold.pop(key, None)
+                if data is not None:
+                    self._cold_size -= sys.getsizeof(data)
+                    text = zlib.decompress(data).decode("utf-8")
+                    self._add_hot(key, text)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        with self._lock:
+            self._discard(key)
+            self._add_hot(key, text)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hot.clear()
+            self._cold.clear()
+            self._hot_size = self._cold_size = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._hot) + len(self._cold),
+                "hot_entries": len(self._hot),
+                "hot_bytes": self._hot_size,
+                "cold_entries": len(self._cold),
+                "cold_bytes": self._cold_size,
+                "max_bytes": self.max_bytes,
+            }
+
+    # 아래는 self._lock 을 잡은 상태에서 호출
+
+    def _discard(self, key: str) -> None:
+        text = self._hot.pop(key, None)
+        if text is not None:
+            self._hot_size -= sys.getsizeof(text)
+        data = self._cold.pop(key, None)
+        if data is not None:
+            self._cold_size -= sys.getsizeof(data)
+
+    def _add_hot(self, key: str, text: str) -> None:
+        self._hot[key] = text
+        self._hot_size += sys.getsizeof(text)
+        # 오래된 hot 항목은 압축해서 cold 로 (가장 최근에 넣은 항목은 상한을 넘어도 hot 에 둔다)
+        while self._hot_size > self.hot_bytes and len(self._hot) > 1:
+            old_key, old_text = self._hot.popitem(last=False)
+            self._hot_size -= sys.getsizeof(old_text)
+            data = zlib.compress(old_text.encode("utf-8"), self.level)
+            self._cold[old_key] = data
+            self._cold_size += sys.getsizeof(data)
+            metrics.add("content_cache_compressions")
+            metrics.add("content_cache_compressed_bytes", len(data))
+        # 상한을 넘으면 가장 오래 안 쓴 항목부터 버린다 (방금 넣은 항목 하나는 남긴다)
+        while self.size > self.max_bytes and len(self) > 1:
+            if self._cold:
+                _, data = self._cold.popitem(last=False)
+                freed = sys.getsizeof(data)
+                self._cold_size -= freed
+            else:
+                _, old_text = self._hot.popitem(last=False)
+                freed = sys.getsizeof(old_text)
+                self._hot_size -= freed
+            metrics.add("content_cache_evictions")
+            metrics.add("content_cache_evicted_bytes", freed)
+
+
+_cache = ContentCache()
+
+
+def get(key: str) -> Optional[str]:
+    return _cache.get(key)
+
+
+def put(key: str, text: str) -> None:
+    _cache.put(key, text)
+
+
+def contains(key: str) -> bool:
+    return key in _cache
+
+
+def clear() -> None:
+    _cache.clear()
+
+
+def stats() -> Dict:
+    return _cache.stats()
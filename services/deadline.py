@@ -0,0 +1,105 @@
+"""
+실행 마감 시간(deadline)과 사이트별 시간 예산.
+
+느리거나 응답이 없는 사이트 하나(SSL 재시도 + 백오프, 타임아웃 없는 요청 등)가
+순차 실행 전체를 붙잡지 않도록, 현재 작업의 마감 시각을 contextvar 로 들고 다닌다.
+- budget(초) 블록 안에서는 마감이 min(바깥 마감, 지금 + 초) 로 줄어든다.
+  (main: 실행 전체 RUN_DEADLINE_SECONDS → process_site_group: 사이트당 SITE_BUDGET_SECONDS)
+- HTTP 요청 타임아웃/재시도 백오프(sites/http_session.py)와 요약 대기(services/summarizer.py)가
+  남은 시간을 넘지 않도록 자르고, 마감이 지나면 DeadlineExceeded 를 던진다.
+- 마감 시각은 time.monotonic() 기준이다.
+"""
+import contextlib
+import contextvars
+import os
+import time
+from typing import Iterator, Optional
+
+# 원샷 실행(main.py)을 띄우는 스케줄러의 실행 간격(초). 기본 10분
+SCHEDULE_INTERVAL_SECONDS = float(os.environ.get("SCHEDULE_INTERVAL_SECONDS", "600"))
+# 실행 전체 마감(초). 기본은 스케줄 간격보다 1분 짧게 잡아 다음 실행과 겹치지 않게 한다. 0 이면 제한 없음
+RUN_DEADLINE_SECONDS = float(os.environ.get("RUN_DEADLINE_SECONDS", str(max(SCHEDULE_INTERVAL_SECONDS - 60, 60))))
+# 사이트 그룹 하나(목록/본문/재시도/요약 포함)에 쓸 수 있는 최대 시간(초). 0 이면 제한 없음
+SITE_BUDGET_SECONDS = float(os.environ.get("SITE_BUDGET_SECONDS", "300"))
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """마감 시간이 지나 작업을 중단한다. 잘린 작업의 커서는 옮기지 않는다."""
+
+
+@contextlib.contextmanager
+def budget(seconds: Optional[float]) -> Iterator[None]:
+    """
+    블록 안의 마감을 지금부터 seconds 초 뒤로 줄인다. (바깥 마감보다 늘어나지는 않음)
+    seconds 가 None 이거나 0 이하이면 바깥 마감을 그대로 쓴다.
+    """
+    current = _deadline.get()
+    if seconds is None or seconds <= 0:
+        yield
+        return
+    at = time.monotonic() + seconds
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextlib.contextmanager
+def reserve(seconds: float) -> Iterator[None]:
+    """
+    블록 안의 마감을 현재 마감보다 seconds 초 앞당긴다. (정리 작업에 쓸 시간을 남겨 둠)
+    마감이 없으면 아무것도 하지 않는다.
+    """
+    current = _deadline.get()
+    if current is None:
+        yield
+        return
+    token = _deadline.set(current - seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """남은 시간(초). 마감이 없으면 None, 지났으면 0 이하."""
+    current = _deadline.get()
+    if current is None:
+        return None
+    return current - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check(what: str = "") -> None:
+    """마감이 지났으면 DeadlineExceeded 를 던진다."""
+    if expired():
+        raise DeadlineExceeded(f"마감 시간 초과: {what}" if what else "마감 시간 초과")
+
+
+def cap(seconds: float) -> float:
+    """seconds 와 남은 시간 중 작은 값 (0 이상). 마감이 지나도 예외를 던지지 않는다."""
+    left = remaining()
+    if left is None:
+        return seconds
+    return max(0.0, min(seconds, left))
+
+
+def request_timeout(seconds: float, what: str = "") -> float:
+    """요청 타임아웃으로 쓸 값. 남은 시간보다 길지 않게 자르고, 마감이 지났으면 DeadlineExceeded."""
+    check(what)
+    return cap(seconds)
+
+
+def sleep(seconds: float, what: str = "") -> None:
+    """seconds 초 쉰다. 쉬고 나면 마감을 넘기는 경우엔 쉬지 않고 DeadlineExceeded 를 던진다."""
+    left = remaining()
+    if left is not None and left < seconds:
+        raise DeadlineExceeded(f"대기 {seconds:.0f}s 가 남은 시간 {max(0.0, left):.0f}s 보다 깁니다: {what}")
+    time.sleep(seconds)
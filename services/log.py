@@ -0,0 +1,196 @@
+"""
+단계/수준이 있는 구조화 로그 (JSON lines) + 메시지 종류별 샘플링.
+
+구독/게시물마다 찍던 print(게시글 ID 목록, 요약 미리보기 등)는 아무도 보지 않을 때도 문자열을 만들고,
+구독 수가 많으면 CloudWatch 로그 양이 커진다. 여기서는
+- 수준(debug/info/warning/error)에 걸러지는 로그는 메시지를 만들지 않는다. (msg % args 와 필드 계산을 출력할 때만)
+- 이벤트(메시지 종류) 이름마다 N개 중 1개만 출력하도록 샘플링할 수 있다.
+- context() 로 지정한 필드(site, subscription_id 등)가 그 안의 모든 로그에 붙는다.
+
+환경 변수
+- LOG_LEVEL: debug | info | warning | error (기본 info)
+- LOG_FORMAT: text | json (기본 text. 컨테이너에서는 json 으로 설정 — Dockerfile)
+  text: "[이벤트] 메시지 context필드=값 ... 필드=값 ..."  /  json: {"ts", "level", "event", "msg", context 필드, 필드...}
+- LOG_DEBUG_SITES: 쉼표로 구분한 사이트 키(정규화한 site_url) 또는 호스트. 이 사이트를 처리하는 동안에는
+  LOG_LEVEL 과 관계없이 debug 로그도 출력한다. (운영에서 특정 사이트만 자세히 볼 때)
+- LOG_SAMPLE: "이벤트=비율,..." (예: "post.summary_preview=0.01,filter_new_posts=0.1")
+  이벤트 이름 또는 첫 "." 앞부분(분류)으로 찾는다. 비율 r 이면 1/r 개마다 하나를 출력하고 "sample": 1/r 필드를 붙인다.
+  warning 이상은 샘플링하지 않는다. 비율 0 이면 그 이벤트는 끈다. (enabled(level, event) 도 False)
+
+사용 예:
+    log.info("site.start", "site_url=%s, 구독 %d개", site_url, len(subs))
+    log.debug("filter_new_posts", "현재 페이지 게시글 ID", post_ids=lambda: [p.id for p in posts[:5]])
+    with log.context(site=site_url):
+        ...
+필드 값이 callable 이면 출력할 때만 호출한다.
+except 블록에서 exc_info=True 를 주면 처리 중인 예외의 traceback 을 붙인다. (json: "exc" 필드, text: 다음 줄부터)
+"""
+import contextlib
+import contextvars
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+_LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+_NAMES = {value: name for name, value in _LEVELS.items()}
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "info").strip().lower()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text").strip().lower()
+LOG_DEBUG_SITES = os.environ.get("LOG_DEBUG_SITES", "")
+LOG_SAMPLE = os.environ.get("LOG_SAMPLE", "")
+
+_EMPTY: Dict = {}
+_context: contextvars.ContextVar[Dict] = contextvars.ContextVar("log_context", default=_EMPTY)
+_write_lock = threading.Lock()
+_counters: Dict[str, "itertools.count"] = {}
+
+
+def _parse_sample(spec: str) -> Dict[str, int]:
+    """ "이벤트=비율,..." → {이벤트: N개 중 1개} """
+    every: Dict[str, int] = {}
+    for item in spec.split(","):
+        name, _, rate = item.partition("=")
+        if not name.strip() or not rate.strip():
+            continue
+        try:
+            value = float(rate)
+        except ValueError:
+            warning("log.sample_invalid", "LOG_SAMPLE 항목을 무시합니다: %s", item)
+            continue
+        every[name.strip()] = 0 if value <= 0 else max(1, round(1 / value))
+    return every
+
+
+_threshold = _LEVELS.get(LOG_LEVEL, INFO)
+_debug_sites = frozenset(s.strip().lower() for s in LOG_DEBUG_SITES.split(",") if s.strip())
+_sample_every: Dict[str, int] = {}
+
+
+@contextlib.contextmanager
+def context(**fields) -> Iterator[None]:
+    """블록 안에서 남기는 로그에 fields 를 붙인다. (중첩하면 합쳐짐)"""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def _site_debug() -> bool:
+    site = _context.get().get("site")
+    if not site:
+        return False
+    site = str(site).lower()
+    return site in _debug_sites or (urlsplit(site).hostname or "") in _debug_sites
+
+
+def _every(event: str, level: int) -> int:
+    """이벤트의 샘플 간격 (1 = 전부, 0 = 끔)"""
+    if level >= WARNING or not _sample_every:
+        return 1
+    every = _sample_every.get(event)
+    if every is None:
+        every = _sample_every.get(event.partition(".")[0], 1)
+    return every
+
+
+def enabled(level: int, event: str = "") -> bool:
+    """
+    이 수준(과 이벤트)의 로그가 출력되는지. 메시지를 만들기 비싼 경우 미리 확인용.
+    event 를 주면 LOG_SAMPLE 로 끈(비율 0) 이벤트도 False. 1/N 샘플링에서 이번 차례인지는 반영하지 않는다.
+    """
+    if level < _threshold and not (_debug_sites and _site_debug()):
+        return False
+    return not event or _every(event, level) != 0
+
+
+def _sample(event: str, level: int) -> Optional[int]:
+    """출력하면 샘플 간격(1 = 전부), 이번 것은 건너뛰면 None"""
+    every = _every(event, level)
+    if every == 1:
+        return 1
+    if every == 0:
+        return None
+    counter = _counters.get(event)
+    if counter is None:
+        counter = _counters.setdefault(event, itertools.count())
+    return every if next(counter) % every == 0 else None
+
+
+def _format_exc(exc_info) -> Optional[str]:
+    """exc_info=True 면 처리 중인 예외, 예외 객체면 그 예외의 traceback 문자열"""
+    import traceback
+
+    if isinstance(exc_info, BaseException):
+        return "".join(traceback.format_exception(type(exc_info), exc_info, exc_info.__traceback__)).rstrip()
+    if exc_info and sys.exc_info()[0] is not None:
+        return traceback.format_exc().rstrip()
+    return None
+
+
+def _emit(level: int, event: str, msg: str, args: tuple, fields: Dict) -> None:
+    if not enabled(level, event):
+        return
+    every = _sample(event, level)
+    if every is None:
+        return
+    exc = _format_exc(fields.pop("exc_info")) if "exc_info" in fields else None
+    if args:
+        try:
+            msg = msg % args
+        except (TypeError, ValueError):
+            msg = f"{msg} {args}"
+    values = {key: value() if callable(value) else value for key, value in fields.items()}
+    if LOG_FORMAT == "json":
+        now = time.time()
+        record = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)) + f".{int(now % 1 * 1000):03d}Z",
+            "level": _NAMES[level],
+            "event": event,
+            "msg": msg,
+            **_context.get(),
+            **values,
+        }
+        if every > 1:
+            record["sample"] = every
+        if exc:
+            record["exc"] = exc
+        line = json.dumps(record, ensure_ascii=False, default=str)
+    else:
+        line = f"[{event}] {msg}"
+        pairs = {**_context.get(), **values}
+        if pairs:
+            line += " " + " ".join(f"{key}={value}" for key, value in pairs.items())
+        if exc:
+            line += "\n" + exc
+    with _write_lock:
+        sys.stdout.write(line + "\n")
+
+
+def debug(event: str, msg: str, *args, **fields) -> None:
+    _emit(DEBUG, event, msg, args, fields)
+
+
+def info(event: str, msg: str, *args, **fields) -> None:
+    _emit(INFO, event, msg, args, fields)
+
+
+def warning(event: str, msg: str, *args, **fields) -> None:
+    _emit(WARNING, event, msg, args, fields)
+
+
+def error(event: str, msg: str, *args, **fields) -> None:
+    _emit(ERROR, event, msg, args, fields)
+
+
+# 잘못된 항목을 warning() 으로 알릴 수 있도록 함수들을 정의한 뒤에 읽는다
+_sample_every = _parse_sample(LOG_SAMPLE)
@@ -0,0 +1,337 @@
+"""
+단계별 처리 시간 / 캐시 적중률 / 전송 바이트 계측과 실행 리포트.
+
+print 로그만으로는 느린 실행이 목록 요청, 본문 요청, 파싱, 요약(대기 포함), 백엔드 전송 중
+어디서 시간을 썼는지 알 수 없으므로, 단계(stage) × 사이트별 히스토그램으로 모은다.
+
+- timed(stage): 블록(또는 데코레이터로 감싼 함수)의 소요 시간을 기록한다. 예외로 끝나면 오류 수도 센다.
+- site(site_key): 블록 안에서 기록하는 값의 사이트 라벨 (process_site_group 이 설정. 없으면 "-")
+- cache(name, hits, misses): 캐시 적중/미스 수
+- add(name, value): 카운터 (전송 바이트, 알림 수 등)
+- write_outputs(): 실행 리포트(JSON, METRICS_REPORT_PATH)와 Prometheus textfile(METRICS_PROM_PATH)을 쓴다.
+  리포트에는 단계별 p50/p90/p95/p99 가 들어가므로 SLO 기준을 정하는 데 쓸 수 있다.
+  (분위수는 히스토그램 버킷 안에서 선형 보간한 추정값이다. Prometheus 의 histogram_quantile 과 같은 방식)
+
+값은 프로세스 안에서 누적된다. (데몬 모드에서는 시작 이후 누적, Prometheus counter/histogram 의미와 같음)
+"""
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from services import log
+
+# 실행 리포트(JSON) 경로. "" 이면 쓰지 않음
+METRICS_REPORT_PATH = os.environ.get("METRICS_REPORT_PATH", "run_report.json")
+# node_exporter textfile collector 용 Prometheus 텍스트 파일 경로. "" 이면 쓰지 않음 (기본)
+METRICS_PROM_PATH = os.environ.get("METRICS_PROM_PATH", "")
+
+# 히스토그램 버킷 상한(초). 요약 대기/429 백오프와 사이트 예산까지 담도록 긴 구간을 둔다.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+NO_SITE = "-"
+
+_site: contextvars.ContextVar[str] = contextvars.ContextVar("metrics_site", default=NO_SITE)
+
+_lock = threading.Lock()
+_histograms: Dict[Tuple[str, str], "Histogram"] = {}
+_caches: Dict[Tuple[str, str], List[int]] = {}     # (이름, 사이트) → [적중, 미스]
+_counters: Dict[Tuple[str, str], float] = {}
+_started_at = time.time()
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (BUCKETS + 마지막 +Inf 버킷)"""
+
+    __slots__ = ("buckets", "count", "sum", "max", "errors")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+    def observe(self, seconds: float) -> None:
+        index = len(BUCKETS)
+        for i, upper in enumerate(BUCKETS):
+            if seconds <= upper:
+                index = i
+                break
+        self.buckets[index] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "Histogram") -> None:
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        self.errors += other.errors
+
+    def quantile(self, q: float) -> float:
+        """q 분위수 추정값. 해당 버킷 안에서 선형 보간하고, +Inf 버킷이면 관측 최댓값"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if seen + n >= rank and n:
+                if i == len(BUCKETS):
+                    return self.max
+                lower = BUCKETS[i - 1] if i else 0.0
+                upper = min(BUCKETS[i], self.max)
+                if upper <= lower:
+                    return upper
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.max
+
+    def summary(self) -> Dict:
+        result = {
+            "count": self.count,
+            "errors": self.errors,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+        }
+        for q in QUANTILES:
+            result[f"p{round(q * 100)}"] = round(self.quantile(q), 6)
+        return result
+
+
+@contextlib.contextmanager
+def site(site_key: str) -> Iterator[None]:
+    """블록 안에서 기록하는 값에 사이트 라벨을 붙인다."""
+    token = _site.set(site_key or NO_SITE)
+    try:
+        yield
+    finally:
+        _site.reset(token)
+
+
+def _histogram(stage: str) -> Histogram:
+    # _lock 을 잡은 상태에서 호출
+    key = (stage, _site.get())
+    hist = _histograms.get(key)
+    if hist is None:
+        hist = _histograms[key] = Histogram()
+    return hist
+
+
+def observe(stage: str, seconds: float, error: bool = False) -> None:
+    with _lock:
+        hist = _histogram(stage)
+        hist.observe(seconds)
+        if error:
+            hist.errors += 1
+
+
+def error(stage: str) -> None:
+    """소요 시간을 알 수 없는 실패(다른 프로세스에서 난 예외 등)를 오류 수로만 센다."""
+    with _lock:
+        _histogram(stage).errors += 1
+
+
+@contextlib.contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """
+    블록의 소요 시간을 stage 히스토그램에 기록한다. 예외로 끝나면 오류 수도 센다. (예외는 그대로 전달)
+    contextlib.contextmanager 라서 @timed("stage") 데코레이터로도 쓸 수 있다.
+    """
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        observe(stage, time.perf_counter() - started, failed)
+
+
+def cache(name: str, hits: int = 0, misses: int = 0) -> None:
+    """캐시 적중/미스 수를 더한다. (조회마다 부르지 않고 묶어서 한 번에 넘겨도 된다)"""
+    if not hits and not misses:
+        return
+    key = (name, _site.get())
+    with _lock:
+        entry = _caches.get(key)
+        if entry is None:
+            entry = _caches[key] = [0, 0]
+        entry[0] += hits
+        entry[1] += misses
+
+
+def add(name: str, value: float = 1) -> None:
+    """카운터에 value 를 더한다."""
+    if not value:
+        return
+    key = (name, _site.get())
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def reset() -> None:
+    """모든 값을 지운다. (벤치마크/도구에서 측정 구간을 나눌 때)"""
+    global _started_at
+    with _lock:
+        _histograms.clear()
+        _caches.clear()
+        _counters.clear()
+        _started_at = time.time()
+
+
+def report() -> Dict:
+    """
+    현재까지의 값을 JSON 으로 쓸 수 있는 dict 로 만든다.
+    stages: {단계: {"all": 전체 요약, "sites": {사이트: 요약}}}  (초 단위)
+    caches: {캐시: {"hits", "misses", "hit_ratio", "sites": {...}}}
+    counters: {이름: {"total", "sites": {...}}}
+    """
+    with _lock:
+        histograms = {key: _copy(hist) for key, hist in _histograms.items()}
+        caches = {key: list(entry) for key, entry in _caches.items()}
+        counters = dict(_counters)
+        started_at = _started_at
+
+    stages: Dict[str, Dict] = {}
+    totals: Dict[str, Histogram] = {}
+    for (stage, site_key), hist in sorted(histograms.items()):
+        totals.setdefault(stage, Histogram()).merge(hist)
+        stages.setdefault(stage, {"sites": {}})["sites"][site_key] = hist.summary()
+    for stage, hist in totals.items():
+        stages[stage]["all"] = hist.summary()
+
+    cache_report: Dict[str, Dict] = {}
+    for (name, site_key), (hits, misses) in sorted(caches.items()):
+        entry = cache_report.setdefault(name, {"hits": 0, "misses": 0, "sites": {}})
+        entry["hits"] += hits
+        entry["misses"] += misses
+        entry["sites"][site_key] = {"hits": hits, "misses": misses, "hit_ratio": _ratio(hits, misses)}
+    for entry in cache_report.values():
+        entry["hit_ratio"] = _ratio(entry["hits"], entry["misses"])
+
+    counter_report: Dict[str, Dict] = {}
+    for (name, site_key), value in sorted(counters.items()):
+        entry = counter_report.setdefault(name, {"total": 0, "sites": {}})
+        entry["total"] += value
+        entry["sites"][site_key] = value
+
+    now = time.time()
+    return {
+        "started_at": started_at,
+        "generated_at": now,
+        "duration_seconds": round(now - started_at, 3),
+        "buckets": list(BUCKETS),
+        "stages": stages,
+        "caches": cache_report,
+        "counters": counter_report,
+    }
+
+
+def _copy(hist: Histogram) -> Histogram:
+    copied = Histogram()
+    copied.merge(hist)
+    return copied
+
+
+def _ratio(hits: int, misses: int) -> Optional[float]:
+    total = hits + misses
+    return round(hits / total, 4) if total else None
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def prometheus_text() -> str:
+    """Prometheus 텍스트 노출 형식 (crawler_ 접두사)"""
+    with _lock:
+        histograms = {key: _copy(hist) for key, hist in _histograms.items()}
+        caches = {key: list(entry) for key, entry in _caches.items()}
+        counters = dict(_counters)
+
+    lines = [
+        "# HELP crawler_stage_seconds Time spent per crawler stage and site.",
+        "# TYPE crawler_stage_seconds histogram",
+    ]
+    for (stage, site_key), hist in sorted(histograms.items()):
+        labels = f'stage="{_label(stage)}",site="{_label(site_key)}"'
+        cumulative = 0
+        for upper, n in zip(BUCKETS, hist.buckets):
+            cumulative += n
+            lines.append(f'crawler_stage_seconds_bucket{{{labels},le="{upper}"}} {cumulative}')
+        lines.append(f'crawler_stage_seconds_bucket{{{labels},le="+Inf"}} {hist.count}')
+        lines.append(f"crawler_stage_seconds_sum{{{labels}}} {_format_number(hist.sum)}")
+        lines.append(f"crawler_stage_seconds_count{{{labels}}} {hist.count}")
+
+    lines += [
+        "# HELP crawler_stage_errors_total Stage executions that ended with an exception.",
+        "# TYPE crawler_stage_errors_total counter",
+    ]
+    for (stage, site_key), hist in sorted(histograms.items()):
+        lines.append(f'crawler_stage_errors_total{{stage="{_label(stage)}",site="{_label(site_key)}"}} {hist.errors}')
+
+    lines += [
+        "# HELP crawler_cache_lookups_total Cache lookups by result.",
+        "# TYPE crawler_cache_lookups_total counter",
+    ]
+    for (name, site_key), (hits, misses) in sorted(caches.items()):
+        labels = f'cache="{_label(name)}",site="{_label(site_key)}"'
+        lines.append(f'crawler_cache_lookups_total{{{labels},result="hit"}} {hits}')
+        lines.append(f'crawler_cache_lookups_total{{{labels},result="miss"}} {misses}')
+
+    for name in sorted({name for name, _ in counters}):
+        metric = f"crawler_{name}_total"
+        lines.append(f"# TYPE {metric} counter")
+        for (counter_name, site_key), value in sorted(counters.items()):
+            if counter_name == name:
+                lines.append(f'{metric}{{site="{_label(site_key)}"}} {_format_number(value)}')
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path: str, text: str) -> None:
+    # textfile collector 가 쓰는 도중의 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체한다
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def print_summary() -> None:
+    """단계별 전체 요약을 한 줄(로그 하나)씩 출력한다."""
+    data = report()
+    for stage, entry in data["stages"].items():
+        s = entry["all"]
+        errors = f" 오류 {s['errors']}" if s["errors"] else ""
+        log.info("metrics.stage", "%s: n=%d p50=%.0fms p95=%.0fms max=%.0fms 합계=%.1fs%s", stage, s["count"],
+                 s["p50"] * 1000, s["p95"] * 1000, s["max"] * 1000, s["sum"], errors)
+    for name, entry in data["caches"].items():
+        if entry["hit_ratio"] is not None:
+            log.info("metrics.cache", "cache %s: 적중률 %.1f%% (%d/%d)", name, entry["hit_ratio"] * 100,
+                     entry["hits"], entry["hits"] + entry["misses"])
+
+
+def write_outputs(report_path: Optional[str] = None, prom_path: Optional[str] = None) -> None:
+    """실행 리포트(JSON)와 Prometheus textfile 을 쓴다. 쓰기에 실패해도 실행은 계속한다."""
+    report_path = METRICS_REPORT_PATH if report_path is None else report_path
+    prom_path = METRICS_PROM_PATH if prom_path is None else prom_path
+    try:
+        if report_path:
+            _write_atomic(report_path, json.dumps(report(), ensure_ascii=False, indent=1))
+        if prom_path:
+            _write_atomic(prom_path, prometheus_text())
+    except OSError as e:
+        log.warning("metrics.write_failed", "리포트를 쓰지 못했습니다: %s", e)
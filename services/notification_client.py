@@ -1,9 +1,105 @@
+import gzip
+import json
 import requests
 import os
-from typing import Dict
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+
+from services import log, metrics
 
 BACKEND_BASE_URL = os.environ.get("BACKEND_BASE_URL", "http://localhost:8080")
 
+# (connect, read) 타임아웃. 백엔드가 멈춰도 크롤러가 무한 대기하지 않도록 한다.
+BACKEND_TIMEOUT = (
+    float(os.environ.get("BACKEND_CONNECT_TIMEOUT", "3")),
+    float(os.environ.get("BACKEND_READ_TIMEOUT", "10")),
+)
+
+# 알림 배치 전송 기준: 이 개수만큼 쌓이거나, 가장 오래된 알림이 이 시간(초)만큼 기다리면 전송
+ALERT_BATCH_SIZE = int(os.environ.get("ALERT_BATCH_SIZE", "100"))
+ALERT_BATCH_MAX_DELAY = float(os.environ.get("ALERT_BATCH_MAX_DELAY", "2.0"))
+
+# last_seen 갱신 배치 크기
+CURSOR_BATCH_SIZE = int(os.environ.get("CURSOR_BATCH_SIZE", "200"))
+
+# 알림 payload 형식
+# - full: 알림마다 content_raw/content_summary 를 모두 포함 (기존 방식)
+# - ref : 게시물 본문은 POST /internal/posts/bulk 로 게시물당 한 번만 올리고,
+#         알림은 post_key 로 게시물을 참조하는 가벼운 payload 만 보낸다.
+ALERT_PAYLOAD_MODE = os.environ.get("ALERT_PAYLOAD_MODE", "full")
+
+# 요청 본문이 이 크기(바이트) 이상이면 gzip 으로 압축해서 보낸다. 0 이하면 압축하지 않음.
+BACKEND_GZIP_MIN_BYTES = int(os.environ.get("BACKEND_GZIP_MIN_BYTES", "1024"))
+
+# 백엔드로 보낸 요청 수/바이트 통계 (bytes_raw: 압축 전 JSON, bytes_sent: 실제 전송 본문)
+transfer_stats = {"requests": 0, "bytes_raw": 0, "bytes_sent": 0}
+_stats_lock = threading.Lock()
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# 백엔드에 bulk 엔드포인트가 없으면(404/405) 이후로는 바로 단건 전송을 사용한다.
+_bulk_supported = True
+_bulk_last_seen_supported = True
+_bulk_posts_supported = True
+# 백엔드가 gzip 본문을 거부하면(415) 이후로는 압축하지 않는다.
+_gzip_supported = True
+
+
+def _get_session() -> requests.Session:
+    """
+    백엔드 호출에 공통으로 쓰는 커넥션 풀 세션 (프로세스당 하나)
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def _send_json(method: str, path: str, payload) -> requests.Response:
+    """
+    JSON 본문을 UTF-8 그대로(ensure_ascii=False) 직렬화해서 보낸다.
+    본문이 BACKEND_GZIP_MIN_BYTES 이상이면 gzip 으로 압축하고 Content-Encoding 을 붙인다.
+    """
+    global _gzip_supported
+
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    headers = {"Content-Type": "application/json; charset=utf-8"}
+    data = body
+    if _gzip_supported and 0 < BACKEND_GZIP_MIN_BYTES <= len(body):
+        data = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+
+    url = f"{BACKEND_BASE_URL}{path}"
+    res = _get_session().request(method, url, data=data, headers=headers, timeout=BACKEND_TIMEOUT)
+    sent = len(data)
+    if res.status_code == 415 and "Content-Encoding" in headers:
+        log.warning("backend.gzip_unsupported", "백엔드가 gzip 본문을 지원하지 않아 압축 없이 보냅니다")
+        _gzip_supported = False
+        del headers["Content-Encoding"]
+        res = _get_session().request(method, url, data=body, headers=headers, timeout=BACKEND_TIMEOUT)
+        sent += len(body)
+
+    with _stats_lock:
+        transfer_stats["requests"] += 1
+        transfer_stats["bytes_raw"] += len(body)
+        transfer_stats["bytes_sent"] += sent
+    metrics.add("backend_requests")
+    metrics.add("backend_bytes_raw", len(body))
+    metrics.add("backend_bytes_sent", sent)
+    return res
+
+
+@metrics.timed("create_alert")
 def create_alert(alert: Dict) -> None:
     """
     alert 예시:
@@ -20,17 +116,470 @@ def create_alert(alert: Dict) -> None:
       "keyword_matched": true
     }
     """
-    res = requests.post(f"{BACKEND_BASE_URL}/internal/alerts", json=alert)
+    res = _send_json("POST", "/internal/alerts", alert)
+    res.raise_for_status()
+
+
+class BulkEndpointUnavailable(Exception):
+    """백엔드에 bulk 엔드포인트(POST /internal/alerts/bulk 등)가 없는 경우 (404/405)"""
+
+
+@metrics.timed("create_alerts_bulk")
+def create_alerts_bulk(alerts: List[Dict]) -> None:
+    """
+    POST /internal/alerts/bulk 로 여러 알림을 한 번에 생성한다.
+    요청 본문: {"alerts": [alert, ...]}  (alert 형식은 create_alert 와 동일)
+    - 2xx: 전체 성공
+    - 404/405: BulkEndpointUnavailable (단건 전송으로 폴백해야 함)
+    - 그 외 실패는 requests 예외를 그대로 던진다.
+    """
+    res = _send_json("POST", "/internal/alerts/bulk", {"alerts": alerts})
+    if res.status_code in (404, 405):
+        raise BulkEndpointUnavailable(f"bulk endpoint status={res.status_code}")
+    res.raise_for_status()
+
+
+def send_alerts(alerts: List[Dict], on_ack: Callable[[Dict], None], on_fail: Callable[[Dict, Exception], None]) -> None:
+    """
+    알림 묶음을 bulk 로 전송하고, bulk 엔드포인트가 없으면 단건 전송으로 폴백한다.
+    각 알림마다 on_ack(alert) 또는 on_fail(alert, exc) 가 정확히 한 번 호출된다.
+    """
+    global _bulk_supported
+
+    if not alerts:
+        return
+
+    if _bulk_supported and len(alerts) > 1:
+        try:
+            create_alerts_bulk(alerts)
+        except BulkEndpointUnavailable:
+            log.warning("backend.bulk_unavailable", "bulk 엔드포인트가 없어 단건 전송으로 폴백합니다", endpoint="alerts")
+            _bulk_supported = False
+        except requests.exceptions.RequestException as e:
+            for alert in alerts:
+                on_fail(alert, e)
+            return
+        else:
+            for alert in alerts:
+                on_ack(alert)
+            return
+
+    for alert in alerts:
+        try:
+            create_alert(alert)
+        except requests.exceptions.RequestException as e:
+            on_fail(alert, e)
+        else:
+            on_ack(alert)
+
+
+def post_key(site_key: str, site_post_id: str) -> str:
+    """게시물 레코드 키: 사이트 키 + 사이트 내 게시물 ID"""
+    return f"{site_key}|{site_post_id}"
+
+
+def split_alert(alert: Dict, site_key: str) -> Tuple[Dict, Dict]:
+    """
+    full 알림 payload 를 (게시물 레코드, post_key 로 게시물을 참조하는 가벼운 알림)으로 나눈다.
+    같은 게시물을 구독한 모든 알림은 같은 게시물 레코드를 만들므로, 본문은 한 번만 업로드된다.
+    """
+    key = post_key(site_key, alert["site_post_id"])
+    post = {
+        "post_key": key,
+        "site_key": site_key,
+        "site_post_id": alert["site_post_id"],
+        "title": alert["title"],
+        "url": alert["url"],
+        "published_at": alert.get("published_at"),
+        "content_raw": alert["content_raw"],
+        "content_summary": alert["content_summary"],
+    }
+    light = {
+        "user_id": alert["user_id"],
+        "subscription_id": alert["subscription_id"],
+        "site_alias": alert.get("site_alias"),
+        "site_post_id": alert["site_post_id"],
+        "post_key": key,
+        "keyword_matched": alert["keyword_matched"],
+    }
+    return post, light
+
+
+@metrics.timed("create_posts_bulk")
+def create_posts_bulk(posts: List[Dict]) -> None:
+    """
+    POST /internal/posts/bulk 로 게시물 레코드(본문/요약)를 업서트한다.
+    요청 본문: {"posts": [post, ...]}  (post_key 기준 멱등)
+    - 404/405: BulkEndpointUnavailable
+    """
+    res = _send_json("POST", "/internal/posts/bulk", {"posts": posts})
+    if res.status_code in (404, 405):
+        raise BulkEndpointUnavailable(f"bulk posts endpoint status={res.status_code}")
     res.raise_for_status()
 
+
+def send_posts(posts: List[Dict]) -> List[Dict]:
+    """
+    게시물 레코드 묶음을 bulk 로 보내고, bulk 엔드포인트가 없으면 POST /internal/posts 단건으로 폴백한다.
+    return: 업로드가 확인된 게시물 레코드 목록
+    """
+    global _bulk_posts_supported
+
+    if not posts:
+        return []
+
+    if _bulk_posts_supported:
+        try:
+            create_posts_bulk(posts)
+            return list(posts)
+        except BulkEndpointUnavailable:
+            log.warning("backend.bulk_unavailable", "bulk 엔드포인트가 없어 단건 전송으로 폴백합니다", endpoint="posts")
+            _bulk_posts_supported = False
+        except requests.exceptions.RequestException as e:
+            log.warning("post.upload_failed", "게시물 업로드 실패 (%d개): %s", len(posts), e)
+            return []
+
+    uploaded = []
+    for post in posts:
+        try:
+            _send_json("POST", "/internal/posts", post).raise_for_status()
+        except requests.exceptions.RequestException as e:
+            log.warning("post.upload_failed", "게시물 업로드 실패: %s", e, post_key=post["post_key"])
+        else:
+            uploaded.append(post)
+    return uploaded
+
+
+class AlertBatcher:
+    """
+    알림 payload 를 버퍼에 모았다가 bulk 요청으로 전송하는 싱크.
+
+    - max_batch_size 개가 쌓이면 즉시 전송
+    - 가장 오래된 알림이 max_delay 초 이상 기다리면 타이머 스레드가 전송
+    - close()(또는 with 블록 종료) 시 남은 알림을 모두 전송
+
+    전송 결과는 on_ack / on_fail 콜백으로 받는다. (acked / failed 는 누적 건수만 센다.
+    데몬처럼 오래 도는 프로세스에서 한 인스턴스를 계속 쓰므로 알림 자체는 들고 있지 않는다)
+    (on_add 는 알림이 버퍼에 들어갈 때 호출되며, CursorCommitter 연동에 사용)
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = ALERT_BATCH_SIZE,
+        max_delay: float = ALERT_BATCH_MAX_DELAY,
+        on_ack: Optional[Callable[[Dict], None]] = None,
+        on_fail: Optional[Callable[[Dict, Exception], None]] = None,
+        on_add: Optional[Callable[[Dict], None]] = None,
+    ):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_delay = max_delay
+        self._on_add = on_add
+        self._on_ack = on_ack
+        self._on_fail = on_fail
+        self._buffer: List[Dict] = []
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self.acked = 0
+        self.failed = 0
+        self.requests_sent = 0
+
+    def add(self, alert: Dict) -> None:
+        if self._on_add:
+            self._on_add(alert)
+        with self._lock:
+            self._buffer.append(alert)
+            full = len(self._buffer) >= self.max_batch_size
+            if not full and self._timer is None and self.max_delay > 0:
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """버퍼에 있는 알림을 max_batch_size 단위로 나눠 모두 전송한다."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        # 타이머 스레드와 호출 스레드가 동시에 보내지 않도록 전송은 직렬화
+        with self._send_lock:
+            for start in range(0, len(batch), self.max_batch_size):
+                chunk = batch[start:start + self.max_batch_size]
+                started = time.monotonic()
+                send_alerts(chunk, self._ack, self._fail)
+                self.requests_sent += 1
+                log.info("alert_batcher.sent", "%d개 전송 (%.0fms)", len(chunk), (time.monotonic() - started) * 1000)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "AlertBatcher":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _ack(self, alert: Dict) -> None:
+        self.acked += 1
+        if self._on_ack:
+            self._on_ack(alert)
+
+    def _fail(self, alert: Dict, exc: Exception) -> None:
+        log.warning("alert.failed", "알림 전송 실패: %s", exc, subscription_id=alert.get("subscription_id"))
+        self.failed += 1
+        if self._on_fail:
+            self._on_fail(alert, exc)
+
+
+@metrics.timed("update_subscription_last_seen")
 def update_subscription_last_seen(subscription_id: int, last_seen_post_id: str) -> None:
     """
     백엔드(https://www.todaysound.com/internal/subscriptions/{subscription_id}/last_seen)에
     PATCH 요청을 보내서 last_seen_post_id를 업데이트한다.
     요청이 실패하면 예외를 던지고, 성공하면 무시.
     """
-    res = requests.patch(
-        f"{BACKEND_BASE_URL}/internal/subscriptions/{subscription_id}/last_seen",
-        json={"last_seen_post_id": last_seen_post_id},
+    res = _send_json(
+        "PATCH",
+        f"/internal/subscriptions/{subscription_id}/last_seen",
+        {"last_seen_post_id": last_seen_post_id},
     )
-    res.raise_for_status()
\ No newline at end of file
+    res.raise_for_status()
+
+
+@metrics.timed("update_subscriptions_last_seen_bulk")
+def update_subscriptions_last_seen_bulk(updates: List[Dict]) -> None:
+    """
+    PATCH /internal/subscriptions/last_seen 으로 여러 구독의 last_seen_post_id 를 한 번에 갱신한다.
+    요청 본문: {"updates": [{"subscription_id": 1, "last_seen_post_id": "12345"}, ...]}
+    - 404/405: BulkEndpointUnavailable (단건 PATCH 로 폴백해야 함)
+    """
+    res = _send_json("PATCH", "/internal/subscriptions/last_seen", {"updates": updates})
+    if res.status_code in (404, 405):
+        raise BulkEndpointUnavailable(f"bulk last_seen endpoint status={res.status_code}")
+    res.raise_for_status()
+
+
+def send_last_seen_updates(updates: List[Dict]) -> List[Dict]:
+    """
+    last_seen 갱신 묶음을 bulk 로 보내고, bulk 엔드포인트가 없으면 단건 PATCH 로 폴백한다.
+    return: 백엔드가 반영을 확인한 갱신 목록 (실패한 항목은 빠진다)
+    """
+    global _bulk_last_seen_supported
+
+    if not updates:
+        return []
+
+    if _bulk_last_seen_supported and len(updates) > 1:
+        try:
+            update_subscriptions_last_seen_bulk(updates)
+            return list(updates)
+        except BulkEndpointUnavailable:
+            log.warning("backend.bulk_unavailable", "bulk 엔드포인트가 없어 단건 갱신으로 폴백합니다", endpoint="last_seen")
+            _bulk_last_seen_supported = False
+        except requests.exceptions.RequestException as e:
+            log.warning("subscription.cursor_failed", "last_seen bulk 갱신 실패 (%d개): %s", len(updates), e)
+            return []
+
+    committed = []
+    for update in updates:
+        try:
+            update_subscription_last_seen(update["subscription_id"], update["last_seen_post_id"])
+        except requests.exceptions.RequestException as e:
+            log.warning("subscription.cursor_failed", "last_seen 갱신 실패: %s", e,
+                        subscription_id=update["subscription_id"])
+        else:
+            committed.append(update)
+    return committed
+
+
+class CursorCommitter:
+    """
+    구독별 last_seen_post_id(커서)를 모았다가 배치로 갱신하는 단계.
+
+    커서는 해당 구독의 알림이 모두 전송 확인(ack)된 뒤에만 커밋된다.
+    알림이 하나라도 실패한 구독의 커서는 커밋하지 않으므로, 다음 실행(데몬은 다음 폴링)에서 같은 게시물부터 다시 처리된다.
+    실패 표시는 그 커서를 건너뛸 때 지워지므로, 다시 처리해서 알림이 모두 성공하면 그 커서는 정상적으로 커밋된다.
+
+    사용법:
+        committer = CursorCommitter()
+        with AlertBatcher(on_add=committer.alert_added,
+                          on_ack=committer.alert_acked,
+                          on_fail=committer.alert_failed) as sink:
+            ... sink.add(alert) ...
+            committer.stage(sub_id, latest_id)   # 해당 구독의 알림을 모두 add 한 뒤
+        committer.close()
+    """
+
+    def __init__(
+        self,
+        batch_size: int = CURSOR_BATCH_SIZE,
+        on_commit: Optional[Callable[[int, str], None]] = None,
+    ):
+        self.batch_size = max(1, batch_size)
+        self._on_commit = on_commit
+        self._lock = threading.Lock()
+        self._in_flight: Dict[int, int] = {}   # subscription_id → 아직 ack 안 된 알림 수
+        self._failed: set = set()
+        self._staged: Dict[int, str] = {}      # 알림 ack 를 기다리는 커서
+        self._ready: Dict[int, str] = {}       # 바로 커밋 가능한 커서
+        self.committed: Dict[int, str] = {}
+        self.skipped: set = set()
+        self.requests_sent = 0
+
+    def alert_added(self, alert: Dict) -> None:
+        sub_id = alert["subscription_id"]
+        with self._lock:
+            self._in_flight[sub_id] = self._in_flight.get(sub_id, 0) + 1
+
+    def alert_acked(self, alert: Dict) -> None:
+        sub_id = alert["subscription_id"]
+        with self._lock:
+            self._in_flight[sub_id] -= 1
+            self._promote(sub_id)
+        self._flush_if_full()
+
+    def alert_failed(self, alert: Dict, exc: Exception) -> None:
+        sub_id = alert["subscription_id"]
+        with self._lock:
+            self._in_flight[sub_id] -= 1
+            self._failed.add(sub_id)
+            self._promote(sub_id)
+
+    def stage(self, subscription_id: int, last_seen_post_id: str) -> None:
+        """구독의 알림을 모두 sink 에 넣은 뒤 호출한다."""
+        with self._lock:
+            self._staged[subscription_id] = last_seen_post_id
+            self._promote(subscription_id)
+        self._flush_if_full()
+
+    def _promote(self, sub_id: int) -> None:
+        # self._lock 을 잡은 상태에서 호출
+        if self._in_flight.get(sub_id, 0) > 0:
+            return
+        self._in_flight.pop(sub_id, None)
+        if sub_id not in self._staged:
+            return
+        last_seen = self._staged.pop(sub_id)
+        if sub_id in self._failed:
+            # 실패 표시는 이번 커서 하나에만 적용한다. 데몬은 같은 committer 를 계속 쓰므로
+            # 지우지 않으면 다음 폴링의 알림이 모두 성공해도 이 구독의 커서를 영영 올리지 못한다
+            self._failed.discard(sub_id)
+            log.warning("subscription.cursor_skipped", "알림 전송 실패로 last_seen 갱신을 건너뜁니다", subscription_id=sub_id)
+            self.skipped.add(sub_id)
+            return
+        self._ready[sub_id] = last_seen
+
+    def _flush_if_full(self) -> None:
+        with self._lock:
+            full = len(self._ready) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """커밋 가능한 커서를 batch_size 단위로 전송한다."""
+        with self._lock:
+            ready, self._ready = self._ready, {}
+
+        updates = [
+            {"subscription_id": sub_id, "last_seen_post_id": last_seen}
+            for sub_id, last_seen in ready.items()
+        ]
+        for start in range(0, len(updates), self.batch_size):
+            chunk = updates[start:start + self.batch_size]
+            committed = send_last_seen_updates(chunk)
+            self.requests_sent += 1
+            with self._lock:
+                for update in committed:
+                    self.committed[update["subscription_id"]] = update["last_seen_post_id"]
+                    self.skipped.discard(update["subscription_id"])
+            if self._on_commit:
+                for update in committed:
+                    self._on_commit(update["subscription_id"], update["last_seen_post_id"])
+
+    def close(self) -> None:
+        """
+        남은 커서를 커밋한다. (AlertBatcher 를 먼저 close 해야 함)
+        아직 ack 를 받지 못한 커서는 커밋하지 않는다.
+        """
+        self.flush()
+        with self._lock:
+            pending = list(self._staged)
+        if pending:
+            log.warning("subscription.cursor_pending", "알림 전송이 끝나지 않아 커밋하지 않은 구독 %d개", len(pending),
+                        subscription_ids=pending)
+
+
+class BatchedDelivery:
+    """
+    AlertBatcher + CursorCommitter 를 묶은 메모리 내 전송 단계.
+    로컬 outbox 를 쓰지 않을 때(OUTBOX_PATH="") main() 에서 사용하며,
+    services.outbox.Outbox 와 같은 submit / pending_cursor / close 인터페이스를 가진다.
+    """
+
+    def __init__(
+        self,
+        payload_mode: str = ALERT_PAYLOAD_MODE,
+        on_cursor_committed: Optional[Callable[[int, str], None]] = None,
+    ):
+        self.payload_mode = payload_mode
+        self.committer = CursorCommitter(on_commit=on_cursor_committed)
+        self.sink = AlertBatcher(
+            on_add=self.committer.alert_added,
+            on_ack=self.committer.alert_acked,
+            on_fail=self.committer.alert_failed,
+        )
+        self._uploaded_posts: set = set()
+
+    def submit(
+        self,
+        subscription_id: int,
+        alerts: List[Dict],
+        last_seen_post_id: Optional[str],
+        site_key: str = "",
+    ) -> None:
+        if self.payload_mode == "ref" and alerts:
+            alerts = self._to_refs(alerts, site_key)
+        for alert in alerts:
+            self.sink.add(alert)
+        if last_seen_post_id is not None:
+            self.committer.stage(subscription_id, last_seen_post_id)
+
+    def _to_refs(self, alerts: List[Dict], site_key: str) -> List[Dict]:
+        """아직 올리지 않은 게시물 레코드를 먼저 업로드하고, 가벼운 알림 목록을 반환한다."""
+        pairs = [split_alert(alert, site_key) for alert in alerts]
+        new_posts = {}
+        for post, _ in pairs:
+            if post["post_key"] not in self._uploaded_posts:
+                new_posts[post["post_key"]] = post
+        metrics.cache("post_upload", hits=len(pairs) - len(new_posts), misses=len(new_posts))
+        for post in send_posts(list(new_posts.values())):
+            self._uploaded_posts.add(post["post_key"])
+
+        lights = []
+        for _, light in pairs:
+            if light["post_key"] in self._uploaded_posts:
+                lights.append(light)
+            else:
+                # 참조할 게시물이 없으니 알림 실패로 처리 → 이 구독의 커서는 커밋되지 않음
+                self.committer.alert_added(light)
+                self.committer.alert_failed(light, RuntimeError("post upload failed"))
+        return lights
+
+    def pending_cursor(self, subscription_id: int) -> Optional[str]:
+        return None
+
+    def flush(self) -> None:
+        """
+        쌓인 알림을 보내고, ack 된 구독의 커서를 바로 커밋한다.
+        데몬 모드에서 사이트 하나를 처리할 때마다 호출해서 다음 폴링 전에 커서가 반영되게 한다.
+        """
+        self.sink.flush()
+        self.committer.flush()
+
+    def close(self, timeout: float = 0) -> None:
+        self.sink.close()
+        self.committer.close()
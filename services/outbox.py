@@ -0,0 +1,413 @@
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from services import log
+from services.notification_client import (
+    ALERT_PAYLOAD_MODE,
+    send_alerts,
+    send_last_seen_updates,
+    send_posts,
+    split_alert,
+)
+
+# 로컬 outbox 파일 경로. 빈 문자열이면 outbox 를 쓰지 않고 메모리에서 바로 전송한다.
+OUTBOX_PATH = os.environ.get("OUTBOX_PATH", "outbox.sqlite3")
+
+OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", "100"))
+# 재시도 백오프: base * 2^(attempts-1) 초, 최대 max 초 (+ 지터)
+OUTBOX_RETRY_BASE = float(os.environ.get("OUTBOX_RETRY_BASE", "1.0"))
+OUTBOX_RETRY_MAX = float(os.environ.get("OUTBOX_RETRY_MAX", "300"))
+# 이 횟수만큼 실패한 항목은 dead 로 표시하고 더 이상 보내지 않는다.
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", "10"))
+# 전달 완료된 행을 보관하는 기간(초). 이후 open 시 정리한다.
+OUTBOX_RETENTION = float(os.environ.get("OUTBOX_RETENTION", str(7 * 24 * 3600)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,                 -- 'post' | 'alert' | 'cursor'
+    idem_key TEXT NOT NULL UNIQUE,
+    subscription_id INTEGER NOT NULL,   -- post 는 0
+    body TEXT NOT NULL,
+    ref TEXT,                           -- ref 모드 알림이 참조하는 post 의 idem_key
+    first_alert_seq INTEGER,            -- cursor: 이 커서가 기다리는 알림 중 가장 앞선 seq (없으면 NULL)
+    status TEXT NOT NULL DEFAULT 'pending',  -- 'pending' | 'delivered' | 'dead'
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    delivered_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, kind, next_attempt_at);
+CREATE INDEX IF NOT EXISTS outbox_sub ON outbox (subscription_id, status);
+"""
+
+
+def alert_idempotency_key(alert: Dict) -> str:
+    """알림 멱등 키: subscription_id + site_post_id"""
+    return f"{alert['subscription_id']}:{alert['site_post_id']}"
+
+
+class Outbox:
+    """
+    알림과 last_seen 커서를 먼저 로컬 SQLite 파일에 기록하고,
+    백그라운드 flusher 스레드가 백엔드로 전달하는 durable outbox.
+
+    - 구독 하나의 알림들과 커서는 한 트랜잭션으로 기록된다.
+    - 알림은 멱등 키(subscription_id:site_post_id)를 payload 의 idempotency_key 로 함께 보낸다.
+    - 실패한 항목은 지수 백오프로 재시도하고, 프로세스가 죽어도 다음 실행에서 이어서 보낸다.
+    - 커서는 그 커서와 함께(또는 그 커서가 대체한 이전 커서와 함께) 기록된 알림이 모두 전달된 뒤에만 전송된다.
+      (그 알림이 dead 가 되면 커서도 dead 처리되어 다음 실행에서 다시 처리됨.
+       다시 처리한 배치의 알림과 커서는 예전 배치의 dead 알림과 상관없이 전달된다)
+    - payload_mode="ref" 이면 게시물 레코드를 post_key 당 한 행으로 기록해 먼저 보내고,
+      알림은 게시물이 전달된 뒤에 가벼운 참조 payload 로 보낸다.
+    """
+
+    def __init__(
+        self,
+        path: str = OUTBOX_PATH,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        payload_mode: str = ALERT_PAYLOAD_MODE,
+        on_cursor_committed: Optional[Callable[[int, str], None]] = None,
+    ):
+        self.path = path
+        self._on_cursor_committed = on_cursor_committed
+        self.batch_size = max(1, batch_size)
+        self.payload_mode = payload_mode
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(outbox)")}
+        if "ref" not in columns:
+            # ref 컬럼이 없던 이전 버전 파일 마이그레이션
+            self._conn.execute("ALTER TABLE outbox ADD COLUMN ref TEXT")
+        if "first_alert_seq" not in columns:
+            # 이전 버전 파일의 커서는 예전처럼 같은 구독의 앞선 알림 전체를 기다리게 한다
+            self._conn.execute("ALTER TABLE outbox ADD COLUMN first_alert_seq INTEGER")
+            self._conn.execute("UPDATE outbox SET first_alert_seq = 0 WHERE kind = 'cursor'")
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.delivered_posts = 0
+        self.delivered_alerts = 0
+        self.delivered_cursors = 0
+
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM outbox WHERE status = 'delivered' AND delivered_at < ?",
+                (time.time() - OUTBOX_RETENTION,),
+            )
+            # 새 실행에서는 이전 실행의 백오프를 기다리지 않고 남은 항목을 한 번에 보낸다
+            self._conn.execute(
+                "UPDATE outbox SET next_attempt_at = ? WHERE status = 'pending'", (time.time(),)
+            )
+        pending = self.pending_count()
+        if pending:
+            log.info("outbox.resume", "이전 실행에서 남은 항목 %d개를 이어서 전송합니다", pending)
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def submit(
+        self,
+        subscription_id: int,
+        alerts: List[Dict],
+        last_seen_post_id: Optional[str],
+        site_key: str = "",
+    ) -> None:
+        """구독 하나의 알림과 커서를 한 트랜잭션으로 outbox 에 기록한다."""
+        now = time.time()
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                alert_seqs = []
+                for alert in alerts:
+                    key = alert_idempotency_key(alert)
+                    ref = None
+                    if self.payload_mode == "ref":
+                        post, alert = split_alert(alert, site_key)
+                        ref = f"post:{post['post_key']}"
+                        self._upsert(cur, "post", ref, 0, post, now)
+                    body = dict(alert, idempotency_key=key)
+                    self._upsert(cur, "alert", key, subscription_id, body, now, ref)
+                    # 이미 있던(다시 살린) 알림은 예전 seq 를 그대로 가지므로 새로 읽는다
+                    alert_seqs.append(cur.execute("SELECT seq FROM outbox WHERE idem_key = ?", (key,)).fetchone()[0])
+                if last_seen_post_id is not None:
+                    # 아직 보내지 못한 이전 커서는 새 커서로 대체하고, 그 커서가 기다리던 알림도 이어서 기다린다.
+                    # 커서는 이 범위의 알림만 기다리므로, 예전 배치에서 dead 가 된 알림이 이후 커서를 계속 막지 않는다
+                    replaced = cur.execute(
+                        "SELECT first_alert_seq FROM outbox WHERE kind = 'cursor' AND status = 'pending' "
+                        "AND subscription_id = ? AND first_alert_seq IS NOT NULL",
+                        (subscription_id,),
+                    ).fetchall()
+                    first_alert_seq = min(alert_seqs + [row[0] for row in replaced], default=None)
+                    cur.execute(
+                        "DELETE FROM outbox WHERE kind = 'cursor' AND status = 'pending' "
+                        "AND subscription_id = ?",
+                        (subscription_id,),
+                    )
+                    cur.execute(
+                        "INSERT OR REPLACE INTO outbox "
+                        "(kind, idem_key, subscription_id, body, first_alert_seq, next_attempt_at, created_at) "
+                        "VALUES ('cursor', ?, ?, ?, ?, ?, ?)",
+                        (
+                            f"cursor:{subscription_id}:{last_seen_post_id}",
+                            subscription_id,
+                            json.dumps({"subscription_id": subscription_id,
+                                        "last_seen_post_id": last_seen_post_id}),
+                            first_alert_seq,
+                            now,
+                            now,
+                        ),
+                    )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+        self._wakeup.set()
+
+    @staticmethod
+    def _upsert(cur, kind: str, key: str, subscription_id: int, body: Dict, now: float,
+                ref: Optional[str] = None) -> None:
+        # 이미 기록/전달된 항목은 무시하고, 최종 실패(dead)했던 항목은 다시 살린다.
+        cur.execute(
+            "INSERT INTO outbox "
+            "(kind, idem_key, subscription_id, body, ref, next_attempt_at, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(idem_key) DO UPDATE SET status = 'pending', attempts = 0, "
+            "next_attempt_at = excluded.next_attempt_at WHERE status = 'dead'",
+            (kind, key, subscription_id, json.dumps(body, ensure_ascii=False), ref, now, now),
+        )
+
+    def pending_cursor(self, subscription_id: int) -> Optional[str]:
+        """
+        outbox 에 기록됐지만 아직 백엔드에 반영되지 않은 커서.
+        이 커서까지의 알림은 이미 outbox 에 있으므로, 백엔드의 last_seen 대신 이 값부터 처리하면
+        같은 게시물을 다시 크롤링/요약하지 않는다.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM outbox WHERE kind = 'cursor' AND status = 'pending' "
+                "AND subscription_id = ? ORDER BY seq DESC LIMIT 1",
+                (subscription_id,),
+            ).fetchone()
+        return json.loads(row[0])["last_seen_post_id"] if row else None
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status = 'pending'"
+            ).fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # 전달 (flusher)
+    # ------------------------------------------------------------------
+    def start(self) -> "Outbox":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="outbox-flusher", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                delivered = self.flush_once()
+            except Exception as e:
+                # flusher 가 죽으면 outbox 가 멈추므로 예외는 기록만 하고 계속 돈다
+                log.error("outbox.flush_error", "flush 중 오류: %s: %s", type(e).__name__, e)
+                delivered = 0
+            if delivered:
+                continue
+            self._wakeup.wait(timeout=self._seconds_until_due())
+            self._wakeup.clear()
+
+    def _seconds_until_due(self) -> float:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending'"
+            ).fetchone()
+        if row[0] is None:
+            return 1.0
+        # 알림을 기다리는 커서는 due 상태여도 보낼 수 없으므로 최소 대기 시간을 둔다
+        return min(1.0, max(0.2, row[0] - time.time()))
+
+    def flush_once(self) -> int:
+        """전송 시점이 된 게시물/알림/커서를 한 배치씩 보낸다. return: 전달 완료된 항목 수"""
+        return self._flush_posts() + self._flush_alerts() + self._flush_cursors()
+
+    def _due(self, kind: str, extra_where: str = "") -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT seq, body, attempts FROM outbox o WHERE status = 'pending' AND kind = ? "
+                f"AND next_attempt_at <= ? {extra_where} ORDER BY seq LIMIT ?",
+                (kind, time.time(), self.batch_size),
+            ).fetchall()
+
+    def _flush_posts(self) -> int:
+        rows = self._due("post")
+        if not rows:
+            return 0
+
+        by_key = {}
+        posts = []
+        for seq, body, attempts in rows:
+            post = json.loads(body)
+            by_key[post["post_key"]] = (seq, attempts)
+            posts.append(post)
+
+        uploaded = {post["post_key"] for post in send_posts(posts)}
+        self._mark_delivered([by_key[key][0] for key in uploaded])
+        self._mark_failed(
+            [(*by_key[post["post_key"]], "게시물 업로드 실패")
+             for post in posts if post["post_key"] not in uploaded]
+        )
+        self.delivered_posts += len(uploaded)
+        return len(uploaded)
+
+    def _flush_alerts(self) -> int:
+        # 참조하는 게시물이 아직 전달되지 않은 알림은 보내지 않는다.
+        rows = self._due(
+            "alert",
+            "AND (o.ref IS NULL OR NOT EXISTS (SELECT 1 FROM outbox p WHERE p.idem_key = o.ref "
+            "AND p.status != 'delivered'))",
+        )
+        if not rows:
+            return 0
+
+        by_key = {}
+        payloads = []
+        for seq, body, attempts in rows:
+            payload = json.loads(body)
+            by_key[payload["idempotency_key"]] = (seq, attempts)
+            payloads.append(payload)
+
+        acked: List[int] = []
+        failed: List[tuple] = []
+        send_alerts(
+            payloads,
+            on_ack=lambda alert: acked.append(by_key[alert["idempotency_key"]][0]),
+            on_fail=lambda alert, exc: failed.append((*by_key[alert["idempotency_key"]], exc)),
+        )
+        self._mark_delivered(acked)
+        self._mark_failed(failed)
+        self.delivered_alerts += len(acked)
+        return len(acked)
+
+    def _flush_cursors(self) -> int:
+        # 커서가 기다리는 알림(first_alert_seq 부터 커서 앞까지)이 아직 pending/dead 이면 커서는 보내지 않는다.
+        self._kill_blocked_cursors()
+        rows = self._due(
+            "cursor",
+            "AND NOT EXISTS (SELECT 1 FROM outbox a WHERE a.kind = 'alert' "
+            "AND a.subscription_id = o.subscription_id AND a.seq >= o.first_alert_seq AND a.seq < o.seq "
+            "AND a.status != 'delivered')",
+        )
+        if not rows:
+            return 0
+
+        updates = []
+        by_sub = {}
+        for seq, body, attempts in rows:
+            update = json.loads(body)
+            by_sub[update["subscription_id"]] = (seq, attempts)
+            updates.append(update)
+
+        committed = send_last_seen_updates(updates)
+        committed_subs = {u["subscription_id"] for u in committed}
+        self._mark_delivered([by_sub[s][0] for s in committed_subs])
+        self._mark_failed(
+            [(*by_sub[u["subscription_id"]], "last_seen 갱신 실패")
+             for u in updates if u["subscription_id"] not in committed_subs]
+        )
+        self.delivered_cursors += len(committed_subs)
+        if self._on_cursor_committed:
+            for update in committed:
+                self._on_cursor_committed(update["subscription_id"], update["last_seen_post_id"])
+        return len(committed_subs)
+
+    def _kill_blocked_cursors(self) -> None:
+        with self._lock:
+            # 게시물 업로드가 최종 실패하면 그 게시물을 참조하는 알림도 보낼 수 없다
+            self._conn.execute(
+                "UPDATE outbox SET status = 'dead', last_error = 'post dead' "
+                "WHERE kind = 'alert' AND status = 'pending' AND ref IS NOT NULL AND EXISTS ("
+                "SELECT 1 FROM outbox p WHERE p.idem_key = outbox.ref AND p.status = 'dead')"
+            )
+            cur = self._conn.execute(
+                "UPDATE outbox SET status = 'dead', last_error = 'alert dead' "
+                "WHERE kind = 'cursor' AND status = 'pending' AND EXISTS ("
+                "SELECT 1 FROM outbox a WHERE a.kind = 'alert' AND a.status = 'dead' "
+                "AND a.subscription_id = outbox.subscription_id "
+                "AND a.seq >= outbox.first_alert_seq AND a.seq < outbox.seq)"
+            )
+        if cur.rowcount:
+            log.warning("outbox.cursor_dead", "알림 전송이 최종 실패한 구독의 커서 %d개를 포기합니다", cur.rowcount)
+
+    def _mark_delivered(self, seqs: List[int]) -> None:
+        if not seqs:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE outbox SET status = 'delivered', delivered_at = ? WHERE seq = ?",
+                [(now, seq) for seq in seqs],
+            )
+
+    def _mark_failed(self, failures: List[tuple]) -> None:
+        if not failures:
+            return
+        now = time.time()
+        params = []
+        for seq, attempts, error in failures:
+            attempts += 1
+            delay = min(OUTBOX_RETRY_MAX, OUTBOX_RETRY_BASE * (2 ** (attempts - 1)))
+            delay *= random.uniform(0.8, 1.2)
+            status = "dead" if attempts >= OUTBOX_MAX_ATTEMPTS else "pending"
+            params.append((status, attempts, now + delay, str(error)[:500], seq))
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? "
+                "WHERE seq = ?",
+                params,
+            )
+        log.warning("outbox.retry", "%d개 전송 실패, 백오프 후 재시도합니다 (예: %s)", len(failures), failures[0][2])
+
+    def flush(self) -> None:
+        """flusher 를 깨워 바로 전송을 시도하게 한다. (BatchedDelivery.flush 와 같은 인터페이스)"""
+        self._wakeup.set()
+
+    def drain(self, timeout: float) -> bool:
+        """
+        pending 항목이 모두 전달되거나 timeout 초가 지날 때까지 기다린다.
+        return: 모두 전달됐으면 True (남은 항목은 파일에 남아 다음 실행에서 재시도)
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._thread is None:
+                self.flush_once()
+            if self.pending_count() == 0:
+                return True
+            self._wakeup.set()
+            time.sleep(0.05)
+        return self.pending_count() == 0
+
+    def close(self, timeout: float = 30.0) -> None:
+        """남은 항목을 timeout 동안 전송해 보고 flusher 를 멈춘다."""
+        drained = self.drain(timeout)
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if not drained:
+            log.warning("outbox.undrained", "전송하지 못한 항목 %d개는 다음 실행에서 재시도합니다", self.pending_count())
+        with self._lock:
+            self._conn.close()
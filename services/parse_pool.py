@@ -0,0 +1,123 @@
+"""
+HTML 파싱 프로세스 풀.
+
+BeautifulSoup 파싱/인코딩 추정은 CPU 를 쓰는 작업이라 스레드로는 GIL 에 막혀 코어 하나만 쓴다.
+크롤러가 받아온 RawPage(바이트)와 파싱 함수(크롤러 클래스의 parse_* 클래스 메서드)를
+ProcessPoolExecutor 로 넘겨 여러 코어에서 파싱한다. soup 객체는 프로세스 경계를 넘지 않는다.
+
+- PARSE_POOL_SIZE: 워커 프로세스 수. 1 이하이면 풀 없이 현재 프로세스에서 파싱
+  기본값은 이 프로세스가 쓸 수 있는 CPU 수(sched_getaffinity)를 _DEFAULT_POOL_MAX 로 자른 값이다.
+  os.cpu_count() 는 컨테이너(Fargate)에서 task 에 준 vCPU 가 아니라 호스트의 코어 수를 돌려주므로,
+  그대로 쓰면 vCPU 1~2개짜리 task 에 워커가 수십 개 뜨고 워커마다 메모리를 잡는다.
+  task 에 vCPU 를 더 주었으면 PARSE_POOL_SIZE 로 직접 지정한다.
+- 풀은 처음 파싱할 때 만들고, 워커가 죽는 등 풀이 깨지면 현재 프로세스에서 파싱한다.
+- 크롤러/알림 전송 스레드가 떠 있는 상태에서 fork 하지 않도록 forkserver(없으면 spawn)로 워커를 띄운다.
+- 파싱 시간은 워커 안에서 잰 순수 파싱 시간(대기열 시간 제외)을 파싱 함수 이름 단계로 services.metrics 에 기록한다.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, Tuple, TypeVar
+
+from services import log, metrics
+
+T = TypeVar("T")
+
+# PARSE_POOL_SIZE 를 지정하지 않았을 때의 최대 워커 수
+_DEFAULT_POOL_MAX = 2
+
+
+def _default_pool_size() -> int:
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # sched_getaffinity 가 없는 플랫폼 (macOS, Windows)
+        cpus = os.cpu_count() or 1
+    return min(cpus, _DEFAULT_POOL_MAX)
+
+
+PARSE_POOL_SIZE = int(os.environ.get("PARSE_POOL_SIZE") or _default_pool_size())
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_broken = False
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    global _executor
+    if PARSE_POOL_SIZE <= 1 or _broken:
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                _executor = ProcessPoolExecutor(max_workers=PARSE_POOL_SIZE, mp_context=context)
+                atexit.register(shutdown)
+    return _executor
+
+
+def _timed_call(fn: Callable[..., T], *args) -> Tuple[T, float]:
+    """워커에서 실행된다. (결과, 파싱 시간) 을 돌려준다."""
+    started = time.perf_counter()
+    return fn(*args), time.perf_counter() - started
+
+
+def _run_inline(fn: Callable[..., T], *args) -> "Future[Tuple[T, float]]":
+    future: Future = Future()
+    try:
+        future.set_result(_timed_call(fn, *args))
+    except BaseException as e:  # noqa: B902 - 호출자가 result() 에서 받도록 그대로 전달
+        future.set_exception(e)
+    return future
+
+
+def submit(fn: Callable[..., T], *args) -> "Future[Tuple[T, float]]":
+    """
+    파싱 작업을 풀에 넣고 Future 를 반환한다. (fn 과 인자는 pickle 가능해야 함)
+    풀을 쓰지 않으면 바로 실행한 결과가 담긴 Future 를 반환한다.
+    """
+    global _broken
+    executor = _get_executor()
+    if executor is None:
+        return _run_inline(fn, *args)
+    try:
+        return executor.submit(_timed_call, fn, *args)
+    except (BrokenProcessPool, RuntimeError) as e:
+        log.warning("parse_pool.unavailable", "프로세스 풀을 쓸 수 없어 현재 프로세스에서 파싱합니다: %s", e)
+        _broken = True
+        return _run_inline(fn, *args)
+
+
+def result(future: "Future[Tuple[T, float]]", fn: Callable[..., T], *args) -> T:
+    """
+    Future 결과를 반환한다. 워커가 죽어서 풀이 깨졌으면 현재 프로세스에서 다시 파싱한다.
+    """
+    global _broken
+    try:
+        value, elapsed = future.result()
+    except BrokenProcessPool as e:
+        log.warning("parse_pool.broken", "파싱 워커가 종료되어 현재 프로세스에서 다시 파싱합니다: %s", e)
+        _broken = True
+        value, elapsed = _timed_call(fn, *args)
+    except BaseException:
+        metrics.error(fn.__name__)
+        raise
+    metrics.observe(fn.__name__, elapsed)
+    return value
+
+
+def parse(fn: Callable[..., T], *args) -> T:
+    """submit + result. 풀에서 파싱하고 결과를 기다린다."""
+    return result(submit(fn, *args), fn, *args)
+
+
+def shutdown() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
@@ -0,0 +1,174 @@
+"""
+사이트(목록 URL)별 게시 빈도를 학습해서 다음 폴링 주기를 정한다.
+
+- 폴링할 때마다 filter_new_posts() 로 직전 폴링 이후 새로 올라온 게시물 수를 구하고,
+  게시 간격(inter-arrival)의 EWMA 와 시간대(0~23시)별 게시량 프로필을 갱신한다.
+- 다음 폴링 주기 = 예상 게시 간격 × POLL_RATE_FRACTION 에 시간대 가중치를 곱한 뒤
+  [POLL_MIN_INTERVAL, POLL_MAX_INTERVAL] 로 자른다.
+  - 오래 조용한 게시판은 "마지막 게시 이후 지난 시간"도 간격 추정에 반영해서 점점 느리게 돈다.
+  - 게시가 몰리는 시간대는 짧게, 거의 안 올라오는 시간대는 길게 돈다.
+- 학습 결과는 POLL_RATE_PATH(JSON)에 저장되어 재시작 후에도 이어지고, 파일을 열어 사이트별 주기를 확인할 수 있다.
+"""
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from services import log
+from sites.post import Post
+
+# 폴링 주기 하한/상한(초)
+POLL_MIN_INTERVAL = float(os.environ.get("POLL_MIN_INTERVAL", "60"))
+POLL_MAX_INTERVAL = float(os.environ.get("POLL_MAX_INTERVAL", "3600"))
+# 예상 게시 간격의 몇 배마다 폴링할지 (0.5 → 평균적으로 게시 간격의 절반 안에 알림)
+POLL_RATE_FRACTION = float(os.environ.get("POLL_RATE_FRACTION", "0.5"))
+# 게시 간격 EWMA 가중치 (클수록 최근 간격을 더 따름)
+POLL_RATE_ALPHA = float(os.environ.get("POLL_RATE_ALPHA", "0.3"))
+# 시간대 프로필을 쓰기 시작할 최소 관측 게시물 수
+POLL_PROFILE_MIN_POSTS = int(os.environ.get("POLL_PROFILE_MIN_POSTS", "20"))
+# 시간대 계산용 UTC 오프셋(시간). 게시판이 모두 국내 사이트이므로 기본 KST
+POLL_TZ_OFFSET_HOURS = float(os.environ.get("POLL_TZ_OFFSET_HOURS", "9"))
+# 학습 결과 저장 경로 ("" 이면 저장하지 않음)
+POLL_RATE_PATH = os.environ.get("POLL_RATE_PATH", "poll_rates.json")
+
+# 시간대 가중치 범위 (프로필 평균 대비)
+_HOUR_FACTOR_MIN = 0.5
+_HOUR_FACTOR_MAX = 4.0
+# 시간대 프로필 감쇠: 새 게시물을 기록할 때마다 기존 값에 곱한다 (오래된 패턴을 천천히 잊음)
+_HOUR_DECAY = 0.98
+
+
+def _hour_of(ts: float) -> int:
+    return int(((ts / 3600.0) + POLL_TZ_OFFSET_HOURS) % 24)
+
+
+class SiteRate:
+    """목록 URL 하나의 학습 상태."""
+
+    def __init__(self, data: Optional[Dict] = None):
+        data = data or {}
+        self.last_top_id: Optional[str] = data.get("last_top_id")
+        self.last_poll_at: Optional[float] = data.get("last_poll_at")
+        self.last_arrival_at: Optional[float] = data.get("last_arrival_at")
+        self.ewma_interarrival: Optional[float] = data.get("ewma_interarrival")
+        self.posts_seen: int = data.get("posts_seen", 0)
+        self.hourly: List[float] = list(data.get("hourly") or [0.0] * 24)
+        self.interval: Optional[float] = data.get("interval")
+
+    def to_dict(self) -> Dict:
+        return {
+            "last_top_id": self.last_top_id,
+            "last_poll_at": self.last_poll_at,
+            "last_arrival_at": self.last_arrival_at,
+            "ewma_interarrival": self.ewma_interarrival,
+            "posts_seen": self.posts_seen,
+            "hourly": [round(v, 3) for v in self.hourly],
+            "interval": self.interval,
+        }
+
+    def observe(self, new_count: int, top_id: Optional[str], now: float) -> None:
+        """
+        폴링 결과를 반영한다.
+        new_count 개가 직전 폴링(last_poll_at)과 now 사이에 올라왔다고 보고,
+        (now - 마지막 게시 시각) / new_count 를 이번 게시 간격 표본으로 쓴다.
+        """
+        if new_count > 0:
+            since = self.last_arrival_at or self.last_poll_at
+            if since is not None and now > since:
+                sample = (now - since) / new_count
+                if self.ewma_interarrival is None:
+                    self.ewma_interarrival = sample
+                else:
+                    self.ewma_interarrival = (
+                        POLL_RATE_ALPHA * sample + (1 - POLL_RATE_ALPHA) * self.ewma_interarrival
+                    )
+            self.hourly = [v * _HOUR_DECAY for v in self.hourly]
+            self.hourly[_hour_of(now)] += new_count
+            self.posts_seen += new_count
+            self.last_arrival_at = now
+        if top_id is not None:
+            self.last_top_id = top_id
+        self.last_poll_at = now
+
+    def expected_interarrival(self, now: float) -> Optional[float]:
+        if self.ewma_interarrival is None:
+            return None
+        quiet_for = now - self.last_arrival_at if self.last_arrival_at else 0.0
+        return max(self.ewma_interarrival, quiet_for)
+
+    def hour_factor(self, now: float) -> float:
+        """지금 시간대가 평균보다 한산하면 >1, 붐비면 <1."""
+        if self.posts_seen < POLL_PROFILE_MIN_POSTS:
+            return 1.0
+        mean = sum(self.hourly) / 24
+        if mean <= 0:
+            return 1.0
+        current = self.hourly[_hour_of(now)]
+        if current <= 0:
+            return _HOUR_FACTOR_MAX
+        return min(_HOUR_FACTOR_MAX, max(_HOUR_FACTOR_MIN, mean / current))
+
+    def next_interval(self, default: float, now: float) -> float:
+        expected = self.expected_interarrival(now)
+        if expected is None:
+            interval = default
+        else:
+            interval = expected * POLL_RATE_FRACTION * self.hour_factor(now)
+        self.interval = min(POLL_MAX_INTERVAL, max(POLL_MIN_INTERVAL, interval))
+        return self.interval
+
+
+class PollRateTracker:
+    """사이트별 SiteRate 모음 + JSON 저장/복원."""
+
+    def __init__(self, path: str = POLL_RATE_PATH, clock=time.time):
+        self.path = path
+        self._clock = clock
+        self.sites: Dict[str, SiteRate] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                self.sites = {url: SiteRate(state) for url, state in data.items()}
+                log.info("poll_rate.loaded", "학습 상태 로드: 사이트 %d개", len(self.sites))
+            except (OSError, ValueError) as e:
+                log.warning("poll_rate.load_failed", "학습 상태를 읽지 못해 새로 시작합니다: %s", e)
+
+    def site(self, site_url: str) -> SiteRate:
+        state = self.sites.get(site_url)
+        if state is None:
+            state = self.sites[site_url] = SiteRate()
+        return state
+
+    def observe(self, site_url: str, posts: List[Post], filter_new_posts) -> int:
+        """
+        이번 폴링의 게시물 목록(최신→과거)을 반영하고 새 게시물 수를 반환한다.
+        filter_new_posts 는 main.filter_new_posts (첫 관측이면 0개)
+        """
+        state = self.site(site_url)
+        top_id = posts[0].id if posts else None
+        new_count = len(filter_new_posts(posts, state.last_top_id, quiet=True)) if posts else 0
+        state.observe(new_count, top_id, self._clock())
+        return new_count
+
+    def next_interval(self, site_url: str, default: float) -> float:
+        return self.site(site_url).next_interval(default, self._clock())
+
+    def intervals(self) -> Dict[str, Optional[float]]:
+        """사이트별 현재 학습된 폴링 주기(초)."""
+        return {url: state.interval for url, state in self.sites.items()}
+
+    def prune(self, site_urls) -> None:
+        """구독이 없어진 사이트의 학습 상태를 버린다."""
+        keep = set(site_urls)
+        for url in list(self.sites):
+            if url not in keep:
+                del self.sites[url]
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({url: s.to_dict() for url, s in self.sites.items()}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
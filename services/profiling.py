@@ -0,0 +1,156 @@
+"""
+사이트 그룹 단위 프로파일링 (환경 변수로 켜는 선택 기능).
+
+실행이 느리거나 컨테이너 메모리가 튈 때 어떤 크롤러/페이지 때문인지 보기 위해
+process_site_group() 한 번을 cProfile 로 감싸고, 필요하면 tracemalloc 으로 할당도 추적한다.
+
+- PROFILE_DIR: 결과를 쓸 디렉토리. "" 이면 꺼짐 (기본)
+- PROFILE_SAMPLE_RATE: 사이트 그룹을 프로파일링할 확률 (0~1, 기본 0.05)
+  운영에서 켜 둘 수 있도록 일부 그룹만 프로파일링한다. 뽑히지 않은 그룹의 비용은 난수 하나다.
+- PROFILE_MIN_SECONDS: 이보다 빨리 끝난 그룹은 결과를 버린다. (기본 0, 느린 그룹만 남기고 싶을 때)
+- PROFILE_TRACEMALLOC: 1 이면 뽑힌 그룹 동안 tracemalloc 도 켠다. (할당마다 비용이 커서 기본 꺼짐)
+- PROFILE_TRACEMALLOC_FRAMES: 할당 위치로 기록할 스택 깊이 (기본 1)
+- PROFILE_TOP: 할당 리포트에 남길 상위 항목 수 (기본 25)
+- PROFILE_KEEP: 디렉토리에 남길 최근 결과 수 (기본 200, 오래된 것부터 지움)
+
+결과 파일 (사이트 키를 파일 이름에 쓸 수 있게 바꾼 slug 사용)
+- {시각}_{slug}.pstats      : `python -m pstats 파일` 또는 snakeviz 로 열 수 있다
+- {시각}_{slug}.alloc.txt   : 그룹 동안의 최대 메모리와, 끝난 시점에 남은 할당 상위 위치 (PROFILE_TRACEMALLOC=1)
+
+cProfile 은 현재 스레드만 본다. 파싱 풀 워커(services.parse_pool)에서 실행된 파싱과
+outbox/배치 전송 스레드는 포함되지 않는다. (파싱 시간은 services.metrics 의 parse_* 단계로 본다)
+"""
+import contextlib
+import hashlib
+import os
+import random
+import re
+import time
+from typing import Iterator
+
+from services import log, metrics
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0.05"))
+PROFILE_MIN_SECONDS = float(os.environ.get("PROFILE_MIN_SECONDS", "0"))
+PROFILE_TRACEMALLOC = os.environ.get("PROFILE_TRACEMALLOC", "0") == "1"
+PROFILE_TRACEMALLOC_FRAMES = int(os.environ.get("PROFILE_TRACEMALLOC_FRAMES", "1"))
+PROFILE_TOP = int(os.environ.get("PROFILE_TOP", "25"))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "200"))
+
+_SUFFIXES = (".pstats", ".alloc.txt")
+
+
+def _slug(site_key: str) -> str:
+    """파일 이름용 사이트 키. 읽을 수 있는 앞부분 + 충돌 방지용 해시"""
+    readable = re.sub(r"[^A-Za-z0-9]+", "_", site_key.split("://", 1)[-1]).strip("_")[:60]
+    digest = hashlib.sha1(site_key.encode("utf-8")).hexdigest()[:8]
+    return f"{readable}_{digest}"
+
+
+def _sampled() -> bool:
+    if not PROFILE_DIR or PROFILE_SAMPLE_RATE <= 0:
+        return False
+    return PROFILE_SAMPLE_RATE >= 1 or random.random() < PROFILE_SAMPLE_RATE
+
+
+@contextlib.contextmanager
+def profile_group(site_key: str) -> Iterator[None]:
+    """
+    블록(사이트 그룹 하나)을 샘플링해서 프로파일링한다. 꺼져 있거나 뽑히지 않으면 아무것도 하지 않는다.
+    다른 프로파일러가 이미 돌고 있으면(중첩 호출, 디버거 등) 이 그룹은 건너뛴다.
+    """
+    if not _sampled():
+        yield
+        return
+
+    import cProfile
+    import tracemalloc
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        log.warning("profile.skipped", "다른 프로파일러가 실행 중이라 건너뜁니다: %s", e)
+        yield
+        return
+
+    # 이미 다른 곳에서 tracemalloc 을 켰으면 그대로 두고 (끄지 않음) 스냅샷만 찍는다
+    own_tracemalloc = PROFILE_TRACEMALLOC and not tracemalloc.is_tracing()
+    if own_tracemalloc:
+        tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+    elif PROFILE_TRACEMALLOC:
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        snapshot = None
+        peak = None
+        if PROFILE_TRACEMALLOC:
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            if own_tracemalloc:
+                tracemalloc.stop()
+        if elapsed >= PROFILE_MIN_SECONDS:
+            _write(site_key, profiler, elapsed, snapshot, peak)
+
+
+def _write(site_key: str, profiler, elapsed: float, snapshot, peak) -> None:
+    stamp = time.strftime("%Y%m%dT%H%M%S") + f"{time.time() % 1:.3f}"[1:]
+    base = os.path.join(PROFILE_DIR, f"{stamp}_{_slug(site_key)}")
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(base + ".pstats")
+        if snapshot is not None:
+            _write_allocations(base + ".alloc.txt", site_key, elapsed, snapshot, peak)
+    except OSError as e:
+        log.warning("profile.write_failed", "프로파일 결과를 쓰지 못했습니다: %s", e)
+        return
+    metrics.add("profiles_written")
+    log.info("profile.written", "site_url=%s %.2fs → %s.pstats", site_key, elapsed, base)
+    _prune()
+
+
+def _write_allocations(path: str, site_key: str, elapsed: float, snapshot, peak: int) -> None:
+    import tracemalloc
+
+    # 프로파일러/tracemalloc 자체의 할당은 빼고 본다
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+    stats = snapshot.statistics("lineno")
+    total = sum(stat.size for stat in stats)
+    lines = [
+        f"site_url: {site_key}",
+        f"elapsed: {elapsed:.3f}s",
+        f"peak: {peak / 1024 / 1024:.1f} MiB",
+        f"live at end: {total / 1024 / 1024:.1f} MiB in {sum(stat.count for stat in stats)} blocks",
+        "",
+        f"top {PROFILE_TOP} allocation sites (live at end of group):",
+    ]
+    for stat in stats[:PROFILE_TOP]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {frame.filename}:{frame.lineno}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def _prune() -> None:
+    """PROFILE_KEEP 개를 넘는 오래된 결과를 지운다. (파일 이름이 시각으로 시작하므로 이름순 = 시간순)"""
+    if PROFILE_KEEP <= 0:
+        return
+    try:
+        names = sorted(name for name in os.listdir(PROFILE_DIR) if name.endswith(".pstats"))
+    except OSError:
+        return
+    for name in names[:max(0, len(names) - PROFILE_KEEP)]:
+        stem = name[:-len(".pstats")]
+        for suffix in _SUFFIXES:
+            with contextlib.suppress(OSError):
+                os.remove(os.path.join(PROFILE_DIR, stem + suffix))
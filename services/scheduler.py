@@ -0,0 +1,72 @@
+"""
+데몬 모드용 사이트별 폴링 스케줄러.
+
+사이트(site_url)마다 다음 폴링 시각(next_due)을 힙(heapq)에 넣어 두고,
+가장 먼저 돌아오는 사이트부터 꺼내 처리한다.
+- 사이트가 추가되면 바로 due 상태로 등록하고, 구독이 모두 사라진 사이트는 꺼낼 때 버린다(lazy 삭제).
+- 같은 사이트를 다시 예약하면 이전 힙 항목은 무효가 된다. (entries 의 seq 와 비교)
+"""
+import heapq
+import itertools
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class SiteScheduler:
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        # site_url → (next_due, seq). 힙 항목의 seq 가 다르면 취소된 항목
+        self.entries: Dict[str, Tuple[float, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def schedule(self, site_url: str, due_at: float) -> None:
+        seq = next(self._seq)
+        self.entries[site_url] = (due_at, seq)
+        heapq.heappush(self._heap, (due_at, seq, site_url))
+
+    def reschedule(self, site_url: str, interval: float) -> None:
+        """처리가 끝난 사이트를 interval 초 뒤로 다시 예약한다."""
+        self.schedule(site_url, self._clock() + interval)
+
+    def sync_sites(self, site_urls: Iterable[str]) -> None:
+        """
+        현재 구독 중인 사이트 목록으로 스케줄을 맞춘다.
+        새 사이트는 바로 due, 빠진 사이트는 제거 (기존 사이트의 예약 시각은 유지)
+        """
+        now = self._clock()
+        current = set(site_urls)
+        for site_url in list(self.entries):
+            if site_url not in current:
+                del self.entries[site_url]
+        for site_url in current:
+            if site_url not in self.entries:
+                self.schedule(site_url, now)
+
+    def _drop_stale(self) -> None:
+        while self._heap:
+            due_at, seq, site_url = self._heap[0]
+            entry = self.entries.get(site_url)
+            if entry is not None and entry[1] == seq:
+                return
+            heapq.heappop(self._heap)
+
+    def pop_due(self) -> Optional[str]:
+        """due 상태인 사이트 중 가장 오래 기다린 것을 꺼낸다. 없으면 None."""
+        self._drop_stale()
+        if not self._heap or self._heap[0][0] > self._clock():
+            return None
+        _, _, site_url = heapq.heappop(self._heap)
+        # 처리 중에는 다시 꺼내지지 않도록 두되, reschedule 전까지 sync_sites 가 새로 넣지 않게 남겨 둔다
+        self.entries[site_url] = (float("inf"), -1)
+        return site_url
+
+    def seconds_until_due(self) -> Optional[float]:
+        """다음 사이트가 due 가 될 때까지 남은 시간(초). 예약된 사이트가 없으면 None."""
+        self._drop_stale()
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - self._clock())
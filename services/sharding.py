@@ -0,0 +1,197 @@
+"""
+사이트 그룹 샤딩 (여러 워커가 사이트 그룹을 나눠 처리).
+
+각 워커는 샤드 번호(SHARD_INDEX)와 전체 샤드 수(SHARD_COUNT)를 갖고,
+정규화한 site_url(sites/canonical.py)을 consistent hash 링에 올려 자기 샤드에 떨어지는 사이트 그룹만 처리한다.
+- 해시는 프로세스마다 같은 값이 나오도록 md5 를 쓴다. (내장 hash() 는 실행마다 달라짐)
+- 샤드마다 SHARD_VNODES 개의 가상 노드를 링에 올리므로, 샤드를 하나 늘려도 약 1/(N+1) 의 사이트만 옮겨간다.
+
+SHARD_COORDINATOR_URL 이 있으면 SHARD_INDEX 대신 코디네이터에게서 샤드 번호를 임대(lease)받는다.
+임대는 SHARD_LEASE_TTL 초마다 갱신해야 하며, 갱신하지 못한 번호는 다른 워커에게 넘어간다.
+데몬은 루프마다 ensure() 를 부르고, 한 번 실행(main.run)은 start_heartbeat() 스레드로 실행 내내 갱신한다.
+(로컬 대역 서버: tools/fake_coordinator.py)
+"""
+import bisect
+import hashlib
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from services import log
+from sites.canonical import canonical_url
+
+SHARD_INDEX = int(os.environ.get("SHARD_INDEX", "0"))
+SHARD_COUNT = int(os.environ.get("SHARD_COUNT", "1"))
+# 샤드 하나당 링에 올리는 가상 노드 수 (많을수록 분배가 고르지만 링이 커짐)
+SHARD_VNODES = int(os.environ.get("SHARD_VNODES", "256"))
+
+SHARD_COORDINATOR_URL = os.environ.get("SHARD_COORDINATOR_URL", "")
+SHARD_LEASE_TTL = float(os.environ.get("SHARD_LEASE_TTL", "60"))
+SHARD_WORKER_ID = os.environ.get("SHARD_WORKER_ID") or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """샤드 번호 0..count-1 을 가상 노드로 올린 consistent hash 링."""
+
+    def __init__(self, count: int, vnodes: int = SHARD_VNODES):
+        self.count = count
+        points: List[Tuple[int, int]] = []
+        for shard in range(count):
+            for v in range(vnodes):
+                points.append((_hash(f"shard-{shard}#{v}"), shard))
+        points.sort()
+        self._keys = [p[0] for p in points]
+        self._shards = [p[1] for p in points]
+
+    def shard_for(self, key: str) -> int:
+        if self.count <= 1:
+            return 0
+        i = bisect.bisect(self._keys, _hash(key)) % len(self._keys)
+        return self._shards[i]
+
+
+class ShardAssignment:
+    """이 워커가 맡은 샤드. owns(site_url) 로 처리 여부를 판단한다."""
+
+    def __init__(self, index: int, count: int, vnodes: int = SHARD_VNODES):
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"잘못된 샤드 설정: index={index}, count={count}")
+        self.index = index
+        self.count = count
+        self.ring = HashRing(count, vnodes)
+
+    def owns(self, site_url: str) -> bool:
+        return self.count == 1 or self.ring.shard_for(canonical_url(site_url)) == self.index
+
+    def filter_groups(self, groups: Iterable[Tuple[str, List[Dict]]]) -> Iterator[Tuple[str, List[Dict]]]:
+        for site_url, site_subs in groups:
+            if self.owns(site_url):
+                yield site_url, site_subs
+
+    def __repr__(self) -> str:
+        return f"ShardAssignment({self.index}/{self.count})"
+
+
+class CoordinatorLease:
+    """
+    코디네이터에게서 샤드 번호를 임대받는다.
+    - POST {url}/shards/acquire {"worker_id", "ttl"} → {"shard_index", "shard_count"} (빈 번호가 없으면 409)
+    - POST {url}/shards/renew   {"worker_id", "ttl"} → 200, 임대가 만료/회수됐으면 410
+    - POST {url}/shards/release {"worker_id"}
+    """
+
+    def __init__(self, base_url: str, worker_id: str = SHARD_WORKER_ID, ttl: float = SHARD_LEASE_TTL):
+        self.base_url = base_url.rstrip("/")
+        self.worker_id = worker_id
+        self.ttl = ttl
+        self.assignment: Optional[ShardAssignment] = None
+        self._renew_at = 0.0
+        self._heartbeat: Optional[threading.Thread] = None
+        self._heartbeat_stop = threading.Event()
+
+    def _post(self, path: str) -> requests.Response:
+        return requests.post(
+            f"{self.base_url}{path}",
+            json={"worker_id": self.worker_id, "ttl": self.ttl},
+            timeout=5,
+        )
+
+    def acquire(self) -> Optional[ShardAssignment]:
+        try:
+            res = self._post("/shards/acquire")
+            if res.status_code == 409:
+                log.warning("shard.none_left", "남은 샤드가 없습니다", worker=self.worker_id)
+                self.assignment = None
+                return None
+            res.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            log.error("shard.acquire_failed", "샤드 임대 실패: %s", e)
+            self.assignment = None
+            return None
+        data = res.json().get("result") or {}
+        self.assignment = ShardAssignment(int(data["shard_index"]), int(data["shard_count"]))
+        self._renew_at = time.monotonic() + self.ttl / 3
+        log.info("shard.acquired", "샤드 임대: %s", self.assignment, worker=self.worker_id)
+        return self.assignment
+
+    def ensure(self) -> bool:
+        """
+        임대 갱신 시점이면 갱신하고, 잃었으면 다시 받는다.
+        return: 맡은 샤드가 바뀌었으면 True
+        """
+        if self.assignment is not None and time.monotonic() < self._renew_at:
+            return False
+        before = (self.assignment.index, self.assignment.count) if self.assignment else None
+        if self.assignment is not None:
+            try:
+                res = self._post("/shards/renew")
+                if res.status_code != 410:
+                    res.raise_for_status()
+                    self._renew_at = time.monotonic() + self.ttl / 3
+                    return False
+                log.warning("shard.expired", "임대가 만료되어 다시 받습니다: %s", self.assignment)
+            except requests.exceptions.RequestException as e:
+                # 갱신 요청만 실패한 경우엔 TTL 안에서 다시 시도한다
+                log.warning("shard.renew_failed", "임대 갱신 실패: %s", e)
+                self._renew_at = time.monotonic() + min(5.0, self.ttl / 3)
+                return False
+        self.acquire()
+        after = (self.assignment.index, self.assignment.count) if self.assignment else None
+        return before != after
+
+    def start_heartbeat(self) -> threading.Event:
+        """
+        백그라운드 스레드에서 갱신 시점마다 ensure() 를 불러 임대를 유지한다.
+        (사이트 그룹 하나가 TTL 보다 오래 걸려도 임대가 만료되지 않도록)
+        return: 맡은 샤드가 바뀌거나 임대를 잃으면 켜지는 이벤트. 켜지면 더 이상 그룹을 가져가지 않아야 한다.
+        """
+        changed = threading.Event()
+
+        def beat():
+            while not self._heartbeat_stop.wait(max(0.5, self._renew_at - time.monotonic())):
+                if self.ensure():
+                    changed.set()
+                    return
+
+        self._heartbeat_stop.clear()
+        self._heartbeat = threading.Thread(target=beat, name="shard-lease-heartbeat", daemon=True)
+        self._heartbeat.start()
+        return changed
+
+    def stop_heartbeat(self) -> None:
+        if self._heartbeat is None:
+            return
+        self._heartbeat_stop.set()
+        self._heartbeat.join(timeout=10)
+        self._heartbeat = None
+
+    def release(self) -> None:
+        self.stop_heartbeat()
+        if self.assignment is None:
+            return
+        try:
+            self._post("/shards/release")
+        except requests.exceptions.RequestException as e:
+            log.warning("shard.release_failed", "임대 반납 실패 (TTL 후 자동 만료): %s", e)
+        self.assignment = None
+
+
+def shard_from_env() -> Tuple[Optional[ShardAssignment], Optional[CoordinatorLease]]:
+    """
+    환경 변수로 이 워커의 샤드를 정한다.
+    return: (샤드, 코디네이터 임대) — 코디네이터를 쓰지 않으면 임대는 None,
+            코디네이터에서 샤드를 받지 못하면 샤드는 None (처리할 그룹 없음)
+    """
+    if SHARD_COORDINATOR_URL:
+        lease = CoordinatorLease(SHARD_COORDINATOR_URL)
+        return lease.acquire(), lease
+    return ShardAssignment(SHARD_INDEX, SHARD_COUNT), None
@@ -0,0 +1,228 @@
+"""
+사이트 그룹 처리 임대(lease) 잠금.
+
+실행이 스케줄 간격보다 길어지면(예: Gemini 백오프) 다음 실행이 같은 사이트 그룹을
+같은 last_seen_post_id 로 다시 처리해서 알림/요약이 중복된다.
+사이트 그룹을 처리하는 동안 site_url 단위 임대를 잡고, 임대가 잡혀 있는 그룹은 건너뛴다.
+
+- 임대는 SITE_LOCK_TTL 초 뒤 만료된다. (프로세스가 죽어도 영원히 잠기지 않음)
+  처리 중에는 백그라운드 스레드가 TTL/3 마다 갱신한다.
+  기본 TTL 은 스케줄 간격(SCHEDULE_INTERVAL_SECONDS)과 같아서, 실행 마감(RUN_DEADLINE_SECONDS)보다 길고
+  죽은 실행의 임대는 다음 실행 때까지 풀린다.
+- 다른 실행이 우리가 구독 목록을 받은 이후에 처리를 끝낸 그룹도 건너뛴다.
+  (그 실행이 커서를 이미 옮겼으므로, 우리가 가진 last_seen 은 낡은 값)
+- 백엔드는 교체할 수 있다.
+  - 기본: 로컬 SQLite 파일(SITE_LOCK_PATH) — 같은 호스트/볼륨을 공유하는 실행끼리
+  - SITE_LOCK_BACKEND="패키지.모듈:클래스" — 인자 없이 생성되는 SiteLockBackend 구현 (예: Redis/DynamoDB)
+  - SITE_LOCK_PATH="" 이고 SITE_LOCK_BACKEND 도 없으면 잠금을 쓰지 않는다.
+"""
+import contextlib
+import importlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, Optional
+
+from services import deadline, log
+from sites.canonical import canonical_url
+
+SITE_LOCK_PATH = os.environ.get("SITE_LOCK_PATH", "site_locks.sqlite3")
+SITE_LOCK_BACKEND = os.environ.get("SITE_LOCK_BACKEND", "")
+SITE_LOCK_TTL = float(os.environ.get("SITE_LOCK_TTL", str(deadline.SCHEDULE_INTERVAL_SECONDS)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS site_leases (
+    site_key TEXT PRIMARY KEY,
+    owner TEXT,                 -- 임대 중인 실행 (NULL 이면 비어 있음)
+    expires_at REAL,
+    released_by TEXT,           -- 마지막으로 처리를 끝낸 실행
+    released_at REAL
+);
+"""
+
+
+class SiteLockBackend(ABC):
+    """
+    임대 저장소 인터페이스. 메서드를 하나라도 구현하지 않은 백엔드는 생성할 때(open_site_locker) 바로 실패한다.
+    fresh_since: 다른 owner 가 이 시각 이후에 처리를 끝냈으면 임대를 주지 않는다. (None 이면 검사 안 함)
+    """
+
+    @abstractmethod
+    def acquire(self, site_key: str, owner: str, ttl: float, fresh_since: Optional[float] = None) -> bool:
+        """임대를 잡았으면 True (다른 owner 가 임대 중이거나 방금 처리를 끝냈으면 False)"""
+        pass
+
+    @abstractmethod
+    def renew(self, site_key: str, owner: str, ttl: float) -> bool:
+        """임대 기한을 늘린다. 임대를 잃었으면 False"""
+        pass
+
+    @abstractmethod
+    def release(self, site_key: str, owner: str) -> None:
+        """임대를 놓고 처리를 끝낸 시각을 남긴다"""
+        pass
+
+
+class SqliteSiteLock(SiteLockBackend):
+    """SQLite 파일 기반 임대. BEGIN IMMEDIATE 로 프로세스 간 원자적으로 검사/갱신한다."""
+
+    def __init__(self, path: str = SITE_LOCK_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def acquire(self, site_key: str, owner: str, ttl: float, fresh_since: Optional[float] = None) -> bool:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT owner, expires_at, released_by, released_at FROM site_leases WHERE site_key = ?",
+                    (site_key,),
+                ).fetchone()
+                if row is not None:
+                    held_by, expires_at, released_by, released_at = row
+                    if held_by is not None and held_by != owner and expires_at > now:
+                        self._conn.execute("ROLLBACK")
+                        return False
+                    if (
+                        fresh_since is not None
+                        and released_by is not None
+                        and released_by != owner
+                        and released_at > fresh_since
+                    ):
+                        self._conn.execute("ROLLBACK")
+                        return False
+                self._conn.execute(
+                    "INSERT INTO site_leases (site_key, owner, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(site_key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at",
+                    (site_key, owner, now + ttl),
+                )
+                self._conn.execute("COMMIT")
+                return True
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def renew(self, site_key: str, owner: str, ttl: float) -> bool:
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE site_leases SET expires_at = ? WHERE site_key = ? AND owner = ?",
+                (time.time() + ttl, site_key, owner),
+            )
+            return cur.rowcount == 1
+
+    def release(self, site_key: str, owner: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE site_leases SET owner = NULL, expires_at = NULL, released_by = ?, released_at = ? "
+                "WHERE site_key = ? AND owner = ?",
+                (owner, time.time(), site_key, owner),
+            )
+
+
+class SiteLocker:
+    """
+    SiteLockBackend 위에서 임대를 잡고/갱신하고/놓는 헬퍼. 프로세스당 하나의 owner id 를 쓴다.
+
+        with locker.hold(site_url, fresh_since=synced_at) as held:
+            if not held:
+                ...  # 다른 실행이 처리 중이거나 방금 처리함 → 건너뜀
+
+    임대는 그 사이트의 커서가 전달(또는 outbox 에 기록)된 뒤에 놓아야 한다.
+    커서를 실행 끝에 한꺼번에 보내는 경우에는 acquire() 후 전송 단계를 닫고 release_all() 한다.
+    """
+
+    def __init__(self, backend: Optional[SiteLockBackend], ttl: float = SITE_LOCK_TTL, owner: str = ""):
+        self.backend = backend
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._held: Dict[str, float] = {}
+        self._held_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def acquire(self, site_url: str, fresh_since: Optional[float] = None) -> bool:
+        """임대를 잡으면 True. 잡은 임대는 release()/release_all() 전까지 자동 갱신된다."""
+        if self.backend is None:
+            return True
+        site_key = canonical_url(site_url)
+        try:
+            acquired = self.backend.acquire(site_key, self.owner, self.ttl, fresh_since)
+        except Exception as e:
+            # 잠금 저장소 장애로 크롤링 전체가 멈추지 않도록, 잠금 없이 진행한다
+            log.warning("site_lock.acquire_failed", "임대 확인 실패, 잠금 없이 진행합니다: %s", e, site=site_key)
+            return True
+        if acquired:
+            with self._held_lock:
+                self._held[site_key] = time.monotonic()
+                self._ensure_heartbeat()
+        return acquired
+
+    def release(self, site_url: str) -> None:
+        if self.backend is None:
+            return
+        site_key = canonical_url(site_url)
+        with self._held_lock:
+            if self._held.pop(site_key, None) is None:
+                return
+        try:
+            self.backend.release(site_key, self.owner)
+        except Exception as e:
+            log.warning("site_lock.release_failed", "임대 반납 실패 (TTL 후 만료): %s", e, site=site_key)
+
+    def release_all(self) -> None:
+        with self._held_lock:
+            keys = list(self._held)
+        for site_key in keys:
+            self.release(site_key)
+
+    @contextlib.contextmanager
+    def hold(self, site_url: str, fresh_since: Optional[float] = None) -> Iterator[bool]:
+        acquired = self.acquire(site_url, fresh_since)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.release(site_url)
+
+    def _ensure_heartbeat(self) -> None:
+        # self._held_lock 을 잡은 상태에서 호출
+        if self._heartbeat is None:
+            self._heartbeat = threading.Thread(target=self._renew_loop, name="site-lock-renew", daemon=True)
+            self._heartbeat.start()
+
+    def _renew_loop(self) -> None:
+        while not self._stop.wait(self.ttl / 3):
+            with self._held_lock:
+                keys = list(self._held)
+            for site_key in keys:
+                try:
+                    if not self.backend.renew(site_key, self.owner, self.ttl):
+                        log.warning("site_lock.lost", "임대를 잃었습니다", site=site_key)
+                except Exception as e:
+                    log.warning("site_lock.renew_failed", "임대 갱신 실패: %s", e, site=site_key)
+
+    def close(self) -> None:
+        self.release_all()
+        self._stop.set()
+
+
+def open_site_locker() -> SiteLocker:
+    """환경 변수 설정에 맞는 SiteLocker 를 만든다. (잠금을 쓰지 않으면 항상 통과)"""
+    if SITE_LOCK_BACKEND:
+        module_name, _, class_name = SITE_LOCK_BACKEND.partition(":")
+        backend = getattr(importlib.import_module(module_name), class_name)()
+        if not isinstance(backend, SiteLockBackend):
+            raise TypeError(f"SITE_LOCK_BACKEND={SITE_LOCK_BACKEND} 는 SiteLockBackend 를 상속해야 합니다")
+    elif SITE_LOCK_PATH:
+        backend = SqliteSiteLock(SITE_LOCK_PATH)
+    else:
+        backend = None
+    return SiteLocker(backend)
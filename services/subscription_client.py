@@ -1,10 +1,242 @@
+import codecs
+import json
+import queue
+import threading
 import time
 import requests
-from typing import List, Dict
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 import os
 
+from services import log
+from sites.canonical import canonical_url
+
 BACKEND_BASE_URL = os.environ.get("BACKEND_BASE_URL", "http://localhost:8080")
 
+# 구독 스냅샷 파일 경로. 설정하면 매 실행마다 변경분만 동기화한다. (빈 문자열이면 매번 전체 조회)
+SUBSCRIPTION_SNAPSHOT_PATH = os.environ.get("SUBSCRIPTION_SNAPSHOT_PATH", "")
+
+# 한 페이지에 받을 구독 수. 0 이면 페이지 파라미터 없이 한 번에 받는다 (구버전 백엔드 호환).
+SUBSCRIPTION_PAGE_SIZE = int(os.environ.get("SUBSCRIPTION_PAGE_SIZE", "500"))
+
+# (connect, read) 타임아웃. 스트리밍 응답에서 read 타임아웃은 "전체 응답"이 아니라 "소켓 읽기 1회" 기준이다.
+SUBSCRIPTION_TIMEOUT = (
+    float(os.environ.get("SUBSCRIPTION_CONNECT_TIMEOUT", "5")),
+    float(os.environ.get("SUBSCRIPTION_READ_TIMEOUT", "30")),
+)
+
+_CHUNK_SIZE = 64 * 1024
+_decoder = json.JSONDecoder()
+
+
+class _JsonStream:
+    """
+    바이트 청크 스트림 위에서 JSON 값을 하나씩 raw_decode 하기 위한 작은 버퍼.
+    값이 청크 경계에서 잘리면 다음 청크를 더 읽어서 다시 시도한다.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            # 이미 소비한 앞부분은 버려서 버퍼가 한 페이지 전체로 커지지 않게 한다.
+            self.buf = self.buf[self.pos:] + self._utf8.decode(chunk)
+            self.pos = 0
+            return True
+        self.buf = self.buf[self.pos:] + self._utf8.decode(b"", final=True)
+        self.pos = 0
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """공백을 건너뛰고 다음 문자를 반환한다. 스트림 끝이면 빈 문자열."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"JSON 파싱 실패: '{char}' 가 필요하지만 '{self.peek()}' 발견")
+        self.pos += 1
+
+    def value(self):
+        """다음 JSON 값 하나를 디코딩한다."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # 숫자는 청크 경계에서 잘려도 디코딩이 성공하므로, 버퍼 끝에서 끝난 값은 한 번 더 확인한다.
+            if end == len(self.buf) and not self.eof and isinstance(value, (int, float)):
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_page(chunks: Iterable[bytes], meta: Dict) -> Iterator[Dict]:
+    """
+    ApiResponse 래핑 응답을 스트리밍으로 파싱해서 result 배열의 구독을 하나씩 반환한다.
+    result 이외의 최상위 필드(next_cursor 등)는 meta 에 채운다.
+    """
+    stream = _JsonStream(chunks)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key == "result" and stream.peek() == "[":
+            stream.expect("[")
+            if stream.peek() != "]":
+                while True:
+                    yield stream.value()
+                    if stream.peek() == ",":
+                        stream.expect(",")
+                        continue
+                    break
+            stream.expect("]")
+        elif key == "result":
+            # 혹시라도 단일 객체로 올 경우
+            value = stream.value()
+            if value is not None:
+                yield value
+        else:
+            meta[key] = stream.value()
+
+        if stream.peek() == ",":
+            stream.expect(",")
+            continue
+        stream.expect("}")
+        return
+
+
+def _iter_pages(page_size: int, meta_out: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    백엔드(/internal/subscriptions)에서 활성 구독을 페이지 단위로 스트리밍해서 하나씩 반환한다.
+
+    - 요청: GET /internal/subscriptions?size={page_size}&sort=site_url[&cursor={next_cursor}]
+    - 응답: {"errorCode": null, "message": "OK", "result": [...], "next_cursor": "..."}
+      next_cursor 가 없거나 null 이면 마지막 페이지.
+    - 응답 본문은 받는 즉시 파싱하므로, 첫 구독들은 전체 목록이 도착하기 전에 처리할 수 있다.
+    - site_url 순으로 요청하므로 main.iter_site_groups() 가 사이트별 그룹을 바로 만들 수 있다.
+      (페이지 파라미터를 모르는 구버전 백엔드는 전체 목록을 한 번에 내려준다)
+    - meta_out 이 주어지면 첫 페이지의 sync_token 을 기록한다. (목록 조회 시작 시점 기준 토큰)
+    """
+    cursor: Optional[str] = None
+    page = 0
+    while True:
+        params = {}
+        if page_size > 0:
+            params = {"size": page_size, "sort": "site_url"}
+            if cursor is not None:
+                params["cursor"] = cursor
+
+        started = time.monotonic()
+        try:
+            res = requests.get(
+                f"{BACKEND_BASE_URL}/internal/subscriptions",
+                params=params,
+                timeout=SUBSCRIPTION_TIMEOUT,
+                stream=True,
+            )
+            res.raise_for_status()  # 400 이상의 에러 발생 시 예외 발생
+        except requests.exceptions.RequestException as e:
+            log.error("subscriptions.fetch_failed", "구독 목록 조회 실패: %s", e)
+            raise
+
+        meta: Dict = {}
+        count = 0
+        try:
+            for sub in _iter_page(res.iter_content(chunk_size=_CHUNK_SIZE), meta):
+                count += 1
+                yield sub
+        except requests.exceptions.RequestException as e:
+            log.error("subscriptions.fetch_failed", "구독 목록 조회 실패: %s", e)
+            raise
+        finally:
+            res.close()
+
+        if meta_out is not None and page == 0:
+            meta_out["sync_token"] = meta.get("sync_token")
+
+        page += 1
+        log.info("subscriptions.page", "페이지 %d: %d개 (%.0fms)", page, count, (time.monotonic() - started) * 1000)
+
+        cursor = meta.get("next_cursor")
+        if not cursor or page_size <= 0 or count == 0:
+            return
+
+
+_END = object()
+
+
+def iter_subscriptions(
+    page_size: int = SUBSCRIPTION_PAGE_SIZE,
+    prefetch: bool = True,
+    meta_out: Optional[Dict] = None,
+) -> Iterator[Dict]:
+    """
+    활성 구독을 하나씩 반환한다. (형식은 fetch_subscriptions() 참고)
+
+    prefetch=True 이면 백그라운드 스레드가 응답을 계속 읽어 큐에 쌓아 두므로,
+    호출 측이 사이트 하나를 크롤링하는 동안에도 다음 구독들이 도착한다.
+    큐 크기는 2 페이지 분량으로 제한해서 메모리가 전체 목록만큼 커지지 않게 한다.
+    """
+    if not prefetch:
+        yield from _iter_pages(page_size, meta_out)
+        return
+
+    buffer: "queue.Queue" = queue.Queue(maxsize=max(1, page_size) * 2)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def reader():
+        try:
+            for sub in _iter_pages(page_size, meta_out):
+                if not put(sub):
+                    return
+            put(_END)
+        except BaseException as e:  # 호출 측 스레드에서 다시 던진다
+            put(e)
+
+    thread = threading.Thread(target=reader, name="subscription-reader", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
 def fetch_subscriptions() -> List[Dict]:
     """
     백엔드(/internal/subscriptions)에 GET 요청을 보내서
@@ -26,18 +258,145 @@ def fetch_subscriptions() -> List[Dict]:
         ...
       ]
     }
+
+    전체 목록을 한 번에 메모리에 올린다. 대량 처리에는 iter_subscriptions() 를 사용할 것.
+    """
+    return list(iter_subscriptions())
+
+
+class SyncTokenMismatch(Exception):
+    """백엔드가 sync_token 을 더 이상 인정하지 않는 경우 (410/409 → 전체 재동기화 필요)"""
+
+
+def fetch_subscription_changes(sync_token: str) -> Dict:
+    """
+    GET /internal/subscriptions/changes?since={sync_token}
+    응답 result 형식:
+    {
+      "upserts": [구독, ...],        # 추가되거나 바뀐 구독 (형식은 fetch_subscriptions() 와 동일)
+      "deletes": [구독 id, ...],     # 비활성화/삭제된 구독
+      "sync_token": "다음 동기화에 쓸 토큰"
+    }
+    토큰이 만료되었거나 모르는 토큰이면(410/409) SyncTokenMismatch.
     """
     try:
-        res = requests.get(f"{BACKEND_BASE_URL}/internal/subscriptions", timeout=5)
-        res.raise_for_status()  # 400 이상의 에러 발생 시 예외 발생
-        data = res.json()
-        # ApiResponse 래핑되어 있으므로 result 필드만 사용
-        subs = data.get("result", [])
-        if not isinstance(subs, list):
-            # 혹시라도 단일 객체로 올 경우 리스트로 감싸기
-            subs = [subs]
-        return subs
+        res = requests.get(
+            f"{BACKEND_BASE_URL}/internal/subscriptions/changes",
+            params={"since": sync_token},
+            timeout=SUBSCRIPTION_TIMEOUT,
+        )
+        if res.status_code in (409, 410):
+            raise SyncTokenMismatch(f"sync_token={sync_token} status={res.status_code}")
+        res.raise_for_status()
     except requests.exceptions.RequestException as e:
-        print("구독 목록 조회 실패:", e)
+        log.error("subscriptions.changes_failed", "구독 변경분 조회 실패: %s", e)
         raise
+    return res.json().get("result") or {}
+
+
+class SubscriptionSnapshot:
+    """
+    활성 구독의 로컬 스냅샷 + sync_token.
+
+    - sync(): 토큰이 있으면 그 이후 변경분(upserts/deletes)만 받아 스냅샷에 반영하고,
+      토큰이 없거나 백엔드가 토큰을 거부하면 전체 목록을 다시 받는다.
+    - 정규화한 site_url(sites/canonical.py) → {id: 구독} 그룹 인덱스를 변경분 단위로 갱신하므로,
+      main() 이 매번 전체 구독을 다시 그룹화하지 않아도 된다.
+      표기만 다른 URL(끝 슬래시, 쿼리 순서, http/https 등)로 구독한 구독들은 한 그룹이 된다.
+    - path 가 있으면 JSON 파일로 저장/복원한다. (원자적 교체)
+    """
+
+    def __init__(self, path: str = ""):
+        self.path = path
+        self.sync_token: Optional[str] = None
+        self.subs: Dict[int, Dict] = {}
+        self.groups: Dict[str, Dict[int, Dict]] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "SubscriptionSnapshot":
+        snapshot = cls(path)
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                snapshot.sync_token = data.get("sync_token")
+                for sub in data.get("subscriptions", []):
+                    snapshot._upsert(sub)
+                log.info("snapshot.loaded", "스냅샷 로드: 구독 %d개", len(snapshot.subs))
+            except (OSError, ValueError) as e:
+                log.warning("snapshot.load_failed", "스냅샷을 읽지 못해 전체 동기화합니다: %s", e)
+                snapshot = cls(path)
+        return snapshot
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"sync_token": self.sync_token, "subscriptions": list(self.subs.values())},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self.path)
+
+    def sync(self) -> None:
+        if self.sync_token:
+            try:
+                changes = fetch_subscription_changes(self.sync_token)
+            except SyncTokenMismatch as e:
+                log.warning("snapshot.token_mismatch", "토큰 불일치, 전체 재동기화: %s", e)
+            else:
+                self.apply_changes(changes)
+                return
+        self.full_resync()
+
+    def full_resync(self) -> None:
+        meta: Dict = {}
+        self.subs = {}
+        self.groups = {}
+        for sub in iter_subscriptions(meta_out=meta):
+            self._upsert(sub)
+        self.sync_token = meta.get("sync_token")
+        log.info("snapshot.full_sync", "전체 동기화: 구독 %d개", len(self.subs))
+
+    def apply_changes(self, changes: Dict) -> None:
+        upserts = changes.get("upserts") or []
+        deletes = changes.get("deletes") or []
+        for sub in upserts:
+            self._upsert(sub)
+        for sub_id in deletes:
+            self._remove(sub_id)
+        self.sync_token = changes.get("sync_token") or self.sync_token
+        log.info("snapshot.delta_sync", "변경분 반영: upsert %d개, delete %d개 (구독 %d개)",
+                 len(upserts), len(deletes), len(self.subs))
+
+    def update_last_seen(self, subscription_id: int, last_seen_post_id: str) -> None:
+        """백엔드에 커서를 반영한 뒤 스냅샷에도 바로 반영한다."""
+        sub = self.subs.get(subscription_id)
+        if sub is not None:
+            sub["last_seen_post_id"] = last_seen_post_id
+
+    def iter_groups(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """(정규화한 site_url, 구독 목록) 을 site_url 순으로 반환한다."""
+        for site_url in sorted(self.groups):
+            yield site_url, list(self.groups[site_url].values())
+
+    def _upsert(self, sub: Dict) -> None:
+        sub_id = sub["id"]
+        old = self.subs.get(sub_id)
+        if old is not None and old["site_url"] != sub["site_url"]:
+            self._remove(sub_id)
+        self.subs[sub_id] = sub
+        self.groups.setdefault(canonical_url(sub["site_url"]), {})[sub_id] = sub
 
+    def _remove(self, sub_id: int) -> None:
+        old = self.subs.pop(sub_id, None)
+        if old is None:
+            return
+        site_key = canonical_url(old["site_url"])
+        group = self.groups.get(site_key)
+        if group is not None:
+            group.pop(sub_id, None)
+            if not group:
+                del self.groups[site_key]
@@ -1,21 +1,68 @@
 import os
-import time
-from typing import Optional
-
-import google.generativeai as genai
-from google.api_core import exceptions
-from dotenv import load_dotenv
+import threading
 from pathlib import Path
 
-# 프로젝트 루트의 .env 로드 (crawler 기준 상위 디렉터리)
+from services import deadline, log, metrics
+
+# 프로젝트 루트의 .env 경로 (crawler 기준 상위 디렉터리)
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
-load_dotenv(PROJECT_ROOT / ".env")
 
-# 환경 변수에서 API 키 읽기
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# Gemini 요청 하나의 최대 대기 시간(초). 남은 시간 예산이 더 짧으면 그만큼으로 줄인다.
+GEMINI_TIMEOUT = float(os.environ.get("GEMINI_TIMEOUT", "60"))
+
+# Gemini API 주소. 비워 두면 SDK 기본값(Google), 지정하면 REST 로 그 주소에 요청한다.
+# (부하 테스트용 가짜 서버 tools/fake_gemini.py 등, 예: http://127.0.0.1:8091)
+GEMINI_API_ENDPOINT = os.environ.get("GEMINI_API_ENDPOINT", "")
+
+# Rate Limit 방지용 요청 전 대기(초, 15 RPM 보다 살짝 느리게)와 429 재시도 대기 기준(초, 1차 ×1, 2차 ×2)
+GEMINI_MIN_INTERVAL = float(os.environ.get("GEMINI_MIN_INTERVAL", "6"))
+GEMINI_RETRY_BASE_DELAY = float(os.environ.get("GEMINI_RETRY_BASE_DELAY", "30"))
+
+# 환경 변수에서 읽은 API 키. 실제 값은 _load_backend() 가 처음 호출될 때 채운다.
+GEMINI_API_KEY = None
+
+# google.generativeai / google.api_core / dotenv 는 import 비용이 커서
+# 요약이 실제로 필요할 때(새 글이 있을 때) 한 번만 로드한다.
+_backend = None
+_backend_loaded = False
+_backend_lock = threading.Lock()
+
+
+def _load_backend():
+    """
+    .env 로드 + Gemini 클라이언트 설정을 처음 호출될 때 한 번만 수행한다.
+    return: 설정이 끝난 genai 모듈. API 키가 없으면 None.
+    """
+    global GEMINI_API_KEY, _backend, _backend_loaded
 
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+    if _backend_loaded:
+        return _backend
+
+    with _backend_lock:
+        if _backend_loaded:
+            return _backend
+
+        from dotenv import load_dotenv
+
+        load_dotenv(PROJECT_ROOT / ".env")
+        GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+
+        if GEMINI_API_KEY:
+            import google.generativeai as genai
+
+            if GEMINI_API_ENDPOINT:
+                # gRPC 는 http:// 주소를 쓸 수 없으므로 REST 로 보낸다
+                genai.configure(
+                    api_key=GEMINI_API_KEY,
+                    transport="rest",
+                    client_options={"api_endpoint": GEMINI_API_ENDPOINT},
+                )
+            else:
+                genai.configure(api_key=GEMINI_API_KEY)
+            _backend = genai
+
+        _backend_loaded = True
+        return _backend
 
 
 def _fallback_summarize(text: str, max_chars: int = 500) -> str:
@@ -50,11 +97,17 @@ def summarize(text: str, max_chars: int = 300) -> str:
     """
     Gemini API를 사용해서 요약을 생성한다.
     - Rate Limit(429) 발생 시 지수 백오프(Exponential Backoff)로 재시도한다.
+    - 대기/요청 시간은 남은 시간 예산(services.deadline)을 넘지 않는다.
+      기다리면 예산을 넘기는 경우 폴백 요약 대신 DeadlineExceeded 를 던진다. (커서를 옮기지 않도록)
     """
-    if not GEMINI_API_KEY:
-        print("[summarizer] GEMINI_API_KEY not set, use fallback summarizer")
+    genai = _load_backend()
+    if genai is None:
+        metrics.add("summaries_fallback")
+        log.info("summarizer.fallback", "GEMINI_API_KEY not set, use fallback summarizer")
         return _fallback_summarize(text, max_chars)
 
+    from google.api_core import exceptions
+
     model = genai.GenerativeModel("gemini-2.5-flash")
     prompt = (
         "다음은 웹사이트의 전체 텍스트입니다.\n"
@@ -78,44 +131,57 @@ def summarize(text: str, max_chars: int = 300) -> str:
 
     max_retries = 3  # 최대 3번까지 재시도
     # Rate Limit(15 RPM 기준) 여유를 조금 더 주기 위해 대기 시간 소폭 증가
-    base_delay = 30  # 1차 30초, 2차 60초 대기
+    base_delay = GEMINI_RETRY_BASE_DELAY  # 1차 30초, 2차 60초 대기
 
     for attempt in range(max_retries):
         try:
             # Rate Limit 방지: 매 요청마다 6초 대기 (15 RPM 보다 살짝 느리게)
-            if attempt == 0:
-                time.sleep(6)
-                print(f"[summarizer] Rate Limit 방지: 6초 대기 완료")
+            if attempt == 0 and GEMINI_MIN_INTERVAL > 0:
+                with metrics.timed("summarize_wait"):
+                    deadline.sleep(GEMINI_MIN_INTERVAL, "Gemini Rate Limit 대기")
+                log.debug("summarizer.wait", "Rate Limit 방지: %g초 대기 완료", GEMINI_MIN_INTERVAL)
             
-            print(f"[summarizer] Calling Gemini API... (Attempt {attempt + 1}/{max_retries})")
-            response = model.generate_content(prompt)
+            log.debug("summarizer.request", "Calling Gemini API... (Attempt %d/%d)", attempt + 1, max_retries)
+            with metrics.timed("gemini_request"):
+                response = model.generate_content(
+                    prompt,
+                    request_options={"timeout": deadline.request_timeout(GEMINI_TIMEOUT, "Gemini 요청")},
+                )
             summary = (response.text or "").strip()
             
             summary = summary.replace("**", "")  # 마크다운 제거
             
             if not summary:
+                metrics.add("summaries_fallback")
                 return _fallback_summarize(text, max_chars)
 
             if len(summary) > max_chars:
                 summary = summary[:max_chars] + "..."
 
-            print(f"[summarizer] Success! length={len(summary)}")
+            log.debug("summarizer.success", "Success! length=%d", len(summary))
             return summary
 
-        except exceptions.ResourceExhausted:
+        # gRPC 는 ResourceExhausted, REST 는 HTTP 429 → TooManyRequests (ResourceExhausted 의 부모)
+        except exceptions.TooManyRequests:
+            metrics.add("gemini_rate_limited")
             # 429 에러 발생 시 대기 후 재시도
             if attempt < max_retries - 1:
                 wait_time = base_delay * (attempt + 1)
-                print(f"[summarizer] ⚠️ Quota Exceeded (429). Retrying in {wait_time}s...")
-                time.sleep(wait_time)
+                log.warning("summarizer.rate_limited", "⚠️ Quota Exceeded (429). Retrying in %ss...", wait_time)
+                with metrics.timed("summarize_wait"):
+                    deadline.sleep(wait_time, "Gemini 429 백오프")
             else:
-                print("[summarizer] ❌ Max retries reached for Quota Exceeded.")
+                log.warning("summarizer.rate_limited", "❌ Max retries reached for Quota Exceeded.")
         
+        except deadline.DeadlineExceeded:
+            raise
+
         except Exception as e:
             # 그 외 에러는 바로 폴백
-            print(f"[summarizer] ⚠️ Error: {type(e).__name__}: {e}")
+            log.warning("summarizer.error", "⚠️ Error: %s: %s", type(e).__name__, e)
             break
 
     # 모든 시도 실패 시 폴백
-    print(f"[summarizer] 폴백 요약 사용 (원문 길이: {len(text)}자)")
+    metrics.add("summaries_fallback")
+    log.info("summarizer.fallback", "폴백 요약 사용 (원문 길이: %d자)", len(text))
     return _fallback_summarize(text, max_chars)
\ No newline at end of file
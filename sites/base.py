@@ -1,30 +1,155 @@
+import contextlib
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import TYPE_CHECKING, Iterator, List, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    # sites.post → sites.canonical → sites.registry → sites.base 순환 import 를 피해 타입 검사 때만 가져온다
+    from bs4 import BeautifulSoup
+
+    from .post import Post
+
+
+class RawPage(NamedTuple):
+    """
+    네트워크에서 받은 페이지 원본.
+    파싱은 다른 프로세스(services.parse_pool)에서 할 수 있으므로 soup 객체 대신 바이트만 넘긴다.
+    """
+    url: str
+    content: bytes
+    # 응답에서 정해진 인코딩. None 이면 decode_html() 이 내용으로 추정한다.
+    encoding: Optional[str] = None
+
+
+def decode_html(page: RawPage) -> str:
+    """
+    바이트를 텍스트로 바꾼다. (requests 의 res.encoding = res.apparent_encoding; res.text 와 같은 결과)
+    인코딩 추정도 CPU 를 쓰므로 파싱 쪽에서 수행한다.
+    """
+    encoding = page.encoding
+    if encoding is None:
+        from requests.compat import chardet
+
+        encoding = chardet.detect(page.content)["encoding"]
+    try:
+        return str(page.content, encoding or "utf-8", errors="replace")
+    except LookupError:
+        return str(page.content, "utf-8", errors="replace")
+
+
+@contextlib.contextmanager
+def html_soup(markup: str) -> Iterator["BeautifulSoup"]:
+    """
+    파싱한 soup 을 블록 안에서만 쓰고, 블록을 나오면 decompose() 로 트리를 바로 해제한다.
+    bs4 트리는 부모/형제 참조가 순환이라 참조만 놓으면 다음 순환 GC 까지 페이지 크기의 수십 배 메모리가 남는다.
+    블록 밖으로는 문자열/Post 처럼 트리를 참조하지 않는 값만 가지고 나와야 한다.
+    """
+    from bs4 import BeautifulSoup, Tag
+
+    soup = BeautifulSoup(markup, "html.parser")
+    try:
+        yield soup
+    finally:
+        # BeautifulSoup 객체 자신은 next_element 가 없어 soup.decompose() 만으로는 자식이 지워지지 않는다.
+        # 최상위의 문자열/Doctype 은 bs4 4.13 전에는 decompose() 가 없으므로 extract() 로 떼어 낸다
+        for element in list(soup.contents):
+            if isinstance(element, Tag):
+                element.decompose()
+            else:
+                element.extract()
+        soup.decompose()
+
 
 class SiteCrawler(ABC):
     """
     특정 사이트(예: 동국대 SW게시판)에 대한 크롤링 방법을 정의하는 베이스 클래스
+
+    크롤링은 두 단계로 나뉜다.
+    - fetch_*_page(): 네트워크에서 페이지 바이트를 받아 RawPage 로 반환 (I/O, 실패 시 None)
+    - parse_*():      RawPage → 게시물 목록/본문 텍스트 (CPU, 클래스 메서드라 프로세스 풀에서 실행 가능)
+    fetch_post_list()/fetch_post_content() 는 두 단계를 이어서 호출하는 편의 메서드다.
+
+    인스턴스는 sites.registry 가 site_type 당 하나만 만들어 재사용한다.
+    요청은 self.get() 으로 보내면 인스턴스의 세션(커넥션 풀)과 요청 간격 상태를 공유한다.
     """
 
+    # 같은 사이트에 연속으로 요청할 때 최소 간격(초, 서버 부담 감소)
+    request_interval: float = 0.0
+
+    def __init__(self):
+        self._session = None
+        self._last_request_at: Optional[float] = None
+
+    def create_session(self):
+        """이 크롤러가 쓸 requests 세션을 만든다. 기본은 재시도 없는 일반 세션"""
+        import requests
+
+        return requests.Session()
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = self.create_session()
+        return self._session
+
+    def get(self, url: str, timeout: float):
+        """
+        GET 요청 (sites.http_session.get, 남은 시간 예산 안에서).
+        직전 요청 이후 request_interval 이 지나지 않았으면 남은 만큼 기다린다.
+        """
+        from services import deadline, metrics
+        from . import http_session
+
+        if self.request_interval and self._last_request_at is not None:
+            wait = self._last_request_at + self.request_interval - time.monotonic()
+            if wait > 0:
+                with metrics.timed("request_wait"):
+                    deadline.sleep(wait, url)
+        try:
+            return http_session.get(url, timeout, session=self.session)
+        finally:
+            self._last_request_at = time.monotonic()
+
+    @abstractmethod
+    def fetch_list_page(self, list_url: str) -> Optional[RawPage]:
+        """리스트 페이지를 받아온다. 실패하면 None (또는 예외)"""
+        pass
+
     @abstractmethod
-    def fetch_post_list(self, list_url: str) -> List[Dict]:
+    def fetch_content_page(self, post_url: str) -> Optional[RawPage]:
+        """상세 페이지를 받아온다. 실패하면 None (또는 예외)"""
+        pass
+
+    @classmethod
+    @abstractmethod
+    def parse_post_list(cls, page: RawPage) -> List["Post"]:
         """
-        리스트 페이지에서 게시물 목록을 가져온다.
-        return: [
-          {
-            "id": "사이트내_게시물_ID",
-            "url": "상세페이지_URL",
-            "title": "제목",
-            "date": "2025-11-14",
-          },
-          ...
-        ]  # 최신→오래된 순
+        리스트 페이지에서 게시물 목록을 추출한다.
+        return: [Post(id="사이트내_게시물_ID", url="상세페이지_URL", title="제목", date="2025-11-14",
+                      site=site_key(page.url)), ...]  # 최신→오래된 순 (sites/post.py)
         """
         pass
 
+    @classmethod
     @abstractmethod
-    def fetch_post_content(self, post_url: str) -> str:
+    def parse_post_content(cls, page: RawPage) -> str:
         """
-        상세 페이지에서 본문 텍스트를 가져온다.
+        상세 페이지에서 본문 텍스트를 추출한다.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def fetch_post_list(self, list_url: str) -> List["Post"]:
+        from services import parse_pool
+
+        page = self.fetch_list_page(list_url)
+        if page is None:
+            return []
+        return parse_pool.parse(type(self).parse_post_list, page)
+
+    def fetch_post_content(self, post_url: str) -> str:
+        from services import parse_pool
+
+        page = self.fetch_content_page(post_url)
+        if page is None:
+            return ""
+        return parse_pool.parse(type(self).parse_post_content, page)
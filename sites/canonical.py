@@ -0,0 +1,53 @@
+"""
+목록/게시물 URL 정규화.
+
+같은 게시판(게시물)을 가리키는데 표기만 다른 URL 을 하나의 키로 모은다.
+- scheme/host 소문자화, http → https, 기본 포트(80/443)와 fragment 제거
+- 루트가 아닌 경로의 끝 슬래시 제거, 빈 경로는 "/"
+- 쿼리 파라미터 정렬, 추적용 파라미터(utm_* 등)와 사이트별 무시 파라미터(sites.registry 의 ignore_params) 제거
+
+정규화한 URL 은 사이트 그룹/샤딩/임대 키와 본문·요약 캐시 키(sites.post.Post.key)로만 쓴다.
+실제 요청은 구독/게시물에 적힌 원래 URL 로 보낸다. (서버가 끝 슬래시나 http/https 를 다르게 처리할 수 있으므로)
+"""
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from . import registry
+
+# 어느 사이트에서나 내용과 무관한 추적용 파라미터
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "dclid", "msclkid", "_ga", "_gl", "mc_cid", "mc_eid", "igshid"})
+TRACKING_PREFIXES = ("utm_",)
+
+
+def _is_ignored(name: str, site_params) -> bool:
+    key = name.lower()
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PREFIXES) or name in site_params
+
+
+def canonical_url(url: str) -> str:
+    """URL 의 정규형. 정규화할 수 없는 값(호스트 없음 등)은 앞뒤 공백만 제거해서 반환한다."""
+    url = url.strip()
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower().rstrip(".")
+    if not host:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme == "http":
+        scheme = "https"
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port in (None, 80, 443) else f"{host}:{port}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+
+    site_params = registry.ignored_params_for_host(host)
+    params = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_ignored(name, site_params)
+    )
+    return urlunsplit((scheme, netloc, path, urlencode(params), ""))
+
@@ -0,0 +1,155 @@
+"""
+크롤러 HTTP 요청 녹화/재생 (cassette).
+
+사이트 HTML 은 매일 바뀌어서 라이브 실행끼리는 시간/추출 결과를 비교할 수 없다.
+sites.http_session.get 을 지나는 요청과 응답을 파일 하나(cassette)에 녹화해 두고
+같은 바이트로 다시 실행하면 커밋 사이의 프로파일링/추출 결과 비교가 재현 가능해진다.
+
+- HTTP_CASSETTE_MODE: "" (끔, 기본) | "record" | "replay"
+- HTTP_CASSETTE_PATH: cassette 파일 경로 (기본 http_cassette.gz)
+- HTTP_CASSETTE_LATENCY: 재생할 때 응답 지연. "recorded" (녹화된 시간만큼 기다림, 기본) | "zero"
+
+record: 요청마다 URL, 상태 코드, Content-Type, 최종 URL, 걸린 시간과 본문 바이트를 파일 끝에 붙인다.
+        요청이 requests 예외로 실패하면 예외 종류/메시지를 녹화한다. 마감 초과(DeadlineExceeded)는 녹화하지 않는다.
+        실행마다 gzip 멤버가 하나씩 이어 붙는다. (gzip 은 이어 붙인 멤버를 한 스트림으로 읽는다)
+replay: 네트워크 요청 없이 녹화된 응답을 돌려준다. 같은 URL 을 여러 번 녹화했으면 녹화 순서대로 주고,
+        다 쓰면 마지막 응답을 계속 준다. 녹화에 없는 URL 은 ConnectionError (크롤러의 요청 실패 처리를 그대로 탄다)
+        녹화된 예외는 같은 종류의 requests 예외로 다시 던진다.
+
+파일 형식 (gzip 안): 항목마다 JSON 헤더 한 줄 + 본문 바이트(헤더의 length) + 줄바꿈
+    {"url": ..., "status": 200, "reason": "OK", "final_url": ..., "content_type": ..., "elapsed": 0.123, "length": 52311}
+tools/cassette.py 로 내용을 보거나, 녹화된 페이지를 파싱한 결과(추출 결과)를 JSON 으로 뽑아 버전 간에 diff 할 수 있다.
+"""
+import atexit
+import collections
+import gzip
+import json
+import os
+import threading
+from typing import Deque, Dict, Iterator, Optional, Tuple
+
+import requests
+
+from services import deadline, log, metrics
+
+HTTP_CASSETTE_MODE = os.environ.get("HTTP_CASSETTE_MODE", "")
+HTTP_CASSETTE_PATH = os.environ.get("HTTP_CASSETTE_PATH", "http_cassette.gz")
+HTTP_CASSETTE_LATENCY = os.environ.get("HTTP_CASSETTE_LATENCY", "recorded")
+
+_lock = threading.Lock()
+_writer = None
+_entries: Optional[Dict[str, Deque[Tuple[Dict, bytes]]]] = None
+
+
+def recording() -> bool:
+    return HTTP_CASSETTE_MODE == "record"
+
+
+def replaying() -> bool:
+    return HTTP_CASSETTE_MODE == "replay"
+
+
+def iter_entries(path: str) -> Iterator[Tuple[Dict, bytes]]:
+    """cassette 파일의 (헤더, 본문) 을 녹화 순서대로"""
+    with gzip.open(path, "rb") as f:
+        while True:
+            try:
+                line = f.readline()
+                if not line:
+                    return
+                header = json.loads(line)
+                body = f.read(header.get("length", 0))
+                f.read(1)
+            except EOFError:
+                # 녹화 중에 프로세스가 죽어 마지막 gzip 멤버가 닫히지 않은 경우. 그 앞까지만 쓴다
+                return
+            yield header, body
+
+
+def _append(header: Dict, body: bytes = b"") -> None:
+    global _writer
+    header["length"] = len(body)
+    data = json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n" + body + b"\n"
+    with _lock:
+        if _writer is None:
+            _writer = gzip.open(HTTP_CASSETTE_PATH, "ab")
+            atexit.register(close)
+            log.info("cassette.record", "요청을 녹화합니다: %s", HTTP_CASSETTE_PATH)
+        _writer.write(data)
+        # 실행이 중간에 죽어도 그때까지의 녹화는 읽을 수 있도록 항목마다 내보낸다
+        _writer.flush()
+
+
+def record(url: str, res, elapsed: float) -> None:
+    """받은 응답을 녹화한다. (record 모드가 아니면 아무것도 하지 않음)"""
+    if not recording():
+        return
+    _append({
+        "url": url,
+        "status": res.status_code,
+        "reason": res.reason,
+        "final_url": res.url,
+        "content_type": res.headers.get("Content-Type"),
+        "elapsed": round(elapsed, 6),
+    }, res.content)
+
+
+def record_error(url: str, error: Exception, elapsed: float) -> None:
+    """요청 실패(requests 예외)를 녹화한다."""
+    if not recording():
+        return
+    _append({"url": url, "error": type(error).__name__, "message": str(error), "elapsed": round(elapsed, 6)})
+
+
+def close() -> None:
+    """녹화 파일을 닫는다. (gzip 멤버를 마무리)"""
+    global _writer
+    with _lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+
+
+def _load() -> Dict[str, Deque[Tuple[Dict, bytes]]]:
+    global _entries
+    with _lock:
+        if _entries is None:
+            entries: Dict[str, Deque[Tuple[Dict, bytes]]] = collections.defaultdict(collections.deque)
+            for header, body in iter_entries(HTTP_CASSETTE_PATH):
+                entries[header["url"]].append((header, body))
+            _entries = entries
+            log.info("cassette.replay", "녹화된 응답으로 재생합니다: %s (URL %d개, 지연 %s)",
+                     HTTP_CASSETTE_PATH, len(entries), HTTP_CASSETTE_LATENCY)
+        return _entries
+
+
+def _next(url: str) -> Optional[Tuple[Dict, bytes]]:
+    entries = _load()
+    with _lock:
+        queue = entries.get(url)
+        if not queue:
+            return None
+        # 마지막 하나는 남겨 두고 계속 재생한다 (같은 URL 을 녹화 때보다 많이 요청하는 경우)
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+
+def replay(url: str) -> requests.Response:
+    """녹화된 응답(requests.Response). 녹화에 없으면 ConnectionError"""
+    found = _next(url)
+    if found is None:
+        metrics.add("cassette_misses")
+        raise requests.exceptions.ConnectionError(f"cassette 에 녹화되지 않은 URL 입니다: {url}")
+    header, body = found
+    if HTTP_CASSETTE_LATENCY != "zero" and header.get("elapsed"):
+        deadline.sleep(header["elapsed"], url)
+
+    if "error" in header:
+        error_cls = getattr(requests.exceptions, header["error"], None)
+        if not (isinstance(error_cls, type) and issubclass(error_cls, requests.exceptions.RequestException)):
+            error_cls = requests.exceptions.RequestException
+        raise error_cls(header.get("message", ""))
+
+    from .http_session import buffered_response
+
+    headers = {"Content-Type": header["content_type"]} if header.get("content_type") else {}
+    return buffered_response(header.get("final_url") or url, header["status"], header.get("reason"), headers, body)
@@ -1,9 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse, parse_qs
-from typing import List, Dict
+from typing import List, Optional
 import re
-from .base import SiteCrawler
+from services import deadline
+from .base import RawPage, SiteCrawler, decode_html, html_soup
+from .post import Post, site_key
 
 BASE_URL = "https://cse.dongguk.edu"
 
@@ -16,149 +16,153 @@ class DonggukCseNoticeCrawler(SiteCrawler):
     주의: 상단에 공지사항이 고정되어 있고, 그 다음에 일반 게시글이 나옴
     """
     
-    def fetch_post_list(self, list_url: str) -> List[Dict]:
+    def fetch_list_page(self, list_url: str) -> Optional[RawPage]:
+        res = self.get(list_url, timeout=10)
+        res.raise_for_status()
+        return RawPage(list_url, res.content)
+
+    def fetch_content_page(self, post_url: str) -> Optional[RawPage]:
+        try:
+            res = self.get(post_url, timeout=10)
+            res.raise_for_status()
+        except deadline.DeadlineExceeded:
+            # 시간 예산 초과는 본문 없음으로 처리하지 않고 호출자에게 넘긴다 (커서를 옮기지 않도록)
+            raise
+        except Exception as e:
+            return None
+        return RawPage(post_url, res.content)
+
+    @classmethod
+    def parse_post_list(cls, page: RawPage) -> List[Post]:
         """
         공지사항 목록 페이지에서 게시물 목록을 가져온다.
         공지사항은 스킵하고 일반 게시글만 반환한다.
         """
-        res = requests.get(list_url, timeout=10)
-        res.raise_for_status()
-        res.encoding = res.apparent_encoding
-
-        soup = BeautifulSoup(res.text, "html.parser")
-        html_text = res.text
+        html_text = decode_html(page)
+        with html_soup(html_text) as soup:
         
-        posts: List[Dict] = []
-        seen_ids = set()
+            site = site_key(page.url)
+            posts: List[Post] = []
+            seen_ids = set()
         
-        # goDetail() 함수 호출에서 게시글 ID 추출 (가장 정확한 방법)
-        go_detail_pattern = r'goDetail\((\d+)\)'
-        post_ids = list(set(re.findall(go_detail_pattern, html_text)))
+            # goDetail() 함수 호출에서 게시글 ID 추출 (가장 정확한 방법)
+            go_detail_pattern = r'goDetail\((\d+)\)'
+            post_ids = list(set(re.findall(go_detail_pattern, html_text)))
         
-        for post_id in post_ids:
-            if post_id in seen_ids:
-                continue
-            seen_ids.add(post_id)
+            for post_id in post_ids:
+                if post_id in seen_ids:
+                    continue
+                seen_ids.add(post_id)
             
-            # goDetail() 호출이 있는 요소 찾기
-            go_detail_elem = soup.find(attrs={"onclick": re.compile(rf'goDetail\({post_id}\)')})
-            if not go_detail_elem:
-                continue
+                # goDetail() 호출이 있는 요소 찾기
+                go_detail_elem = soup.find(attrs={"onclick": re.compile(rf'goDetail\({post_id}\)')})
+                if not go_detail_elem:
+                    continue
             
-            # 부모 요소에서 제목과 날짜 추출
-            parent = go_detail_elem.find_parent(["li", "div", "article", "tr"])
-            if not parent:
-                continue
+                # 부모 요소에서 제목과 날짜 추출
+                parent = go_detail_elem.find_parent(["li", "div", "article", "tr"])
+                if not parent:
+                    continue
             
-            # 제목 추출
-            title = ""
-            title_elem = parent.find("a")
-            if title_elem:
-                title = title_elem.get_text(strip=True)
-            else:
-                # 부모 텍스트에서 제목 추출
-                parent_text = parent.get_text("\n", strip=True)
-                lines = [l.strip() for l in parent_text.split("\n") if l.strip()]
-                for line in lines:
-                    if (len(line) > 10 and 
-                        not re.match(r'^\d{4}-\d{2}-\d{2}', line) and 
-                        not re.match(r'^\d+$', line) and
-                        "AI융합 관리자" not in line and 
-                        "조회수" not in line):
-                        title = line
-                        break
+                # 제목 추출
+                title = ""
+                title_elem = parent.find("a")
+                if title_elem:
+                    title = title_elem.get_text(strip=True)
+                else:
+                    # 부모 텍스트에서 제목 추출
+                    parent_text = parent.get_text("\n", strip=True)
+                    lines = [l.strip() for l in parent_text.split("\n") if l.strip()]
+                    for line in lines:
+                        if (len(line) > 10 and 
+                            not re.match(r'^\d{4}-\d{2}-\d{2}', line) and 
+                            not re.match(r'^\d+$', line) and
+                            "AI융합 관리자" not in line and 
+                            "조회수" not in line):
+                            title = line
+                            break
             
-            # 날짜 추출
-            date_text = ""
-            parent_text = parent.get_text()
-            date_match = re.search(r"\d{4}-\d{2}-\d{2}", parent_text)
-            if date_match:
-                date_text = date_match.group(0)
+                # 날짜 추출
+                date_text = ""
+                parent_text = parent.get_text()
+                date_match = re.search(r"\d{4}-\d{2}-\d{2}", parent_text)
+                if date_match:
+                    date_text = date_match.group(0)
             
-            if not title:
-                title = f"게시글 {post_id}"
+                if not title:
+                    title = f"게시글 {post_id}"
             
-            full_url = urljoin(BASE_URL, f"/article/notice/detail/{post_id}")
+                full_url = urljoin(BASE_URL, f"/article/notice/detail/{post_id}")
             
-            posts.append({
-                "id": post_id,
-                "url": full_url,
-                "title": title,
-                "date": date_text,
-            })
+                posts.append(Post(post_id, full_url, title, date_text, site))
         
-        # ID 순으로 정렬 (숫자 기준 내림차순 = 최신순)
-        posts.sort(key=lambda x: int(x["id"]) if x["id"].isdigit() else 0, reverse=True)
+            # ID 순으로 정렬 (숫자 기준 내림차순 = 최신순)
+            posts.sort(key=lambda x: int(x.id) if x.id.isdigit() else 0, reverse=True)
         
-        return posts
+            return posts
 
-    def fetch_post_content(self, post_url: str) -> str:
+    @classmethod
+    def parse_post_content(cls, page: RawPage) -> str:
         """
         상세 페이지에서 본문 텍스트를 추출한다.
         """
-        try:
-            res = requests.get(post_url, timeout=10)
-            res.raise_for_status()
-        except Exception as e:
-            return ""
-        
-        res.encoding = res.apparent_encoding
-        soup = BeautifulSoup(res.text, "html.parser")
+        with html_soup(decode_html(page)) as soup:
 
-        content = None
+            content = None
 
-        # 전략 1: div.bottom > div.contents 구조 우선 탐색
-        bottom_div = soup.find("div", class_="bottom")
-        if bottom_div:
-            content = bottom_div.find("div", class_="contents")
+            # 전략 1: div.bottom > div.contents 구조 우선 탐색
+            bottom_div = soup.find("div", class_="bottom")
+            if bottom_div:
+                content = bottom_div.find("div", class_="contents")
         
-        # 전략 2: 일반적인 본문 클래스명으로 탐색
-        if not content:
-            target_classes = ["contents", "view_con", "board_view_con", "article_view", "kboard-content"]
-            for class_name in target_classes:
-                content = soup.find("div", class_=class_name)
-                if content:
-                    break
-
-        # 전략 3: 구조 기반 탐색 (제목 형제 찾기)
-        if not content:
-            h3_title = soup.find("h3")
-            if h3_title:
-                header_div = h3_title.parent
-                # 적절한 부모 요소 찾기
-                for _ in range(2):
-                    if header_div.name not in ['div', 'section', 'article', 'header']:
-                        header_div = header_div.parent
-                    else:
+            # 전략 2: 일반적인 본문 클래스명으로 탐색
+            if not content:
+                target_classes = ["contents", "view_con", "board_view_con", "article_view", "kboard-content"]
+                for class_name in target_classes:
+                    content = soup.find("div", class_=class_name)
+                    if content:
                         break
+
+            # 전략 3: 구조 기반 탐색 (제목 형제 찾기)
+            if not content:
+                h3_title = soup.find("h3")
+                if h3_title:
+                    header_div = h3_title.parent
+                    # 적절한 부모 요소 찾기
+                    for _ in range(2):
+                        if header_div.name not in ['div', 'section', 'article', 'header']:
+                            header_div = header_div.parent
+                        else:
+                            break
                 
-                for sibling in header_div.next_siblings:
-                    if not hasattr(sibling, 'name') or not sibling.name:
-                        continue
+                    for sibling in header_div.next_siblings:
+                        if not hasattr(sibling, 'name') or not sibling.name:
+                            continue
                     
-                    classes = sibling.get("class", [])
-                    class_str = " ".join(classes) if classes else ""
+                        classes = sibling.get("class", [])
+                        class_str = " ".join(classes) if classes else ""
                     
-                    # 메타데이터와 첨부파일 영역 스킵
-                    if sibling.name == 'ul' or 'info' in class_str or "file" in class_str or "attach" in class_str:
-                        continue
+                        # 메타데이터와 첨부파일 영역 스킵
+                        if sibling.name == 'ul' or 'info' in class_str or "file" in class_str or "attach" in class_str:
+                            continue
 
-                    # 본문 후보 발견
-                    text = sibling.get_text(strip=True)
-                    if len(text) > 10 or sibling.find("img"):
-                        content = sibling
-                        break
+                        # 본문 후보 발견
+                        text = sibling.get_text(strip=True)
+                        if len(text) > 10 or sibling.find("img"):
+                            content = sibling
+                            break
 
-        if content:
-            # 스크립트, 스타일 제거
-            for script in content(["script", "style"]):
-                script.decompose()
+            if content:
+                # 스크립트, 스타일 제거
+                for script in content(["script", "style"]):
+                    script.decompose()
             
-            return content.get_text("\n", strip=True)
+                return content.get_text("\n", strip=True)
         
-        return ""
+            return ""
 
-    def _extract_id_from_href(self, href: str) -> str:
+    @staticmethod
+    def _extract_id_from_href(href: str) -> str:
         """
         URL에서 게시물 ID를 추출한다.
         예시: /article/notice/detail/1318 → 1318
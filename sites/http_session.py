@@ -0,0 +1,119 @@
+"""
+크롤러 공용 HTTP 요청.
+
+- 모든 요청의 타임아웃은 남은 시간(services.deadline)을 넘지 않도록 잘린다.
+  응답 본문도 조각 단위로 받으면서 마감을 확인하므로, 느리게 흘려보내는 서버에도 묶이지 않는다.
+- create_session(): 재시도(SSL/연결 에러, 429/5xx) + 브라우저 User-Agent 세션.
+  재시도 백오프가 남은 시간을 넘기면 더 기다리지 않고 DeadlineExceeded 를 던진다.
+- 받은 본문 바이트 수를 services.metrics 의 crawl_bytes 카운터에 더한다.
+- HTTP_CASSETTE_MODE 로 요청/응답을 녹화하거나 녹화된 응답으로 재생할 수 있다. (sites.cassette)
+"""
+import io
+import time
+from typing import Mapping, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+
+from services import deadline, metrics
+from . import cassette
+
+# 본문을 받을 때 한 번에 읽는 크기 (이 단위마다 마감을 확인)
+_CHUNK_SIZE = 64 * 1024
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+class DeadlineRetry(Retry):
+    """다음 재시도까지 기다릴 시간이 남은 시간보다 길면 재시도하지 않고 마감 초과로 끝낸다."""
+
+    def is_exhausted(self) -> bool:
+        left = deadline.remaining()
+        if left is not None and left <= self.get_backoff_time():
+            raise deadline.DeadlineExceeded(f"재시도 대기 시간이 남은 시간({max(0.0, left):.1f}s)보다 깁니다")
+        return super().is_exhausted()
+
+
+def create_session() -> requests.Session:
+    """
+    재시도 로직과 User-Agent가 포함된 세션 생성
+    """
+    session = requests.Session()
+
+    # 재시도 전략: SSL 에러, 연결 에러 등에 대해 최대 3번 재시도
+    retry_strategy = DeadlineRetry(
+        total=3,  # 최대 3번 재시도
+        backoff_factor=1,  # 1초, 2초, 4초 대기
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    )
+
+    adapter = HTTPAdapter(max_retries=retry_strategy)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # User-Agent 설정 (일반 브라우저처럼 보이게)
+    session.headers.update({"User-Agent": USER_AGENT})
+
+    return session
+
+
+def get(url: str, timeout: float, session: Optional[requests.Session] = None) -> requests.Response:
+    """
+    GET 요청. timeout 은 남은 시간만큼으로 잘리고, 본문을 다 받을 때까지 마감을 확인한다.
+    마감이 지나면 DeadlineExceeded (requests 예외가 아니므로 크롤러의 요청 실패 처리에 걸리지 않음)
+    """
+    if cassette.replaying():
+        res = cassette.replay(url)
+    else:
+        res = _fetch(url, timeout, session)
+    metrics.add("crawl_requests")
+    metrics.add("crawl_bytes", len(res.content))
+    return res
+
+
+def buffered_response(url: str, status_code: int, reason: Optional[str], headers: Mapping[str, str], body: bytes,
+                      source: Optional[requests.Response] = None) -> requests.Response:
+    """
+    이미 받아 둔 본문 바이트로 requests.Response 를 만든다. (본문을 다 받고 연결을 닫은 응답, 녹화된 응답 재생)
+    공개 속성인 raw 를 메모리 버퍼로 두므로 .content/.text 는 처음 읽을 때 여기서 읽는다.
+    source 를 주면 요청/리다이렉트 이력/쿠키/걸린 시간도 옮긴다.
+    """
+    res = requests.Response()
+    res.status_code = status_code
+    res.reason = reason
+    res.url = url
+    res.headers = CaseInsensitiveDict(headers)
+    res.encoding = get_encoding_from_headers(res.headers)
+    res.raw = io.BytesIO(body)
+    if source is not None:
+        res.request = source.request
+        res.history = source.history
+        res.cookies = source.cookies
+        res.elapsed = source.elapsed
+    return res
+
+
+def _fetch(url: str, timeout: float, session: Optional[requests.Session]) -> requests.Response:
+    started = time.perf_counter()
+    try:
+        res = (session or requests).get(url, timeout=deadline.request_timeout(timeout, url), stream=True)
+        try:
+            chunks = []
+            for chunk in res.iter_content(_CHUNK_SIZE):
+                chunks.append(chunk)
+                deadline.check(url)
+        finally:
+            res.close()
+        res = buffered_response(res.url, res.status_code, res.reason, res.headers, b"".join(chunks), source=res)
+    except requests.RequestException as e:
+        cassette.record_error(url, e, time.perf_counter() - started)
+        raise
+    cassette.record(url, res, time.perf_counter() - started)
+    return res
@@ -1,249 +1,228 @@
 import re
-import time
-from typing import List, Dict
+from typing import List, Optional
 
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse, parse_qs
 
-from .base import SiteCrawler
+from services import log
+from . import http_session
+from .base import RawPage, SiteCrawler, decode_html, html_soup
+from .post import Post, site_key
 
 
 BASE_URL = "https://www.koddi.or.kr"
 
 
-def _create_session():
-    """
-    재시도 로직과 User-Agent가 포함된 세션 생성
-    """
-    session = requests.Session()
-    
-    # 재시도 전략: SSL 에러, 연결 에러 등에 대해 최대 3번 재시도
-    retry_strategy = Retry(
-        total=3,  # 최대 3번 재시도
-        backoff_factor=1,  # 1초, 2초, 4초 대기
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET"],
-    )
-    
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
-    # User-Agent 설정 (일반 브라우저처럼 보이게)
-    session.headers.update({
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    })
-    
-    return session
-
-
 class KoddiNoticeCrawler(SiteCrawler):
     """
     한국장애인개발원 공지사항 크롤러
     예시: https://www.koddi.or.kr/bbs/notice01.jsp
     """
 
-    def fetch_post_list(self, list_url: str) -> List[Dict]:
-        """
-        공지사항 목록 페이지에서 게시물 목록을 가져온다.
-        """
+    # 요청 간 0.5초 대기 (서버 부담 감소)
+    request_interval = 0.5
+
+    def create_session(self):
+        # SSL/연결 에러 재시도 + 브라우저 User-Agent
+        return http_session.create_session()
+
+    def fetch_list_page(self, list_url: str) -> Optional[RawPage]:
         try:
-            session = _create_session()
-            res = session.get(list_url, timeout=10)
+            res = self.get(list_url, timeout=10)
             res.raise_for_status()
-            res.encoding = res.apparent_encoding
         except requests.exceptions.SSLError as e:
-            print(f"[KoddiNoticeCrawler] SSL 에러 발생: {list_url}")
-            print(f"[KoddiNoticeCrawler] 재시도 후에도 실패: {e}")
-            return []
+            log.warning("crawler.ssl_failed", "SSL 에러 (재시도 후에도 실패): %s", e,
+                        crawler="KoddiNoticeCrawler", url=list_url)
+            return None
         except requests.exceptions.RequestException as e:
-            print(f"[KoddiNoticeCrawler] 요청 실패: {list_url}")
-            print(f"[KoddiNoticeCrawler] 에러: {e}")
-            return []
-
-        soup = BeautifulSoup(res.text, "html.parser")
+            log.warning("crawler.request_failed", "요청 실패: %s", e, crawler="KoddiNoticeCrawler", url=list_url)
+            return None
+        return RawPage(list_url, res.content)
 
-        # 게시판 테이블 찾기
-        table = soup.find("table")
-        if not table:
-            print(f"[KoddiNoticeCrawler] 테이블을 찾지 못했습니다: {list_url}")
-            return []
-
-        # tbody가 있으면 tbody에서, 없으면 table에서 직접 tr 찾기
-        tbody = table.find("tbody")
-        rows = tbody.find_all("tr") if tbody else table.find_all("tr")
+    def fetch_content_page(self, post_url: str) -> Optional[RawPage]:
+        try:
+            res = self.get(post_url, timeout=10)
+            res.raise_for_status()
+        except requests.exceptions.SSLError as e:
+            log.warning("crawler.ssl_failed", "SSL 에러 (재시도 후에도 실패): %s", e,
+                        crawler="KoddiNoticeCrawler", url=post_url)
+            return None
+        except requests.exceptions.RequestException as e:
+            log.warning("crawler.request_failed", "요청 실패: %s", e, crawler="KoddiNoticeCrawler", url=post_url)
+            return None
+        return RawPage(post_url, res.content)
 
-        posts: List[Dict] = []
-        for row in rows:
-            # 헤더 행 스킵 (th 태그가 있으면 헤더)
-            if row.find("th"):
-                continue
+    @classmethod
+    def parse_post_list(cls, page: RawPage) -> List[Post]:
+        """
+        공지사항 목록 페이지에서 게시물 목록을 가져온다.
+        """
+        list_url = page.url
+        with html_soup(decode_html(page)) as soup:
+
+            # 게시판 테이블 찾기
+            table = soup.find("table")
+            if not table:
+                log.warning("crawler.no_table", "목록 테이블을 찾지 못했습니다",
+                            crawler="KoddiNoticeCrawler", url=list_url)
+                return []
+
+            # tbody가 있으면 tbody에서, 없으면 table에서 직접 tr 찾기
+            tbody = table.find("tbody")
+            rows = tbody.find_all("tr") if tbody else table.find_all("tr")
+
+            site = site_key(page.url)
+            posts: List[Post] = []
+            for row in rows:
+                # 헤더 행 스킵 (th 태그가 있으면 헤더)
+                if row.find("th"):
+                    continue
 
-            # a 태그 찾기 (제목 링크)
-            a = row.find("a")
-            if not a or not a.get("href"):
-                continue
+                # a 태그 찾기 (제목 링크)
+                a = row.find("a")
+                if not a or not a.get("href"):
+                    continue
 
-            href = a.get("href", "")
-            title = a.get_text(strip=True)
+                href = a.get("href", "")
+                title = a.get_text(strip=True)
             
-            if not title:
-                continue
-
-            # 목록 페이지 URL을 기준으로 상대 경로를 절대 경로로 변환
-            # href가 "./notice01_view.jsp?brdNum=7427967&..." 형식
-            url = urljoin(list_url, href)
-
-            # URL에서 게시글 ID 추출
-            post_id = self._extract_id_from_href(href)
-
-            # 테이블 구조에서 날짜 추출
-            tds = row.find_all("td")
-            date_text = ""
-            if len(tds) >= 4:  # 번호, 구분, 제목, 등록일, 조회수, 파일
-                # 등록일은 보통 뒤에서 두 번째 또는 세 번째 td
-                for td in reversed(tds):
-                    td_text = td.get_text(strip=True)
-                    # YYYY-MM-DD 형식 찾기
-                    m = re.search(r"\d{4}-\d{2}-\d{2}", td_text)
-                    if m:
-                        date_text = m.group(0)
-                        break
-
-            posts.append({
-                "id": post_id,
-                "url": url,
-                "title": title,
-                "date": date_text,
-            })
-
-        # 사이트가 최신→오래된 순으로 내려준다고 가정
-        return posts
+                if not title:
+                    continue
 
-    def fetch_post_content(self, post_url: str) -> str:
+                # 목록 페이지 URL을 기준으로 상대 경로를 절대 경로로 변환
+                # href가 "./notice01_view.jsp?brdNum=7427967&..." 형식
+                url = urljoin(list_url, href)
+
+                # URL에서 게시글 ID 추출
+                post_id = cls._extract_id_from_href(href)
+
+                # 테이블 구조에서 날짜 추출
+                tds = row.find_all("td")
+                date_text = ""
+                if len(tds) >= 4:  # 번호, 구분, 제목, 등록일, 조회수, 파일
+                    # 등록일은 보통 뒤에서 두 번째 또는 세 번째 td
+                    for td in reversed(tds):
+                        td_text = td.get_text(strip=True)
+                        # YYYY-MM-DD 형식 찾기
+                        m = re.search(r"\d{4}-\d{2}-\d{2}", td_text)
+                        if m:
+                            date_text = m.group(0)
+                            break
+
+                posts.append(Post(post_id, url, title, date_text, site))
+
+            # 사이트가 최신→오래된 순으로 내려준다고 가정
+            return posts
+
+    @classmethod
+    def parse_post_content(cls, page: RawPage) -> str:
         """
         상세 페이지에서 본문 텍스트를 최대한 깨끗하게 추출한다.
         """
-        try:
-            session = _create_session()
-            time.sleep(0.5)  # 요청 간 0.5초 대기 (서버 부담 감소)
-            res = session.get(post_url, timeout=10)
-            res.raise_for_status()
-            res.encoding = res.apparent_encoding
-        except requests.exceptions.SSLError as e:
-            print(f"[KoddiNoticeCrawler] SSL 에러 발생: {post_url}")
-            print(f"[KoddiNoticeCrawler] 재시도 후에도 실패: {e}")
-            return ""
-        except requests.exceptions.RequestException as e:
-            print(f"[KoddiNoticeCrawler] 요청 실패: {post_url}")
-            print(f"[KoddiNoticeCrawler] 에러: {e}")
-            return ""
-
-        soup = BeautifulSoup(res.text, "html.parser")
+        with html_soup(decode_html(page)) as soup:
 
-        # 한국장애인개발원 사이트는 본문이 테이블 구조로 되어 있음
-        # "공지사항" 제목 또는 "공지사항 읽기" 텍스트 근처의 테이블 찾기
-        content = None
-        
-        # 방법 1: "공지사항" 제목 아래의 테이블 찾기
-        # h1, h2, h3 등 다양한 태그에서 "공지사항" 찾기
-        for tag_name in ["h1", "h2", "h3", "h4"]:
-            title_tag = soup.find(tag_name, string=lambda s: s and "공지사항" in str(s))
-            if title_tag:
-                # 제목 다음에 오는 테이블 찾기
-                table = title_tag.find_next("table")
-                if table:
-                    content = table
-                    break
+            # 한국장애인개발원 사이트는 본문이 테이블 구조로 되어 있음
+            # "공지사항" 제목 또는 "공지사항 읽기" 텍스트 근처의 테이블 찾기
+            content = None
         
-        # 방법 2: "공지사항 읽기" 텍스트 근처의 테이블 찾기
-        if not content:
-            read_text = soup.find(string=lambda s: s and "공지사항 읽기" in str(s))
-            if read_text:
-                # 텍스트가 포함된 요소의 부모나 다음 형제에서 테이블 찾기
-                parent = read_text.find_parent()
-                if parent:
-                    table = parent.find_next("table")
+            # 방법 1: "공지사항" 제목 아래의 테이블 찾기
+            # h1, h2, h3 등 다양한 태그에서 "공지사항" 찾기
+            for tag_name in ["h1", "h2", "h3", "h4"]:
+                title_tag = soup.find(tag_name, string=lambda s: s and "공지사항" in str(s))
+                if title_tag:
+                    # 제목 다음에 오는 테이블 찾기
+                    table = title_tag.find_next("table")
                     if table:
                         content = table
+                        break
+        
+            # 방법 2: "공지사항 읽기" 텍스트 근처의 테이블 찾기
+            if not content:
+                read_text = soup.find(string=lambda s: s and "공지사항 읽기" in str(s))
+                if read_text:
+                    # 텍스트가 포함된 요소의 부모나 다음 형제에서 테이블 찾기
+                    parent = read_text.find_parent()
+                    if parent:
+                        table = parent.find_next("table")
+                        if table:
+                            content = table
         
-        # 방법 3: 페이지 내 모든 테이블 중 본문이 있을 가능성이 높은 테이블 찾기
-        if not content:
-            all_tables = soup.find_all("table")
-            for table in all_tables:
-                table_text = table.get_text(strip=True)
+            # 방법 3: 페이지 내 모든 테이블 중 본문이 있을 가능성이 높은 테이블 찾기
+            if not content:
+                all_tables = soup.find_all("table")
+                for table in all_tables:
+                    table_text = table.get_text(strip=True)
                 
-                # "등록일", "조회수", "첨부파일" 같은 메타데이터가 있으면 본문일 가능성 높음
-                # 메타데이터가 있으면 길이와 상관없이 본문으로 판단
-                has_metadata = any(keyword in table_text for keyword in ["등록일", "조회수", "첨부파일"])
+                    # "등록일", "조회수", "첨부파일" 같은 메타데이터가 있으면 본문일 가능성 높음
+                    # 메타데이터가 있으면 길이와 상관없이 본문으로 판단
+                    has_metadata = any(keyword in table_text for keyword in ["등록일", "조회수", "첨부파일"])
                 
-                if has_metadata:
-                    # 메타데이터가 있으면 본문일 가능성이 매우 높음 (길이 제한 없음)
-                    content = table
-                    break
-                elif len(table_text) > 50:  # 메타데이터가 없어도 50자 이상이면 본문일 가능성
-                    # 하지만 메타데이터가 있는 테이블을 우선 찾기 위해 계속 탐색
-                    # (나중에 더 나은 테이블을 찾을 수 있으므로)
-                    if not content:  # 아직 본문을 찾지 못했으면 임시로 저장
+                    if has_metadata:
+                        # 메타데이터가 있으면 본문일 가능성이 매우 높음 (길이 제한 없음)
                         content = table
+                        break
+                    elif len(table_text) > 50:  # 메타데이터가 없어도 50자 이상이면 본문일 가능성
+                        # 하지만 메타데이터가 있는 테이블을 우선 찾기 위해 계속 탐색
+                        # (나중에 더 나은 테이블을 찾을 수 있으므로)
+                        if not content:  # 아직 본문을 찾지 못했으면 임시로 저장
+                            content = table
         
-        # 방법 4: 일반적인 div 구조 시도
-        if not content:
-            content = (
-                soup.find("div", class_="board-view")
-                or soup.find("div", class_="board_view")
-                or soup.find("div", class_="view-content")
-                or soup.find("div", class_="view_content")
-                or soup.find("div", id="view-content")
-                or soup.find("div", id="viewContent")
-                or soup.find("div", class_="content")
-                or soup.find("div", class_="bbs-content")
-                or soup.find("div", class_="board-content")
-            )
-
-        # 본문을 못 찾으면 빈 문자열 반환 (전체 페이지 반환 방지)
-        if content is None:
-            print(f"[KoddiNoticeCrawler] 본문 영역을 찾지 못했습니다: {post_url}")
-            # 디버깅: HTML 일부 출력
-            print(f"[KoddiNoticeCrawler] HTML 샘플 (처음 500자): {soup.get_text()[:500]}")
-            return ""
-
-        # 테이블인 경우, 텍스트 추출 및 정리
-        if content.name == "table":
-            import re
-            # 테이블 전체 텍스트를 공백으로 구분하여 가져오기
-            # separator=" "를 사용하면 셀 간 공백으로 연결됨
-            raw_text = content.get_text(separator=" ", strip=True)
+            # 방법 4: 일반적인 div 구조 시도
+            if not content:
+                content = (
+                    soup.find("div", class_="board-view")
+                    or soup.find("div", class_="board_view")
+                    or soup.find("div", class_="view-content")
+                    or soup.find("div", class_="view_content")
+                    or soup.find("div", id="view-content")
+                    or soup.find("div", id="viewContent")
+                    or soup.find("div", class_="content")
+                    or soup.find("div", class_="bbs-content")
+                    or soup.find("div", class_="board-content")
+                )
+
+            # 본문을 못 찾으면 빈 문자열 반환 (전체 페이지 반환 방지)
+            if content is None:
+                log.warning("crawler.no_content", "본문 영역을 찾지 못했습니다",
+                            crawler="KoddiNoticeCrawler", url=page.url)
+                # 디버깅용 HTML 일부는 debug 수준에서만 만든다
+                log.debug("crawler.html_sample", "HTML 샘플 (처음 500자)", crawler="KoddiNoticeCrawler", url=page.url,
+                          text=lambda: soup.get_text()[:500])
+                return ""
+
+            # 테이블인 경우, 텍스트 추출 및 정리
+            if content.name == "table":
+                # 테이블 전체 텍스트를 공백으로 구분하여 가져오기
+                # separator=" "를 사용하면 셀 간 공백으로 연결됨
+                raw_text = content.get_text(separator=" ", strip=True)
             
-            # 불필요한 공백 정리 (연속된 공백을 하나로)
-            cleaned_text = re.sub(r'\s+', ' ', raw_text)
+                # 불필요한 공백 정리 (연속된 공백을 하나로)
+                cleaned_text = re.sub(r'\s+', ' ', raw_text)
             
-            # 메뉴 키워드가 포함된 짧은 텍스트 제거
-            lines = cleaned_text.split('\n')
-            filtered_lines = []
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                # 메뉴 키워드가 포함된 짧은 줄 스킵
-                menu_keywords = ["메뉴", "로그인", "회원가입", "검색", "홈", "사이트맵", "HOME"]
-                if len(line) < 20 and any(kw in line for kw in menu_keywords):
-                    continue
-                filtered_lines.append(line)
+                # 메뉴 키워드가 포함된 짧은 텍스트 제거
+                lines = cleaned_text.split('\n')
+                filtered_lines = []
+                for line in lines:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    # 메뉴 키워드가 포함된 짧은 줄 스킵
+                    menu_keywords = ["메뉴", "로그인", "회원가입", "검색", "홈", "사이트맵", "HOME"]
+                    if len(line) < 20 and any(kw in line for kw in menu_keywords):
+                        continue
+                    filtered_lines.append(line)
             
-            result = "\n".join(filtered_lines)
+                result = "\n".join(filtered_lines)
             
-            # 최종 정리: 연속된 줄바꿈을 2개로 제한
-            result = re.sub(r'\n\n+', '\n\n', result)
+                # 최종 정리: 연속된 줄바꿈을 2개로 제한
+                result = re.sub(r'\n\n+', '\n\n', result)
             
-            return result.strip()
-        else:
-            return content.get_text("\n", strip=True)
+                return result.strip()
+            else:
+                return content.get_text("\n", strip=True)
 
-    def _extract_id_from_href(self, href: str) -> str:
+    @staticmethod
+    def _extract_id_from_href(href: str) -> str:
         """
         URL에서 게시물 ID를 추출한다.
         한국장애인개발원 사이트는 notice01_view.jsp?brdNum=7427967 형식
@@ -0,0 +1,74 @@
+"""
+크롤러가 목록 페이지에서 뽑은 게시물 하나 (Post).
+
+게시물은 목록 파싱 → 새 게시물 필터 → 본문/요약 캐시 → 알림 payload 까지 그룹 안의 모든 단계를 지나므로
+dict 대신 __slots__ 클래스로 둔다. (게시물당 메모리가 작고 속성 접근이 빠르다)
+파생 값은 만들 때 한 번만 계산한다. 파싱 풀에서 만들면 그 계산도 워커 프로세스에서 끝난다.
+- site: 목록 페이지 URL 을 정규화한 사이트 키. sys.intern 해서 같은 사이트의 게시물이 문자열 하나를 공유한다.
+- key: 정규화한 게시물 URL (URL 이 없으면 게시물 ID). 본문/요약 캐시와 알림 준비 단계의 키
+- date_ordinal: 게시일(date)의 date.toordinal(). 날짜를 읽을 수 없으면 0
+"""
+import re
+import sys
+from datetime import date as _date
+from typing import Dict
+
+from .canonical import canonical_url
+
+# 2025-11-14 / 2025.11.14 / 2025/11/14 (앞뒤 공백, 요일 등은 무시)
+_DATE_RE = re.compile(r"(\d{4})\s*[-./]\s*(\d{1,2})\s*[-./]\s*(\d{1,2})")
+
+
+def site_key(list_url: str) -> str:
+    """목록 페이지 URL → Post.site 에 넣을 사이트 키 (정규화 + intern). 파서에서 페이지마다 한 번 호출한다."""
+    return sys.intern(canonical_url(list_url))
+
+
+def date_ordinal(text: str) -> int:
+    """게시일 문자열의 date.toordinal(). 읽을 수 없으면 0"""
+    match = _DATE_RE.search(text) if text else None
+    if match is None:
+        return 0
+    try:
+        return _date(int(match.group(1)), int(match.group(2)), int(match.group(3))).toordinal()
+    except ValueError:
+        return 0
+
+
+class Post:
+    """목록의 게시물 하나. 목록은 최신→오래된 순 List[Post] 로 다룬다."""
+
+    __slots__ = ("id", "url", "title", "date", "site", "key", "date_ordinal")
+
+    def __init__(self, id: str, url: str, title: str, date: str = "", site: str = ""):  # noqa: A002 - 게시물 ID
+        self.id = id
+        self.url = url
+        self.title = title
+        self.date = date
+        self.site = sys.intern(site)
+        self.key = canonical_url(url) if url else str(id or "")
+        self.date_ordinal = date_ordinal(date)
+
+    def __reduce__(self):
+        # 파싱 풀에서 받아올 때 key/date_ordinal 을 다시 계산하지 않도록 모든 값을 그대로 넘긴다
+        return _restore, (self.id, self.url, self.title, self.date, self.site, self.key, self.date_ordinal)
+
+    def __repr__(self) -> str:
+        return f"Post(id={self.id!r}, url={self.url!r}, title={self.title!r}, date={self.date!r})"
+
+    def to_dict(self) -> Dict:
+        """크롤러가 뽑은 필드만 dict 로 (JSON 출력/비교용)"""
+        return {"id": self.id, "url": self.url, "title": self.title, "date": self.date}
+
+
+def _restore(id, url, title, date, site, key, ordinal) -> Post:  # noqa: A002
+    post = Post.__new__(Post)
+    post.id = id
+    post.url = url
+    post.title = title
+    post.date = date
+    # 다른 프로세스에서 온 문자열이므로 이 프로세스에서 다시 intern 한다
+    post.site = sys.intern(site)
+    post.key = key
+    post.date_ordinal = ordinal
+    return post
@@ -0,0 +1,147 @@
+"""
+사이트 크롤러 레지스트리.
+
+- 크롤러는 site_type, 모듈/클래스 이름, 호스트 목록으로 등록한다.
+  크롤러 모듈(bs4 등)은 그 사이트를 실제로 처음 크롤링할 때 import 한다. (main 기동 시간 유지)
+- 호스트 조회는 dict 조회다. 호스트를 점(.) 단위 접미사로 긴 것부터 찾으므로
+  등록된 크롤러 수와 관계없이 호스트 라벨 수만큼만 본다. (www.kead.or.kr → www.kead.or.kr, kead.or.kr, or.kr, kr)
+- 크롤러 인스턴스는 site_type 당 하나만 만들어 재사용한다.
+  (세션/커넥션 풀, 요청 간격 같은 사이트별 상태를 실행 내내 유지)
+- 등록되지 않은 사이트는 UnknownSiteError 를 던진다. 다른 사이트용 크롤러로 요청을 보내지 않는다.
+- ignore_params: URL 정규화(sites/canonical.py) 때 버릴 사이트 고유 쿼리 파라미터 (표시 방식/리다이렉트 등 내용과 무관한 값)
+
+새 크롤러는 아래 기본 등록 목록에 추가하거나, 다른 모듈에서 register() 를 호출해 등록한다.
+"""
+import importlib
+import threading
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .base import SiteCrawler
+
+
+class CrawlerSpec(NamedTuple):
+    site_type: str
+    module: str
+    class_name: str
+    # 이 크롤러가 맡는 호스트 (하위 도메인 포함, 예: "kead.or.kr" → www.kead.or.kr 도 매칭)
+    hosts: Tuple[str, ...]
+    # URL 정규화 때 버릴 쿼리 파라미터
+    ignore_params: FrozenSet[str] = frozenset()
+
+
+class UnknownSiteError(LookupError):
+    """구독의 site_type/site_url 에 맞는 크롤러가 등록되어 있지 않은 경우"""
+
+
+_specs: Dict[str, CrawlerSpec] = {}
+_hosts: Dict[str, str] = {}
+_instances: Dict[str, SiteCrawler] = {}
+_instances_lock = threading.Lock()
+
+
+def _normalize_host(host: str) -> str:
+    return host.strip().lower().rstrip(".")
+
+
+def register(
+    site_type: str,
+    module: str,
+    class_name: str,
+    hosts: Iterable[str] = (),
+    ignore_params: Iterable[str] = (),
+) -> CrawlerSpec:
+    """
+    크롤러를 등록한다. 같은 호스트를 다른 site_type 이 이미 쓰고 있으면 ValueError.
+    """
+    spec = CrawlerSpec(
+        site_type, module, class_name, tuple(_normalize_host(h) for h in hosts), frozenset(ignore_params)
+    )
+    for host in spec.hosts:
+        owner = _hosts.get(host)
+        if owner is not None and owner != site_type:
+            raise ValueError(f"호스트 {host} 는 이미 {owner} 크롤러에 등록되어 있습니다")
+    previous = _specs.get(site_type)
+    if previous is not None:
+        for host in previous.hosts:
+            _hosts.pop(host, None)
+    _specs[site_type] = spec
+    for host in spec.hosts:
+        _hosts[host] = site_type
+    with _instances_lock:
+        _instances.pop(site_type, None)
+    return spec
+
+
+def site_types() -> List[str]:
+    return list(_specs)
+
+
+def site_type_for_url(url: str) -> Optional[str]:
+    """URL 호스트로 site_type 을 찾는다. 없으면 None"""
+    return site_type_for_host(urlsplit(url.strip()).hostname or "")
+
+
+def site_type_for_host(host: str) -> Optional[str]:
+    host = _normalize_host(host)
+    if not host:
+        return None
+    labels = host.split(".")
+    for i in range(len(labels)):
+        site_type = _hosts.get(".".join(labels[i:]))
+        if site_type is not None:
+            return site_type
+    return None
+
+
+def ignored_params_for_host(host: str) -> FrozenSet[str]:
+    """호스트에 등록된 크롤러가 URL 정규화 때 버리는 쿼리 파라미터"""
+    site_type = site_type_for_host(host)
+    return _specs[site_type].ignore_params if site_type is not None else frozenset()
+
+
+def resolve_site_type(sub: Dict) -> str:
+    """
+    구독에 쓸 site_type. 등록된 site_type 이 지정되어 있으면 그대로, 아니면 site_url 호스트로 찾는다.
+    둘 다 없으면 UnknownSiteError
+    """
+    site_type = sub.get("site_type")
+    if site_type in _specs:
+        return site_type
+    url = sub.get("site_url") or ""
+    found = site_type_for_url(url)
+    if found is None:
+        raise UnknownSiteError(f"지원하지 않는 사이트입니다: site_type={site_type}, site_url={url}")
+    return found
+
+
+def get_crawler(site_type: str) -> SiteCrawler:
+    """site_type 의 크롤러 인스턴스 (처음 호출될 때 모듈을 import 해서 만들고 이후 재사용)"""
+    crawler = _instances.get(site_type)
+    if crawler is not None:
+        return crawler
+    spec = _specs.get(site_type)
+    if spec is None:
+        raise UnknownSiteError(f"등록되지 않은 site_type 입니다: {site_type}")
+    with _instances_lock:
+        crawler = _instances.get(site_type)
+        if crawler is None:
+            module = importlib.import_module(spec.module)
+            crawler = _instances[site_type] = getattr(module, spec.class_name)()
+    return crawler
+
+
+def crawler_for(sub: Dict) -> SiteCrawler:
+    """구독에 맞는 크롤러 인스턴스. 맞는 크롤러가 없으면 UnknownSiteError"""
+    return get_crawler(resolve_site_type(sub))
+
+
+# 기본 크롤러
+register("DONGGUK_SW", "sites.dongguk_sw_board", "DonggukSwBoardCrawler", ["sw.dongguk.edu"])
+register("DONGGUK_CSE", "sites.dongguk_cse_notice", "DonggukCseNoticeCrawler", ["cse.dongguk.edu"])
+# next: 로그인 후 돌아갈 경로, view_type: 목록 표시 형식 — 목록 내용과 무관
+register("KBUWEL", "sites.kbuwel_notice", "KbuwelNoticeCrawler", ["web.kbuwel.or.kr"], ignore_params=["next"])
+register("ABLE_NEWS", "sites.ablenews", "AbleNewsCrawler", ["ablenews.co.kr"], ignore_params=["view_type"])
+register("KEAD", "sites.kead_notice", "KeadNoticeCrawler", ["kead.or.kr"])
+register("SILWEL", "sites.silwel_notice", "SilwelNoticeCrawler", ["silwel.or.kr"])
+register("KODDI", "sites.koddi_notice", "KoddiNoticeCrawler", ["koddi.or.kr"])
@@ -0,0 +1,141 @@
+"""
+HTTP cassette(sites/cassette.py 로 녹화한 파일) 도구.
+
+- ls      : 녹화된 요청 목록 (URL, 상태, 바이트, 걸린 시간)과 합계
+- extract : 녹화된 페이지를 현재 코드의 파서로 파싱한 결과(추출 결과)를 JSON 으로 쓴다.
+            두 버전에서 같은 cassette 로 뽑은 결과를 diff 하면 파서 변경으로 달라진 게시물/본문이 보인다.
+
+extract 는 페이지 종류를 이렇게 정한다.
+  1) 모든 페이지를 호스트에 맞는 크롤러의 parse_post_list 로 파싱해 본다.
+  2) 어떤 목록 결과에 게시물 URL 로 나온 페이지는 상세 페이지 → parse_post_content 로 다시 파싱
+  3) 나머지 중 게시물이 나온 페이지는 목록 페이지, 아무것도 안 나온 페이지는 unknown
+같은 URL 이 여러 번 녹화되어 있으면 마지막 응답을 쓴다.
+
+사용 예:
+    HTTP_CASSETTE_MODE=record python main.py                 # 라이브 실행을 녹화 (http_cassette.gz)
+    HTTP_CASSETTE_MODE=replay HTTP_CASSETTE_LATENCY=zero python main.py
+    python tools/cassette.py ls http_cassette.gz
+    python tools/cassette.py extract http_cassette.gz -o extract_new.json
+    diff extract_old.json extract_new.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# 추출 결과 비교가 목적이므로 파싱 풀 없이 현재 프로세스에서 파싱한다
+os.environ.setdefault("PARSE_POOL_SIZE", "1")
+
+from sites import registry  # noqa: E402
+from sites.base import RawPage  # noqa: E402
+from sites.cassette import iter_entries  # noqa: E402
+
+
+def cmd_ls(args) -> int:
+    count = 0
+    errors = 0
+    total_bytes = 0
+    total_elapsed = 0.0
+    urls = set()
+    for header, body in iter_entries(args.path):
+        count += 1
+        urls.add(header["url"])
+        total_bytes += len(body)
+        total_elapsed += header.get("elapsed", 0.0)
+        status = header.get("status") or header.get("error")
+        if "error" in header:
+            errors += 1
+        print(f"{status!s:>18} {len(body) / 1024:>8.1f}KiB {header.get('elapsed', 0.0) * 1000:>8.1f}ms  {header['url']}")
+    print(f"[cassette] 요청 {count}개 (URL {len(urls)}개, 실패 {errors}개), 본문 {total_bytes / 1024 / 1024:.1f} MiB, "
+          f"녹화된 시간 합계 {total_elapsed:.1f}s, 파일 {os.path.getsize(args.path) / 1024 / 1024:.1f} MiB")
+    return 0
+
+
+def _crawler_class(url: str):
+    site_type = registry.site_type_for_url(url)
+    if site_type is None:
+        return None, None
+    return site_type, type(registry.get_crawler(site_type))
+
+
+def _parse(fn, page: RawPage):
+    try:
+        # 파서의 디버그 출력은 결과 JSON 과 섞이지 않게 버린다
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(page), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def extract(path: str) -> List[Dict]:
+    pages: Dict[str, bytes] = {}
+    for header, body in iter_entries(path):
+        if "error" not in header and 200 <= header.get("status", 0) < 300:
+            pages[header["url"]] = body
+
+    lists: Dict[str, tuple] = {}
+    post_urls = set()
+    for url, body in pages.items():
+        site_type, crawler_cls = _crawler_class(url)
+        if crawler_cls is None:
+            continue
+        posts, error = _parse(crawler_cls.parse_post_list, RawPage(url, body))
+        lists[url] = (site_type, posts, error)
+        post_urls.update(post.url for post in posts or [])
+
+    results = []
+    for url in sorted(pages):
+        site_type, crawler_cls = _crawler_class(url)
+        if crawler_cls is None:
+            results.append({"url": url, "kind": "unknown_site"})
+            continue
+        if url in post_urls:
+            text, error = _parse(crawler_cls.parse_post_content, RawPage(url, pages[url]))
+            entry = {"url": url, "site_type": site_type, "kind": "content", "text": text}
+        else:
+            _, posts, error = lists[url]
+            entry = {"url": url, "site_type": site_type, "kind": "list" if posts else "unknown",
+                     "posts": [post.to_dict() for post in posts] if posts is not None else None}
+        if error:
+            entry["error"] = error
+        results.append(entry)
+    return results
+
+
+def cmd_extract(args) -> int:
+    results = extract(args.path)
+    text = json.dumps(results, ensure_ascii=False, indent=1, sort_keys=True) + "\n"
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+        kinds: Dict[str, int] = {}
+        for entry in results:
+            kinds[entry["kind"]] = kinds.get(entry["kind"], 0) + 1
+        print(f"[cassette] 추출 결과 {len(results)}개 {kinds} → {args.output}")
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="HTTP cassette tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ls = sub.add_parser("ls", help="녹화된 요청 목록")
+    ls.add_argument("path")
+    ls.set_defaults(func=cmd_ls)
+    ex = sub.add_parser("extract", help="녹화된 페이지의 추출 결과를 JSON 으로")
+    ex.add_argument("path")
+    ex.add_argument("-o", "--output", help="출력 파일 (기본: 표준 출력)")
+    ex.set_defaults(func=cmd_extract)
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
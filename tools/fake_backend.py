@@ -0,0 +1,311 @@
+"""
+로컬 테스트용 백엔드 대역(stand-in) 서버.
+
+실제 백엔드의 내부 API 중 크롤러가 사용하는 엔드포인트만 흉내 낸다.
+- GET   /internal/subscriptions            (?size=&cursor= 이면 site_url 순 페이지네이션, sync_token 포함)
+- GET   /internal/subscriptions/changes?since={sync_token}  (변경분, 모르는 토큰이면 410)
+- POST  /internal/alerts
+- POST  /internal/alerts/bulk              (bulk_enabled=False 이면 404)
+- PATCH /internal/subscriptions/{id}/last_seen
+- PATCH /internal/subscriptions/last_seen  (bulk, bulk_enabled=False 이면 404)
+- POST  /internal/posts, /internal/posts/bulk  (ref 모드 게시물 레코드)
+
+Content-Encoding: gzip 본문을 지원하며, requests 에는 실제 전송된(압축된) 바이트 수가 기록된다.
+
+받은 요청은 모두 메모리에 기록되므로, 크롤러를 이 서버에 붙여 실행한 뒤
+alerts / last_seen / requests 를 확인하면 된다.
+
+사용 예 (코드):
+    with FakeBackend(subscriptions=[...]) as backend:
+        os.environ["BACKEND_BASE_URL"] = backend.url
+        ...
+        print(len(backend.alerts))
+
+사용 예 (CLI):
+    python tools/fake_backend.py --port 8080 --subscriptions subs.json
+"""
+import argparse
+import gzip
+import json
+import re
+import threading
+from urllib.parse import parse_qs, urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+_LAST_SEEN_RE = re.compile(r"^/internal/subscriptions/(\d+)/last_seen$")
+
+
+class FakeBackend:
+    def __init__(
+        self,
+        subscriptions: Optional[List[Dict]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        bulk_enabled: bool = True,
+    ):
+        self.subscriptions: List[Dict] = list(subscriptions or [])
+        self.bulk_enabled = bulk_enabled
+        self.alerts: List[Dict] = []
+        # idempotency_key 가 같은 알림은 한 번만 저장한다 (실제 백엔드의 중복 제거 흉내)
+        self.idempotency_keys: set = set()
+        self.duplicate_alerts = 0
+        self.last_seen: Dict[int, str] = {}
+        self.posts: Dict[str, Dict] = {}
+        # (method, path, 요청 본문 바이트 수) 목록
+        self.requests: List[tuple] = []
+        # 다음 N개의 알림 생성 요청을 지정한 상태 코드로 실패시킨다 (장애 주입용)
+        self.fail_alert_requests = 0
+        self.fail_status = 503
+        self.lock = threading.Lock()
+        # 변경분 동기화용: 구독 id → 마지막으로 바뀐 버전, 삭제된 구독 id → 삭제 버전
+        # sync_token 은 "{epoch}:{version}" 이며, reset_sync() 로 epoch 를 바꾸면 기존 토큰은 410 이 된다.
+        self.epoch = 1
+        self.version = 0
+        self._versions: Dict[int, int] = {s.get("id"): 0 for s in self.subscriptions}
+        self._deleted: Dict[int, int] = {}
+
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeBackend":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeBackend":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def request_count(self, method: Optional[str] = None, path_prefix: str = "") -> int:
+        with self.lock:
+            return sum(
+                1
+                for m, path, _ in self.requests
+                if (method is None or m == method) and path.startswith(path_prefix)
+            )
+
+    def bytes_received(self) -> int:
+        with self.lock:
+            return sum(size for _, _, size in self.requests)
+
+    @property
+    def sync_token(self) -> str:
+        return f"{self.epoch}:{self.version}"
+
+    def _touch(self, sub_id: int) -> None:
+        # lock 을 잡은 상태에서 호출
+        self.version += 1
+        self._versions[sub_id] = self.version
+        self._deleted.pop(sub_id, None)
+
+    def upsert_subscription(self, sub: Dict) -> None:
+        with self.lock:
+            self.subscriptions = [s for s in self.subscriptions if s.get("id") != sub.get("id")]
+            self.subscriptions.append(dict(sub))
+            self._touch(sub.get("id"))
+
+    def delete_subscription(self, sub_id: int) -> None:
+        with self.lock:
+            self.subscriptions = [s for s in self.subscriptions if s.get("id") != sub_id]
+            self._versions.pop(sub_id, None)
+            self.version += 1
+            self._deleted[sub_id] = self.version
+
+    def reset_sync(self) -> None:
+        """변경 로그를 버린다. 이전에 발급한 sync_token 은 모두 410 으로 거절된다."""
+        with self.lock:
+            self.epoch += 1
+            self._deleted.clear()
+
+    def changes_since(self, token: str) -> Optional[Dict]:
+        """token 이후 변경분. 모르는 토큰이면 None."""
+        epoch, _, version = (token or "").partition(":")
+        with self.lock:
+            if epoch != str(self.epoch) or not version.isdigit() or int(version) > self.version:
+                return None
+            since = int(version)
+            return {
+                "upserts": [
+                    dict(s) for s in self.subscriptions
+                    if self._versions.get(s.get("id"), 0) > since
+                ],
+                "deletes": [sub_id for sub_id, v in self._deleted.items() if v > since],
+                "sync_token": self.sync_token,
+            }
+
+
+def _make_handler(backend: FakeBackend):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # keep-alive 에서 헤더/본문 분할 전송 시 Nagle 지연(~40ms)이 생기지 않도록 한다
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler 시그니처
+            pass
+
+        def _read_body(self) -> bytes:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            with backend.lock:
+                backend.requests.append((self.command, self.path, len(body)))
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            return body
+
+        def _send_json(self, status: int, payload) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _ok(self, result=None) -> None:
+            self._send_json(200, {"errorCode": None, "message": "OK", "result": result})
+
+        def _store_alerts(self, alerts: List[Dict]) -> None:
+            with backend.lock:
+                for alert in alerts:
+                    key = alert.get("idempotency_key")
+                    if key is not None:
+                        if key in backend.idempotency_keys:
+                            backend.duplicate_alerts += 1
+                            continue
+                        backend.idempotency_keys.add(key)
+                    backend.alerts.append(alert)
+
+        def _maybe_fail_alert(self) -> bool:
+            with backend.lock:
+                if backend.fail_alert_requests <= 0:
+                    return False
+                backend.fail_alert_requests -= 1
+            self._send_json(backend.fail_status, {"errorCode": "INJECTED", "message": "fail"})
+            return True
+
+        def do_GET(self):
+            self._read_body()
+            parsed = urlparse(self.path)
+            qs = parse_qs(parsed.query)
+            if parsed.path == "/internal/subscriptions/changes":
+                changes = backend.changes_since(qs.get("since", [""])[0])
+                if changes is None:
+                    self._send_json(410, {"errorCode": "SYNC_TOKEN_EXPIRED", "message": "resync"})
+                    return
+                self._ok(changes)
+                return
+            if parsed.path == "/internal/subscriptions":
+                with backend.lock:
+                    subs = [dict(s) for s in backend.subscriptions]
+                    sync_token = backend.sync_token
+                if "size" not in qs:
+                    self._send_json(200, {
+                        "errorCode": None, "message": "OK", "result": subs, "sync_token": sync_token,
+                    })
+                    return
+                # cursor 는 site_url, id 순으로 정렬한 목록에서의 offset
+                subs.sort(key=lambda s: (s.get("site_url") or "", s.get("id") or 0))
+                size = int(qs["size"][0])
+                offset = int(qs.get("cursor", ["0"])[0])
+                page = subs[offset:offset + size]
+                next_offset = offset + size
+                self._send_json(200, {
+                    "errorCode": None,
+                    "message": "OK",
+                    "result": page,
+                    "next_cursor": str(next_offset) if next_offset < len(subs) else None,
+                    "sync_token": sync_token,
+                })
+                return
+            self._send_json(404, {"errorCode": "NOT_FOUND", "message": self.path})
+
+        def do_POST(self):
+            body = self._read_body()
+            if self.path == "/internal/alerts":
+                if self._maybe_fail_alert():
+                    return
+                self._store_alerts([json.loads(body)])
+                self._ok()
+                return
+            if self.path == "/internal/alerts/bulk" and backend.bulk_enabled:
+                if self._maybe_fail_alert():
+                    return
+                alerts = json.loads(body).get("alerts", [])
+                self._store_alerts(alerts)
+                self._ok({"created": len(alerts)})
+                return
+            if self.path == "/internal/posts" or (
+                self.path == "/internal/posts/bulk" and backend.bulk_enabled
+            ):
+                data = json.loads(body)
+                posts = data.get("posts", []) if self.path.endswith("/bulk") else [data]
+                with backend.lock:
+                    for post in posts:
+                        backend.posts[post["post_key"]] = post
+                self._ok({"upserted": len(posts)})
+                return
+            self._send_json(404, {"errorCode": "NOT_FOUND", "message": self.path})
+
+        def _set_last_seen(self, sub_id: int, last_seen: str) -> None:
+            with backend.lock:
+                backend.last_seen[sub_id] = last_seen
+                for sub in backend.subscriptions:
+                    if sub.get("id") == sub_id and sub.get("last_seen_post_id") != last_seen:
+                        sub["last_seen_post_id"] = last_seen
+                        backend._touch(sub_id)
+
+        def do_PATCH(self):
+            body = self._read_body()
+            m = _LAST_SEEN_RE.match(self.path)
+            if m:
+                self._set_last_seen(int(m.group(1)), json.loads(body).get("last_seen_post_id"))
+                self._ok()
+                return
+            if self.path == "/internal/subscriptions/last_seen" and backend.bulk_enabled:
+                updates = json.loads(body).get("updates", [])
+                for update in updates:
+                    self._set_last_seen(int(update["subscription_id"]), update["last_seen_post_id"])
+                self._ok({"updated": len(updates)})
+                return
+            self._send_json(404, {"errorCode": "NOT_FOUND", "message": self.path})
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="crawler 용 로컬 백엔드 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--subscriptions", help="구독 목록 JSON 파일 (리스트)")
+    parser.add_argument("--no-bulk", action="store_true", help="bulk 엔드포인트를 404 로 응답")
+    args = parser.parse_args()
+
+    subs = []
+    if args.subscriptions:
+        with open(args.subscriptions, encoding="utf-8") as f:
+            subs = json.load(f)
+
+    backend = FakeBackend(subs, host=args.host, port=args.port, bulk_enabled=not args.no_bulk)
+    print(f"[fake_backend] listening on {backend.url} (subscriptions={len(subs)})")
+    try:
+        backend._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        backend._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
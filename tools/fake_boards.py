@@ -0,0 +1,256 @@
+"""
+로컬 테스트용 게시판 서버 (사이트 7곳의 목록/상세 페이지).
+
+페이지는 파서 벤치마크 픽스처 생성기(tools/make_parser_fixtures.py)의 사이트별 틀로 만들고,
+publish() 를 호출할 때마다 게시판마다 새 글이 위에 올라간 목록을 돌려준다.
+크롤러가 보는 URL(https://www.ablenews.co.kr/...)은 호스트를 경로 앞에 붙인 주소로 바꿔 요청한다.
+
+    https://www.ablenews.co.kr/news/articleList.html?view_type=sm&board=3
+    → {url}/www.ablenews.co.kr/news/articleList.html?view_type=sm&board=3   (local_url())
+
+- 사이트마다 boards_per_site 개의 게시판을 둔다. 게시판은 목록 URL 의 board 쿼리 파라미터로 구분한다.
+  (정규화한 site_url 이 달라서 크롤러에서는 서로 다른 사이트 그룹이 된다)
+- 목록 경로가 아닌 같은 호스트의 경로는 모두 상세 페이지로 응답한다. (사이트별로 한 페이지를 만들어 재사용)
+- 실로암/한국장애인개발원 페이지는 EUC-KR 이고, Content-Type 에 charset 을 붙이지 않는다. (크롤러가 인코딩 추정)
+- latency: 응답마다 기다릴 시간(초)
+
+사용 예 (코드):
+    with FakeBoards(boards_per_site=10) as boards:
+        boards.publish(3)
+        url = local_url(boards.url, boards.boards[0].list_url)
+
+사용 예 (CLI):
+    python tools/fake_boards.py --port 8092 --boards-per-site 10
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from tools import make_parser_fixtures as fixtures
+
+
+class SiteSpec(NamedTuple):
+    list_url: str
+    make_list: Callable
+    make_content: Callable
+    first_id: int
+    # 게시물 ID 간격 (한국장애인개발원은 여러 게시판이 번호를 나눠 써서 13씩 증가)
+    step: int = 1
+    options: Dict = {}
+
+
+# 목록 한 페이지의 게시물 수
+PAGE_SIZE = 15
+# 상세 페이지 문단 수
+CONTENT_PARAGRAPHS = 10
+
+SITES: Dict[str, SiteSpec] = {
+    "DONGGUK_SW": SiteSpec("https://sw.dongguk.edu/board/list.do?boardId=notice",
+                           fixtures.dongguk_sw_list, fixtures.dongguk_sw_content, 5200),
+    # 고정 공지는 ID 가 가장 커서 목록 맨 앞에 오므로 새 글이 보이지 않는다 → 부하 테스트에서는 빼고 만든다
+    "DONGGUK_CSE": SiteSpec("https://cse.dongguk.edu/article/notice/list",
+                            fixtures.dongguk_cse_list, fixtures.dongguk_cse_content, 1318,
+                            options={"notice_count": 0}),
+    "KBUWEL": SiteSpec("https://web.kbuwel.or.kr/home/notice",
+                       fixtures.kbuwel_list, fixtures.kbuwel_content, 88000),
+    "ABLE_NEWS": SiteSpec("https://www.ablenews.co.kr/news/articleList.html?view_type=sm",
+                          fixtures.ablenews_list, fixtures.ablenews_content, 230000),
+    "KEAD": SiteSpec("https://www.kead.or.kr/bbs/deptgongji/bbsPage.do?menuId=MENU0895",
+                     fixtures.kead_list, fixtures.kead_content, 210496),
+    "SILWEL": SiteSpec("https://www.silwel.or.kr/v2/modules/board/board.php?tbl=board_comm_notice",
+                       fixtures.silwel_list, fixtures.silwel_content, 10363),
+    "KODDI": SiteSpec("https://www.koddi.or.kr/bbs/notice01.jsp",
+                      fixtures.koddi_list, fixtures.koddi_content, 7427967, step=13),
+}
+
+
+class Board:
+    """게시판 하나. latest 는 가장 최신 게시물의 숫자 ID"""
+
+    def __init__(self, site_type: str, index: int, spec: SiteSpec):
+        self.site_type = site_type
+        self.index = index
+        self.spec = spec
+        sep = "&" if "?" in spec.list_url else "?"
+        self.list_url = f"{spec.list_url}{sep}board={index}"
+        # 게시판끼리 ID 가 겹치지 않도록 떨어뜨린다
+        self.latest = spec.first_id + index * 10000 * spec.step
+        self.published = 0
+
+
+def local_url(base_url: str, url: str) -> str:
+    """크롤러가 요청하는 URL 을 이 서버의 주소로 바꾼다"""
+    parts = urlsplit(url)
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{base_url}/{parts.hostname}{parts.path or '/'}{query}"
+
+
+class FakeBoards:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        boards_per_site: int = 1,
+        site_types: Optional[List[str]] = None,
+        latency: float = 0.0,
+        seed: int = 20251114,
+    ):
+        self.latency = latency
+        self.seed = seed
+        self.boards: List[Board] = [
+            Board(site_type, index, SITES[site_type])
+            for site_type in (site_types or list(SITES))
+            for index in range(boards_per_site)
+        ]
+        self._by_key: Dict[Tuple[str, str], Board] = {
+            (urlsplit(board.list_url).hostname, str(board.index)): board for board in self.boards
+        }
+        self._list_paths = {
+            urlsplit(SITES[site_type].list_url).hostname: (site_type, urlsplit(SITES[site_type].list_url).path)
+            for site_type in {board.site_type for board in self.boards}
+        }
+        self._pages: Dict[Tuple[str, int], Tuple[bytes, Dict]] = {}
+        self._contents: Dict[str, bytes] = {}
+        # (종류 "list"/"content", 경로) 목록과 보낸 바이트 수
+        self.requests: List[Tuple[str, str]] = []
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeBoards":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeBoards":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def publish(self, posts: int, ratio: float = 1.0) -> int:
+        """게시판마다 새 글 posts 개를 올린다. ratio 는 새 글이 올라올 게시판 비율. return: 새 글이 올라온 게시판 수"""
+        touched = 0
+        with self.lock:
+            for board in self.boards:
+                if ratio < 1.0 and self._rng.random() >= ratio:
+                    continue
+                board.latest += posts * board.spec.step
+                board.published += posts
+                touched += 1
+        return touched
+
+    def latest_post_id(self, board: Board) -> str:
+        """크롤러가 읽는 형식의 최신 게시물 ID (구독의 last_seen_post_id 초기값)"""
+        return self.list_page(board)[1]["first_id"]
+
+    def list_page(self, board: Board) -> Tuple[bytes, Dict]:
+        latest = board.latest
+        key = (board.list_url, latest)
+        page = self._pages.get(key)
+        if page is None:
+            rng = random.Random(f"{self.seed}:{board.list_url}:{latest}")
+            html, expect = board.spec.make_list(rng, PAGE_SIZE, first_id=latest, **board.spec.options)
+            page = self._pages[key] = (_encode(html), expect)
+        return page
+
+    def content_page(self, site_type: str) -> bytes:
+        page = self._contents.get(site_type)
+        if page is None:
+            rng = random.Random(f"{self.seed}:{site_type}:content")
+            html, _ = SITES[site_type].make_content(rng, fixtures._paragraphs(rng, CONTENT_PARAGRAPHS))
+            page = self._contents[site_type] = _encode(html)
+        return page
+
+    def request_count(self, kind: Optional[str] = None) -> int:
+        with self.lock:
+            return sum(1 for k, _ in self.requests if kind is None or k == kind)
+
+    def _resolve(self, path: str) -> Tuple[Optional[str], Optional[bytes]]:
+        """요청 경로 → (종류, 페이지). 모르는 경로면 (None, None)"""
+        parts = urlsplit(path)
+        host, _, site_path = parts.path.lstrip("/").partition("/")
+        found = self._list_paths.get(host)
+        if found is None:
+            return None, None
+        site_type, list_path = found
+        if "/" + site_path != list_path:
+            return "content", self.content_page(site_type)
+        board = self._by_key.get((host, parse_qs(parts.query).get("board", ["0"])[0]))
+        if board is None:
+            return None, None
+        with self.lock:
+            return "list", self.list_page(board)[0]
+
+
+def _encode(html: str) -> bytes:
+    return html.encode("euc-kr" if 'charset="euc-kr"' in html else "utf-8")
+
+
+def _make_handler(boards: FakeBoards):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler 시그니처
+            pass
+
+        def do_GET(self):
+            kind, body = boards._resolve(self.path)
+            if boards.latency:
+                time.sleep(boards.latency)
+            if body is None:
+                body = b"not found"
+                self.send_response(404)
+            else:
+                self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            with boards.lock:
+                boards.requests.append((kind or "unknown", self.path))
+                boards.bytes_sent += len(body)
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="crawler 용 로컬 게시판 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8092)
+    parser.add_argument("--boards-per-site", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연(초)")
+    args = parser.parse_args()
+
+    boards = FakeBoards(host=args.host, port=args.port, boards_per_site=args.boards_per_site, latency=args.latency)
+    print(f"[fake_boards] listening on {boards.url} (boards={len(boards.boards)})")
+    for board in (b for b in boards.boards if b.index == 0):
+        print(f"  {board.site_type:<12} {local_url(boards.url, board.list_url)}")
+    try:
+        boards._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        boards._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+샤드 임대 코디네이터의 로컬 대역(stand-in) 서버.
+
+services.sharding.CoordinatorLease 가 쓰는 엔드포인트만 흉내 낸다.
+- POST /shards/acquire  {"worker_id", "ttl"} → 비어 있는(또는 만료된) 가장 작은 샤드 번호, 없으면 409
+- POST /shards/renew    {"worker_id", "ttl"} → 임대 연장, 만료/회수됐으면 410
+- POST /shards/release  {"worker_id"}
+- GET  /shards          → 현재 임대 현황
+
+같은 worker_id 로 다시 acquire 하면 기존 번호를 그대로 돌려준다.
+만료된 임대는 다음 acquire 때 다른 워커에게 넘어가므로, 한 샤드 번호는 항상 한 워커만 가진다.
+
+사용 예:
+    python tools/fake_coordinator.py --port 8090 --shards 4
+    SHARD_COORDINATOR_URL=http://127.0.0.1:8090 python main.py
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+
+class FakeCoordinator:
+    def __init__(self, shard_count: int = 2, host: str = "127.0.0.1", port: int = 0, clock=time.monotonic):
+        self.shard_count = shard_count
+        self._clock = clock
+        # shard_index → (worker_id, 만료 시각)
+        self.leases: Dict[int, Tuple[str, float]] = {}
+        self.lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeCoordinator":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeCoordinator":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _owned_by(self, worker_id: str, now: float) -> Optional[int]:
+        for index, (owner, expires_at) in self.leases.items():
+            if owner == worker_id and expires_at > now:
+                return index
+        return None
+
+    def acquire(self, worker_id: str, ttl: float) -> Optional[int]:
+        with self.lock:
+            now = self._clock()
+            index = self._owned_by(worker_id, now)
+            if index is None:
+                free = [
+                    i for i in range(self.shard_count)
+                    if i not in self.leases or self.leases[i][1] <= now
+                ]
+                if not free:
+                    return None
+                index = free[0]
+            self.leases[index] = (worker_id, now + ttl)
+            return index
+
+    def renew(self, worker_id: str, ttl: float) -> bool:
+        with self.lock:
+            now = self._clock()
+            index = self._owned_by(worker_id, now)
+            if index is None:
+                return False
+            self.leases[index] = (worker_id, now + ttl)
+            return True
+
+    def release(self, worker_id: str) -> None:
+        with self.lock:
+            for index, (owner, _) in list(self.leases.items()):
+                if owner == worker_id:
+                    del self.leases[index]
+
+
+def _make_handler(coordinator: FakeCoordinator):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler 시그니처
+            pass
+
+        def _send_json(self, status: int, payload) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/shards":
+                now = coordinator._clock()
+                with coordinator.lock:
+                    leases = {
+                        str(i): {"worker_id": owner, "expires_in": round(expires_at - now, 1)}
+                        for i, (owner, expires_at) in coordinator.leases.items()
+                    }
+                self._send_json(200, {"result": {"shard_count": coordinator.shard_count, "leases": leases}})
+                return
+            self._send_json(404, {"errorCode": "NOT_FOUND", "message": self.path})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            data = json.loads(self.rfile.read(length) or b"{}")
+            worker_id = data.get("worker_id", "")
+            ttl = float(data.get("ttl", 60))
+            if self.path == "/shards/acquire":
+                index = coordinator.acquire(worker_id, ttl)
+                if index is None:
+                    self._send_json(409, {"errorCode": "NO_FREE_SHARD", "message": "all shards leased"})
+                    return
+                self._send_json(200, {"result": {"shard_index": index, "shard_count": coordinator.shard_count}})
+                return
+            if self.path == "/shards/renew":
+                if not coordinator.renew(worker_id, ttl):
+                    self._send_json(410, {"errorCode": "LEASE_EXPIRED", "message": worker_id})
+                    return
+                self._send_json(200, {"result": None})
+                return
+            if self.path == "/shards/release":
+                coordinator.release(worker_id)
+                self._send_json(200, {"result": None})
+                return
+            self._send_json(404, {"errorCode": "NOT_FOUND", "message": self.path})
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="crawler 용 샤드 임대 코디네이터 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--shards", type=int, default=2)
+    args = parser.parse_args()
+
+    coordinator = FakeCoordinator(args.shards, host=args.host, port=args.port)
+    print(f"[fake_coordinator] listening on {coordinator.url} (shards={args.shards})")
+    try:
+        coordinator._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        coordinator._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+로컬 테스트용 Gemini API 대역(stand-in) 서버.
+
+google-generativeai SDK 가 REST 로 보내는 generateContent 요청만 흉내 낸다.
+크롤러는 GEMINI_API_ENDPOINT 를 이 서버 주소로 지정하면 실제 API 대신 여기로 요약을 요청한다.
+(GEMINI_API_KEY 는 아무 값이나 넣으면 된다)
+
+- POST /{version}/models/{model}:generateContent
+  원문(프롬프트의 "--- 원문 시작 ---" 이후) 앞부분을 요약으로 돌려준다.
+- latency / jitter: 응답마다 latency ± jitter 초 기다린 뒤 응답한다. (요청마다 별도 스레드)
+- rate_limit_ratio: 이 확률로 429 RESOURCE_EXHAUSTED 를 돌려준다. (seed 로 재현 가능)
+- rpm: 최근 60초 동안 받은 요청이 이 수를 넘으면 429 (실제 무료 등급 15 RPM 같은 분당 한도 흉내, 0 이면 없음)
+- rate_limit_requests: 다음 N개의 요청을 429 로 실패시킨다. (장애 주입용)
+
+받은 요청 수, 429 수, 응답 지연은 메모리에 기록된다.
+
+사용 예 (코드):
+    with FakeGemini(latency=0.8, rate_limit_ratio=0.05) as gemini:
+        os.environ["GEMINI_API_ENDPOINT"] = gemini.url
+        ...
+        print(gemini.requests, gemini.rate_limited)
+
+사용 예 (CLI):
+    python tools/fake_gemini.py --port 8091 --latency 0.8 --rate-limit-ratio 0.05
+"""
+import argparse
+import collections
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, List, Optional
+
+_GENERATE_RE = re.compile(r"^/v1(?:beta)?/models/([^/:]+):generateContent$")
+_SOURCE_START = "--- 원문 시작 ---"
+_SOURCE_END = "--- 원문 끝 ---"
+_SUMMARY_CHARS = 200
+
+
+class FakeGemini:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit_ratio: float = 0.0,
+        rpm: int = 0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.rpm = rpm
+        self.rate_limit_requests = 0
+        self.requests = 0
+        self.rate_limited = 0
+        # 성공한 응답의 서버 쪽 지연(초)
+        self.latencies: List[float] = []
+        self.lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._recent: Deque[float] = collections.deque()
+
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGemini":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeGemini":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _admit(self) -> bool:
+        """이번 요청을 받을지(True) 429 로 거절할지(False)"""
+        now = time.monotonic()
+        with self.lock:
+            self.requests += 1
+            while self._recent and self._recent[0] <= now - 60:
+                self._recent.popleft()
+            self._recent.append(now)
+            rejected = False
+            if self.rate_limit_requests > 0:
+                self.rate_limit_requests -= 1
+                rejected = True
+            elif self.rpm and len(self._recent) > self.rpm:
+                rejected = True
+            elif self.rate_limit_ratio and self._rng.random() < self.rate_limit_ratio:
+                rejected = True
+            if rejected:
+                self.rate_limited += 1
+            return not rejected
+
+    def _delay(self) -> float:
+        with self.lock:
+            spread = self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + spread)
+
+
+def summarize_prompt(prompt: str) -> str:
+    """프롬프트에서 원문 부분만 꺼내 앞부분을 요약 대신 돌려준다"""
+    _, _, source = prompt.partition(_SOURCE_START)
+    source = source.partition(_SOURCE_END)[0] or prompt
+    return " ".join(source.split())[:_SUMMARY_CHARS]
+
+
+def _make_handler(gemini: FakeGemini):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler 시그니처
+            pass
+
+        def _send_json(self, status: int, payload) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            m = _GENERATE_RE.match(self.path.split("?", 1)[0])
+            if not m:
+                self._send_json(404, {"error": {"code": 404, "message": self.path, "status": "NOT_FOUND"}})
+                return
+            if not gemini._admit():
+                self._send_json(429, {"error": {
+                    "code": 429,
+                    "message": "Resource has been exhausted (e.g. check quota).",
+                    "status": "RESOURCE_EXHAUSTED",
+                }})
+                return
+
+            started = time.perf_counter()
+            time.sleep(gemini._delay())
+            request = json.loads(body or b"{}")
+            prompt = "".join(
+                part.get("text", "")
+                for content in request.get("contents", [])
+                for part in content.get("parts", [])
+            )
+            text = summarize_prompt(prompt)
+            with gemini.lock:
+                gemini.latencies.append(time.perf_counter() - started)
+            self._send_json(200, {
+                "candidates": [{
+                    "content": {"parts": [{"text": text}], "role": "model"},
+                    "finishReason": 1,  # STOP (SDK 는 enum-encoding=int 로 요청한다)
+                    "index": 0,
+                }],
+                "usageMetadata": {
+                    "promptTokenCount": len(prompt) // 2,
+                    "candidatesTokenCount": len(text) // 2,
+                    "totalTokenCount": (len(prompt) + len(text)) // 2,
+                },
+                "modelVersion": m.group(1),
+            })
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="crawler 용 로컬 Gemini API 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="응답 지연 ± 범위(초)")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="429 를 돌려줄 확률 (0~1)")
+    parser.add_argument("--rpm", type=int, default=0, help="분당 요청 한도 (넘으면 429, 0 이면 없음)")
+    args = parser.parse_args()
+
+    gemini = FakeGemini(
+        host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+        rate_limit_ratio=args.rate_limit_ratio, rpm=args.rpm,
+    )
+    print(f"[fake_gemini] listening on {gemini.url} (latency={args.latency}s±{args.jitter}s, "
+          f"429 ratio={args.rate_limit_ratio}, rpm={args.rpm or '-'})")
+    try:
+        gemini._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        gemini._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
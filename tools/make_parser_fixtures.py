@@ -0,0 +1,350 @@
+"""
+파서 벤치마크(benchmarks/parsers.py)용 HTML 픽스처 생성기.
+
+사이트 7곳의 목록/상세 페이지를 실제 페이지 구조(메뉴/풋터/스크립트 포함)를 본떠 만들고
+benchmarks/fixtures/parsers/ 에 gzip 으로 저장한다. 정답(게시물 수, 첫 게시물 ID/제목/날짜, 본문 문장)은
+생성할 때 넣은 데이터에서 뽑아 manifest.json 에 기록한다. (파서 출력을 그대로 정답으로 쓰지 않음)
+
+- 실로암(SILWEL)/한국장애인개발원(KODDI)은 EUC-KR 페이지로 저장한다. (인코딩 추정 비용 포함)
+- *_large 케이스는 게시물이 수백 개인 목록과 수백 KB 본문이다.
+- 같은 시드로 항상 같은 파일이 만들어진다.
+- 목록 생성 함수는 first_id 로 최신 게시물 ID 를 바꿀 수 있다. (부하 테스트의 tools/fake_boards.py 가 새 글을 만들 때 사용)
+
+실제 사이트에서 저장한 페이지로 바꾸려면 같은 이름으로 gzip 해서 덮어쓰고 manifest.json 의 expect 를 고친다.
+
+사용 예:
+    python tools/make_parser_fixtures.py
+"""
+import argparse
+import gzip
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+FIXTURE_DIR = PROJECT_ROOT / "benchmarks" / "fixtures" / "parsers"
+
+_TOPICS = ["장학금", "채용", "모집", "지원 사업", "교육", "행사", "공모전", "복지", "고용", "설명회",
+           "세미나", "특강", "수강신청", "졸업", "인턴십", "봉사활동", "점자도서", "보조기기", "재활", "바우처"]
+_PREFIXES = ["2025학년도", "2026년", "[안내]", "[공지]", "[모집]", "하반기", "상반기", "제12회", "긴급", ""]
+_SUFFIXES = ["안내", "공고", "신청 안내", "결과 발표", "일정 변경 안내", "참가자 모집", "접수 안내", "연장 공지"]
+_SENTENCES = [
+    "신청 기간은 다음 달 말까지이며 기간 내 온라인으로 접수해 주시기 바랍니다.",
+    "자세한 내용은 첨부된 공고문을 확인해 주시기 바랍니다.",
+    "문의 사항은 담당 부서 대표 전화로 연락 주십시오.",
+    "행사는 본관 3층 대강당에서 오후 2시부터 진행됩니다.",
+    "선정 결과는 개별 통보하며 홈페이지에도 게시할 예정입니다.",
+    "장애인 고용 촉진을 위한 지원 사업 참여 기관을 모집합니다.",
+    "제출 서류는 신청서, 재학증명서, 개인정보 수집 이용 동의서입니다.",
+    "시각장애인을 위한 점자 및 음성 자료가 함께 제공됩니다.",
+    "참가비는 무료이며 선착순으로 마감될 수 있습니다.",
+    "코로나19 예방을 위해 실내에서는 마스크 착용을 권장합니다.",
+]
+_MENU = ["기관소개", "인사말", "연혁", "조직도", "오시는 길", "사업안내", "공지사항", "자료실", "갤러리",
+         "커뮤니티", "자유게시판", "묻고답하기", "채용정보", "정보공개", "사이트맵", "로그인", "회원가입"]
+
+
+def _title(rng: random.Random, post_id: int) -> str:
+    parts = [rng.choice(_PREFIXES), rng.choice(_TOPICS), rng.choice(_SUFFIXES), f"({post_id})"]
+    return " ".join(p for p in parts if p)
+
+
+def _date(rng: random.Random, index: int) -> Tuple[int, int, int]:
+    day = 300 - index // 3
+    return 2025, max(1, day // 28 % 12 + 1), max(1, day % 28 + 1)
+
+
+def _paragraphs(rng: random.Random, count: int) -> List[str]:
+    return [" ".join(rng.choice(_SENTENCES) for _ in range(rng.randint(2, 5))) + f" ({i + 1})"
+            for i in range(count)]
+
+
+def _chrome(title: str, body: str, charset: str = "utf-8") -> str:
+    """메뉴/풋터/스크립트를 포함한 페이지 틀"""
+    menu = "".join(f'<li><a href="/menu/{i}.do">{name}</a><ul class="sub">'
+                   + "".join(f'<li><a href="/menu/{i}/{j}.do">{name} {j}</a></li>' for j in range(1, 5))
+                   + "</ul></li>" for i, name in enumerate(_MENU))
+    script = "var gnb={" + ",".join(f'"m{i}":"/menu/{i}.do"' for i in range(60)) + "};"
+    style = "".join(f".c{i}{{margin:{i}px;padding:{i % 7}px;color:#{i:06x}}}" for i in range(120))
+    return (
+        f'<!DOCTYPE html><html lang="ko"><head><meta charset="{charset}">'
+        f"<title>{title}</title><style>{style}</style><script>{script}</script></head><body>"
+        f'<div id="skip"><a href="#content">본문 바로가기</a></div>'
+        f'<header id="header"><div class="logo"><a href="/">홈</a></div><nav id="gnb"><ul>{menu}</ul></nav></header>'
+        f'<div id="container">{body}</div>'
+        f'<footer id="footer"><p>주소: 서울특별시 중구 필동로 1길 30 (우)04620 | 대표전화 02-0000-0000</p>'
+        f"<p>개인정보처리방침 | 이메일무단수집거부 | 이용약관</p><p>Copyright (c) All rights reserved.</p></footer>"
+        f"<script>{script}</script></body></html>"
+    )
+
+
+def _detail_body(rng: random.Random, paragraphs: List[str]) -> str:
+    return "".join(f"<p>{p}</p>" for p in paragraphs) + '<p><img src="/upload/poster.jpg" alt="포스터"></p>'
+
+
+def _content_expect(paragraphs: List[str], not_contains: str = "개인정보처리방침") -> Dict:
+    return {"contains": [paragraphs[0], paragraphs[-1]], "not_contains": [not_contains],
+            "min_chars": sum(len(p) for p in paragraphs) // 2}
+
+
+def _posts(rng: random.Random, count: int, first_id: int, step: int = 1) -> List[Dict]:
+    posts = []
+    for i in range(count):
+        post_id = first_id - i * step
+        y, m, d = _date(rng, i)
+        posts.append({"id": post_id, "title": _title(rng, post_id), "date": f"{y:04d}-{m:02d}-{d:02d}",
+                      "writer": rng.choice(["관리자", "학사팀", "홍보팀", "교육지원팀"]),
+                      "views": rng.randint(10, 5000)})
+    return posts
+
+
+def _list_expect(posts: List[Dict], post_id, url: str) -> Dict:
+    return {"posts": len(posts), "first_id": str(post_id), "first_title": posts[0]["title"],
+            "first_date": posts[0]["date"], "first_url": url}
+
+
+# ---- 사이트별 페이지 ----------------------------------------------------------------
+
+def dongguk_sw_list(rng, count, first_id=5200):
+    notices = _posts(rng, 3, 9000)
+    posts = _posts(rng, count, first_id)
+    rows = "".join(
+        f'<tr class="notice"><td>공지</td><td class="subject"><a href="/board/view.do?boardId=notice&seq={p["id"]}">'
+        f'{p["title"]}</a></td><td>{p["writer"]}</td><td>{p["date"]}</td><td>{p["views"]}</td></tr>' for p in notices
+    ) + "".join(
+        f'<tr><td>{count - i}</td><td class="subject"><a href="/board/view.do?boardId=notice&seq={p["id"]}">'
+        f'{p["title"]}</a></td><td>{p["writer"]}</td><td>{p["date"]}</td><td>{p["views"]}</td></tr>'
+        for i, p in enumerate(posts)
+    )
+    body = ('<div class="board-list"><table><thead><tr><th>번호</th><th>제목</th><th>작성자</th><th>작성일</th>'
+            f'<th>조회</th></tr></thead><tbody>{rows}</tbody></table></div>')
+    first = posts[0]
+    return _chrome("공지사항 | 동국대학교 SW교육원", body), _list_expect(
+        posts, first["id"], f"https://sw.dongguk.edu/board/view.do?boardId=notice&seq={first['id']}")
+
+
+def dongguk_sw_content(rng, paragraphs):
+    body = (f'<div class="board-view"><h3 class="title">{_title(rng, 5200)}</h3>'
+            f'<ul class="info"><li>작성자 학사팀</li><li>작성일 2025-11-14</li></ul>'
+            f'{_detail_body(rng, paragraphs)}</div>')
+    return _chrome("공지사항 | 동국대학교 SW교육원", body), _content_expect(paragraphs)
+
+
+def dongguk_cse_list(rng, count, first_id=1318, notice_count=4):
+    notices = _posts(rng, notice_count, first_id + 182 + count)
+    posts = _posts(rng, count, first_id)
+    items = "".join(
+        f'<li class="notice"><span class="num">공지</span><a href="javascript:void(0);" onclick="goDetail({p["id"]})">'
+        f'{p["title"]}</a><div class="info"><span>AI융합 관리자</span><span>{p["date"]}</span>'
+        f'<span>조회수 {p["views"]}</span></div></li>' for p in notices
+    ) + "".join(
+        f'<li><span class="num">{count - i}</span><a href="javascript:void(0);" onclick="goDetail({p["id"]})">'
+        f'{p["title"]}</a><div class="info"><span>AI융합 관리자</span><span>{p["date"]}</span>'
+        f'<span>조회수 {p["views"]}</span></div></li>' for i, p in enumerate(posts)
+    )
+    body = f'<div class="board_list"><ul>{items}</ul></div><div class="paging"><a href="#">1</a></div>'
+    # 고정 공지도 goDetail 로 걸려 있으므로 파서는 공지까지 ID 내림차순으로 돌려준다
+    everything = notices + posts
+    first = everything[0]
+    return _chrome("공지사항 | 동국대학교 컴퓨터·AI학부", body), {
+        "posts": len(everything), "first_id": str(first["id"]), "first_title": first["title"],
+        "first_date": first["date"], "first_url": f"https://cse.dongguk.edu/article/notice/detail/{first['id']}",
+    }
+
+
+def dongguk_cse_content(rng, paragraphs):
+    body = (f'<div class="board_view"><div class="top"><h3>{_title(rng, 1318)}</h3>'
+            f'<ul class="info"><li>AI융합 관리자</li><li>2025-11-14</li></ul></div>'
+            f'<div class="bottom"><div class="contents">{_detail_body(rng, paragraphs)}'
+            f'<script>console.log("view")</script></div>'
+            f'<div class="file"><a href="/file/1">첨부파일.hwp</a></div></div></div>')
+    return _chrome("공지사항 | 동국대학교 컴퓨터·AI학부", body), _content_expect(paragraphs)
+
+
+def kbuwel_list(rng, count, first_id=88000):
+    posts = _posts(rng, count, first_id)
+    items = "".join(
+        f'<li><a href="/home/notice/{p["id"]}">{p["title"]}</a><span class="date">{p["date"]}</span></li>'
+        for p in posts
+    )
+    body = (f'<section class="latest"><h2>최근 공지사항</h2><ul>{items}</ul></section>'
+            '<section class="banner"><h2>바로가기</h2><ul><li><a href="/donate">후원하기</a></li></ul></section>')
+    first = posts[0]
+    return _chrome("넓은마을 | 한국시각장애인연합회", body), _list_expect(
+        posts, f"/home/notice/{first['id']}", f"https://web.kbuwel.or.kr/home/notice/{first['id']}")
+
+
+def kbuwel_content(rng, paragraphs):
+    body = (f'<main id="content"><h2>{_title(rng, 88000)}</h2><p class="meta">2025-11-14</p>'
+            f'{_detail_body(rng, paragraphs)}</main>')
+    return _chrome("넓은마을 | 한국시각장애인연합회", body), _content_expect(paragraphs)
+
+
+def ablenews_list(rng, count, first_id=230000):
+    posts = _posts(rng, count, first_id)
+    items = "".join(
+        f'<li><h4 class="titles"><a href="/news/articleView.html?idxno={p["id"]}" target="_top">{p["title"]}</a></h4>'
+        f'<p class="lead line-6x2"><a href="/news/articleView.html?idxno={p["id"]}" target="_top">'
+        f'{rng.choice(_SENTENCES)} {rng.choice(_SENTENCES)}</a></p>'
+        f'<span class="byline"><em>{rng.choice(["기자", "편집국"])}</em><em>{p["date"].replace("-", ".")} 10:{i % 60:02d}</em>'
+        f"</span></li>" for i, p in enumerate(posts)
+    )
+    # 사이드바 인기기사 (목록에 이미 있는 기사 → 중복 제거 대상)
+    popular = "".join(f'<li><a href="/news/articleView.html?idxno={p["id"]}">{p["title"]}</a></li>'
+                      for p in posts[:10])
+    body = (f'<section id="section-list"><ul class="type1">{items}</ul></section>'
+            f'<aside class="side"><div class="auto-article"><h3>많이 본 뉴스</h3><ul>{popular}</ul></div></aside>')
+    first = posts[0]
+    return _chrome("전체기사 - 에이블뉴스", body), _list_expect(
+        posts, first["id"], f"https://www.ablenews.co.kr/news/articleView.html?idxno={first['id']}")
+
+
+def ablenews_content(rng, paragraphs):
+    body = (f'<article class="article-veiw-body view-page"><header class="article-view-header">'
+            f'<h3 class="heading">{_title(rng, 230000)}</h3></header>'
+            f'<div id="article-view-content-div" class="article-view-content">{_detail_body(rng, paragraphs)}</div>'
+            f'<div class="article-copy">저작권자 © 에이블뉴스 무단전재 및 재배포 금지</div></article>')
+    return _chrome("에이블뉴스", body), _content_expect(paragraphs)
+
+
+def kead_list(rng, count, first_id=210496):
+    posts = _posts(rng, count, first_id)
+    rows = "".join(
+        f'<tr><td>{count - i}</td><td class="tl"><a href="#" class="view_link" '
+        f'onclick="javascript:fn_bbsView(\'{p["id"]}\');">{p["title"]}</a></td>'
+        f'<td>{p["writer"]}</td><td>{p["date"]}</td><td>{p["views"]}</td></tr>' for i, p in enumerate(posts)
+    )
+    body = ('<div class="bbs_list"><table><caption>부서공지사항 목록</caption><thead><tr><th>번호</th><th>제목</th>'
+            f'<th>부서</th><th>등록일</th><th>조회</th></tr></thead><tbody>{rows}</tbody></table></div>')
+    first = posts[0]
+    return _chrome("부서공지사항 | 한국장애인고용공단", body), _list_expect(
+        posts, first["id"],
+        f"https://www.kead.or.kr/bbs/deptgongji/bbsView.do?bbsCnId={first['id']}&menuId=MENU0895")
+
+
+def kead_content(rng, paragraphs):
+    body = (f'<div class="board_view"><div class="view_tit"><h4>{_title(rng, 210496)}</h4>'
+            f'<ul class="view_info"><li>등록일 2025-11-14</li></ul></div>'
+            f'<div class="view_con">{_detail_body(rng, paragraphs)}</div></div>')
+    return _chrome("부서공지사항 | 한국장애인고용공단", body), _content_expect(paragraphs)
+
+
+def silwel_list(rng, count, first_id=10363):
+    posts = _posts(rng, count, first_id)
+    rows = "".join(
+        f'<tr><td>{count - i}</td><td class="subject"><a href="./board_view.php?tbl=board_comm_notice&id={p["id"]}">'
+        f'{p["title"]}</a></td><td></td><td>{p["writer"]}</td><td>{p["date"]}</td><td>{p["views"]}</td></tr>'
+        for i, p in enumerate(posts)
+    )
+    body = ('<h1>공지사항</h1><table class="board"><tr><th>번호</th><th>제목</th><th>첨부</th><th>작성자</th>'
+            f'<th>작성일</th><th>조회</th></tr>{rows}</table>')
+    first = posts[0]
+    return _chrome("공지사항 - 실로암시각장애인복지관", body, "euc-kr"), _list_expect(
+        posts, first["id"],
+        f"https://www.silwel.or.kr/v2/modules/board/board_view.php?tbl=board_comm_notice&id={first['id']}")
+
+
+def silwel_content(rng, paragraphs):
+    cells = "".join(f"<tr><td colspan=\"4\">{p}</td></tr>" for p in paragraphs)
+    body = (f'<h1>공지사항</h1><table class="view"><tr><th>제목</th><td colspan="3">{_title(rng, 10363)}</td></tr>'
+            f'<tr><th>작성자</th><td>관리자</td><th>작성일</th><td>2025-11-14</td></tr>{cells}</table>')
+    return _chrome("공지사항 - 실로암시각장애인복지관", body, "euc-kr"), _content_expect(paragraphs)
+
+
+def koddi_list(rng, count, first_id=7427967):
+    posts = _posts(rng, count, first_id, step=13)
+    rows = "".join(
+        f'<tr><td>{count - i}</td><td>{rng.choice(["일반", "채용", "입찰"])}</td><td class="subject">'
+        f'<a href="./notice01_view.jsp?brdNum={p["id"]}&brdType=R&thisPage=1&searchField=&searchText=">'
+        f'{p["title"]}</a></td><td>{p["date"]}</td><td>{p["views"]}</td><td><img src="/img/file.gif" alt="첨부"></td></tr>'
+        for i, p in enumerate(posts)
+    )
+    body = ('<h3>공지사항</h3><table class="bbs_list"><thead><tr><th>번호</th><th>구분</th><th>제목</th>'
+            f'<th>등록일</th><th>조회수</th><th>파일</th></tr></thead><tbody>{rows}</tbody></table>')
+    first = posts[0]
+    return _chrome("공지사항 | 한국장애인개발원", body, "euc-kr"), _list_expect(
+        posts, first["id"],
+        f"https://www.koddi.or.kr/bbs/notice01_view.jsp?brdNum={first['id']}"
+        "&brdType=R&thisPage=1&searchField=&searchText=")
+
+
+def koddi_content(rng, paragraphs):
+    body = (f'<h3>공지사항</h3><p class="sub">공지사항 읽기</p><table class="bbs_view">'
+            f'<tr><th>제목</th><td colspan="3">{_title(rng, 7427967)}</td></tr>'
+            f'<tr><th>등록일</th><td>2025-11-14</td><th>조회수</th><td>120</td></tr>'
+            f'<tr><td colspan="4">{_detail_body(rng, paragraphs)}</td></tr>'
+            f'<tr><th>첨부파일</th><td colspan="3">공고문.hwp</td></tr></table>')
+    return _chrome("공지사항 | 한국장애인개발원", body, "euc-kr"), _content_expect(paragraphs)
+
+
+# (케이스 이름, site_type, kind, 요청 URL, 생성 함수, 크기)
+CASES = [
+    ("dongguk_sw_list", "DONGGUK_SW", "list", "https://sw.dongguk.edu/board/list.do?boardId=notice",
+     dongguk_sw_list, 20),
+    ("dongguk_sw_content", "DONGGUK_SW", "content", "https://sw.dongguk.edu/board/view.do?boardId=notice&seq=5200",
+     dongguk_sw_content, 12),
+    ("dongguk_cse_list", "DONGGUK_CSE", "list", "https://cse.dongguk.edu/article/notice/list",
+     dongguk_cse_list, 15),
+    ("dongguk_cse_list_large", "DONGGUK_CSE", "list", "https://cse.dongguk.edu/article/notice/list?pageSize=300",
+     dongguk_cse_list, 300),
+    ("dongguk_cse_content", "DONGGUK_CSE", "content", "https://cse.dongguk.edu/article/notice/detail/1318",
+     dongguk_cse_content, 10),
+    ("kbuwel_list", "KBUWEL", "list", "https://web.kbuwel.or.kr/home/notice?next=/", kbuwel_list, 10),
+    ("kbuwel_content", "KBUWEL", "content", "https://web.kbuwel.or.kr/home/notice/88000", kbuwel_content, 8),
+    ("ablenews_list", "ABLE_NEWS", "list", "https://www.ablenews.co.kr/news/articleList.html?view_type=sm",
+     ablenews_list, 20),
+    ("ablenews_list_large", "ABLE_NEWS", "list",
+     "https://www.ablenews.co.kr/news/articleList.html?view_type=sm&page_size=500", ablenews_list, 500),
+    ("ablenews_content", "ABLE_NEWS", "content", "https://www.ablenews.co.kr/news/articleView.html?idxno=230000",
+     ablenews_content, 15),
+    ("kead_list", "KEAD", "list", "https://www.kead.or.kr/bbs/deptgongji/bbsPage.do?menuId=MENU0895",
+     kead_list, 10),
+    ("kead_content", "KEAD", "content",
+     "https://www.kead.or.kr/bbs/deptgongji/bbsView.do?bbsCnId=210496&menuId=MENU0895", kead_content, 10),
+    ("silwel_list", "SILWEL", "list",
+     "https://www.silwel.or.kr/v2/modules/board/board.php?tbl=board_comm_notice", silwel_list, 15),
+    ("silwel_content", "SILWEL", "content",
+     "https://www.silwel.or.kr/v2/modules/board/board_view.php?tbl=board_comm_notice&id=10363", silwel_content, 10),
+    ("silwel_content_large", "SILWEL", "content",
+     "https://www.silwel.or.kr/v2/modules/board/board_view.php?tbl=board_comm_notice&id=10362", silwel_content, 1500),
+    ("koddi_list", "KODDI", "list", "https://www.koddi.or.kr/bbs/notice01.jsp", koddi_list, 10),
+    ("koddi_content", "KODDI", "content", "https://www.koddi.or.kr/bbs/notice01_view.jsp?brdNum=7427967",
+     koddi_content, 10),
+    ("koddi_content_large", "KODDI", "content", "https://www.koddi.or.kr/bbs/notice01_view.jsp?brdNum=7427954",
+     koddi_content, 1500),
+]
+
+
+def build(seed: int = 20251114) -> List[Dict]:
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = []
+    for name, site_type, kind, url, make, size in CASES:
+        rng = random.Random(f"{seed}:{name}")
+        if kind == "list":
+            html, expect = make(rng, size)
+        else:
+            html, expect = make(rng, _paragraphs(rng, size))
+        encoding = "euc-kr" if 'charset="euc-kr"' in html else "utf-8"
+        data = html.encode(encoding)
+        # mtime=0: 다시 만들어도 바이트가 같도록
+        (FIXTURE_DIR / f"{name}.html.gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        manifest.append({"name": name, "site_type": site_type, "kind": kind, "url": url,
+                         "file": f"{name}.html.gz", "encoding": encoding, "bytes": len(data), "expect": expect})
+        print(f"[fixtures] {name}: {len(data) / 1024:.0f} KiB ({encoding})")
+    (FIXTURE_DIR / "manifest.json").write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+    return manifest
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="generate parser benchmark fixtures")
+    parser.add_argument("--seed", type=int, default=20251114)
+    args = parser.parse_args(argv)
+    build(args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())